@@ -157,6 +157,58 @@ describe('Transcription engine', it => {
     cleanup(te, wss);
   });
 
+  it('emits transcription events when binary transcriptions with deltas are received', async () => {
+    const {wss, websocketConnected, te} = await createTranscriptionEngine();
+    te.connectWhisperService();
+    const socket = await websocketConnected;
+
+    const receivedBlocks: Array<BackendTranscriptBlock> = [];
+    te.on('transcription', block => receivedBlocks.push(block));
+
+    const encodeBlock = (type: BackendTranscriptBlockType, keep: number, start: number, end: number, text: string) => {
+      const header = Buffer.alloc(21);
+      header.writeUInt8(type, 0);
+      header.writeUInt32LE(keep, 1);
+      header.writeDoubleLE(start, 5);
+      header.writeDoubleLE(end, 13);
+      return Buffer.concat([header, Buffer.from(text, 'utf8')]);
+    };
+    socket.send(encodeBlock(BackendTranscriptBlockType.InProgress, 0, 0, 1, 'Café'));
+    socket.send(encodeBlock(BackendTranscriptBlockType.InProgress, 4, 0, 2, ' au lait'));
+    socket.send(encodeBlock(BackendTranscriptBlockType.Final, 0, 0, 2, 'Café au lait.'));
+
+    await new Promise(r => setTimeout(r, 1000));
+
+    expect(receivedBlocks).toEqual([
+      {type: BackendTranscriptBlockType.InProgress, text: 'Café', start: 0, end: 1},
+      {type: BackendTranscriptBlockType.InProgress, text: 'Café au lait', start: 0, end: 2},
+      {type: BackendTranscriptBlockType.Final, text: 'Café au lait.', start: 0, end: 2},
+    ]);
+
+    cleanup(te, wss);
+  });
+
+  it('emits transcription events when JSON in progress deltas are received', async () => {
+    const {wss, websocketConnected, te} = await createTranscriptionEngine();
+    te.connectWhisperService();
+    const socket = await websocketConnected;
+
+    const receivedBlocks: Array<BackendTranscriptBlock> = [];
+    te.on('transcription', block => receivedBlocks.push(block));
+
+    socket.send(JSON.stringify({type: BackendTranscriptBlockType.InProgress, text: 'Hello', start: 0, end: 1, keep: 0}));
+    socket.send(JSON.stringify({type: BackendTranscriptBlockType.InProgress, text: ' world', start: 0, end: 2, keep: 5}));
+
+    await new Promise(r => setTimeout(r, 1000));
+
+    expect(receivedBlocks).toEqual([
+      {type: BackendTranscriptBlockType.InProgress, text: 'Hello', start: 0, end: 1},
+      {type: BackendTranscriptBlockType.InProgress, text: 'Hello world', start: 0, end: 2},
+    ]);
+
+    cleanup(te, wss);
+  });
+
   it('emits sourceMessage but not transcription event when non transcription JSON message is received', async () => {
     const {wss, websocketConnected, te} = await createTranscriptionEngine();
     te.connectWhisperService();
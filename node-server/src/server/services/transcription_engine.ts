@@ -22,6 +22,10 @@ const BACKEND_TRANSCRIPT_BLOCK_SCHEMA = Type.Object(
 
 export type BackendTranscriptBlock = Static<typeof BACKEND_TRANSCRIPT_BLOCK_SCHEMA>;
 
+// Binary transcript blocks start with: uint8 type, uint32 keep, float64 start, float64 end (little endian)
+// followed by UTF-8 text
+const BINARY_HEADER_SIZE = 21;
+
 export type AudioTranscriptEvents = {
   transcription: (block: BackendTranscriptBlock) => unknown;
   sourceMessage: (message: JSON) => unknown;
@@ -30,6 +34,7 @@ export type AudioTranscriptEvents = {
 export default class TranscriptionEngine extends TypedEmitter<AudioTranscriptEvents> {
   private _ws?: WebSocket;
   private _log: Logger;
+  private _prevInProgressText = '';
 
   constructor(
     private _config: ConfigType,
@@ -54,6 +59,7 @@ export default class TranscriptionEngine extends TypedEmitter<AudioTranscriptEve
     }
 
     const ws = new WebSocket(this._config.whisper.endpoint);
+    this._prevInProgressText = '';
     ws.once('open', () => {
       this._log.info('Connected to whisper service');
       ws.send(
@@ -63,7 +69,16 @@ export default class TranscriptionEngine extends TypedEmitter<AudioTranscriptEve
       );
 
       this._ws = ws;
-      ws.on('message', data => {
+      ws.on('message', (data, isBinary) => {
+        if (isBinary) {
+          const block = this._decodeBinaryBlock(data as Buffer);
+          if (block) {
+            this._log.trace({msg: 'Emiting transcript transcript event', block});
+            this.emit('transcription', block);
+          }
+          return;
+        }
+
         let message;
         try {
           message = JSON.parse(data.toString());
@@ -71,6 +86,11 @@ export default class TranscriptionEngine extends TypedEmitter<AudioTranscriptEve
           this._log.error({msg: 'Failed to parse message from whisper service', err, message: data.toString()});
           return;
         }
+        // In progress deltas, sent if in_progress_deltas was selected
+        if (message?.type === BackendTranscriptBlockType.InProgress && typeof message.keep === 'number') {
+          const {keep, ...block} = message;
+          message = {...block, text: this._applyInProgressDelta(keep, block.text)};
+        }
         const isTranscriptBlock = Value.Check(BACKEND_TRANSCRIPT_BLOCK_SCHEMA, message);
 
         if (isTranscriptBlock) {
@@ -92,6 +112,44 @@ export default class TranscriptionEngine extends TypedEmitter<AudioTranscriptEve
     });
   }
 
+  /**
+   * Decodes a binary transcript block, sent if binary transcript_format was selected
+   * @param data binary message from whisper service
+   * @returns decoded transcript block, undefined if message is invalid
+   */
+  private _decodeBinaryBlock(data: Buffer): BackendTranscriptBlock | undefined {
+    if (data.length < BINARY_HEADER_SIZE) {
+      this._log.error({msg: 'Binary message from whisper service is too short', length: data.length});
+      return undefined;
+    }
+
+    const type = data.readUInt8(0);
+    const keep = data.readUInt32LE(1);
+    const start = data.readDoubleLE(5);
+    const end = data.readDoubleLE(13);
+    let text = data.toString('utf8', BINARY_HEADER_SIZE);
+
+    if (type === BackendTranscriptBlockType.InProgress) {
+      text = this._applyInProgressDelta(keep, text);
+    } else if (type !== BackendTranscriptBlockType.Final) {
+      this._log.error({msg: 'Binary message from whisper service has invalid type', type});
+      return undefined;
+    }
+    return {type, start, end, text};
+  }
+
+  /**
+   * Rebuilds in progress text from a delta against the previous in progress text
+   * @param keep number of characters (code points) of previous in progress text kept
+   * @param text text following kept characters
+   * @returns full in progress text
+   */
+  private _applyInProgressDelta(keep: number, text: string) {
+    const fullText = keep > 0 ? Array.from(this._prevInProgressText).slice(0, keep).join('') + text : text;
+    this._prevInProgressText = fullText;
+    return fullText;
+  }
+
   /**
    * Disconnects the existing whisper service connection
    */
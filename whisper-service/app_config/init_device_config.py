@@ -20,16 +20,23 @@ from custom_types.config_types import ModelConfig, DeviceConfig
 from custom_types.model_selection_types import SelectionOptions
 
 
-def init_model(device_config: dict[str, Any], key: str) -> ModelConfig:
+def init_model(
+    device_config: dict[str, Any],
+    key: str,
+    validate_implementation: bool = True
+) -> ModelConfig:
     '''
     Validates and initalizes given model_key in device_config.
     Checks if all required property for ModelConfig are present. Throws error if not.
     Implementation configuration is checked automatically when implementation is initialized.
-    Models are initialized by calling load_model() then unload_mode().
+    Models are not loaded here, MODEL_WARMER loads them in the background once server starts.
 
     Parameters:
-    device_config (dict): Loaded device_config dict
-    key           (str) : model_key to initialize
+    device_config           (dict): Loaded device_config dict
+    key                     (str) : model_key to initialize
+    validate_implementation (bool): Import implementation to check implementation configuration.
+                                    If False, implementation is imported and its configuration
+                                    checked when model is first loaded.
 
     Return:
     Validated ModelConfig object
@@ -48,20 +55,26 @@ def init_model(device_config: dict[str, Any], key: str) -> ModelConfig:
     config_dict_contains_dict(model_config, 'implementation_configuration')
     config_dict_contains_dict(model_config, 'available_features')
 
-    # Initialize the configured model
+    if not validate_implementation:
+        return {
+            'display_name': model_config['display_name'],
+            'description': model_config['description'],
+            'implementation_id': model_config['implementation_id'],
+            'implementation_configuration': model_config['implementation_configuration'],
+            'available_features': model_config['available_features']
+        }
+
+    # Validate implementation configuration of the configured model
     implementation_id: ModelImplementationId = model_config['implementation_id']
     implementation_config = model_config['implementation_configuration']
     logger.info(
-        'Initializing implementation: %s for model_key: %s', implementation_id, key
+        'Validating implementation: %s for model_key: %s', implementation_id, key
     )
 
     implementation = import_model_implementation(implementation_id)
-    model = implementation({}, implementation_config)
-
-    model.load_model()
-    model.unload_model()
+    implementation({}, implementation_config)
     logger.info(
-        'Successfully initialized implementation: %s for model_key: %s', implementation_id, key
+        'Successfully validated implementation: %s for model_key: %s', implementation_id, key
     )
 
     return {
@@ -73,13 +86,16 @@ def init_model(device_config: dict[str, Any], key: str) -> ModelConfig:
     }
 
 
-def init_device_config(device_config_path: str) -> tuple[DeviceConfig, SelectionOptions]:
+def init_device_config(
+    device_config_path: str,
+    validate_implementations: bool = True
+) -> tuple[DeviceConfig, SelectionOptions]:
     '''
     Loads device config file from provided path then initializes configured models.
 
-
     Parameters:
-    device_config_path (str): Path to device config file
+    device_config_path          (str) : Path to device config file
+    validate_implementations    (bool): Import implementations to check their configuration
 
     Returns:
     DeviceConfig object and SelectionOptions object
@@ -96,7 +112,7 @@ def init_device_config(device_config_path: str) -> tuple[DeviceConfig, Selection
     device_config: DeviceConfig = {}
     selection_options: SelectionOptions = []
     for key in loaded_config.keys():
-        model_config = init_model(loaded_config, key)
+        model_config = init_model(loaded_config, key, validate_implementations)
 
         device_config[key] = model_config
 
@@ -9,7 +9,7 @@ Classes:
 '''
 import os
 from dotenv import load_dotenv
-from custom_types.config_types import AppConfig
+from custom_types.config_types import AppConfig, IngestOverflowPolicy
 
 
 def load_config() -> AppConfig:
@@ -32,4 +32,39 @@ def load_config() -> AppConfig:
     config['PORT'] = int(os.environ.get('PORT', 8000))
     config['HOST'] = os.environ.get('HOST', '127.0.0.1')
 
+    config['MODEL_IDLE_TTL_SEC'] = float(os.environ.get('MODEL_IDLE_TTL_SEC', 300))
+    assert config['MODEL_IDLE_TTL_SEC'] >= 0, 'MODEL_IDLE_TTL_SEC must be nonnegative'
+
+    config['INGEST_QUEUE_SIZE'] = int(os.environ.get('INGEST_QUEUE_SIZE', 16))
+    assert config['INGEST_QUEUE_SIZE'] >= 1, 'INGEST_QUEUE_SIZE must be positive'
+
+    config['INGEST_OVERFLOW_POLICY'] = os.environ.get(
+        'INGEST_OVERFLOW_POLICY', IngestOverflowPolicy.COALESCE)
+    assert config['INGEST_OVERFLOW_POLICY'] in list(IngestOverflowPolicy), \
+        f'INGEST_OVERFLOW_POLICY must be one of: {", ".join(IngestOverflowPolicy)}'
+
+    config['INGEST_LOAD_SIGNAL_SEC'] = float(os.environ.get('INGEST_LOAD_SIGNAL_SEC', 3))
+    assert config['INGEST_LOAD_SIGNAL_SEC'] > 0, 'INGEST_LOAD_SIGNAL_SEC must be positive'
+
+    config['INGEST_MAX_BACKLOG_SEC'] = float(os.environ.get('INGEST_MAX_BACKLOG_SEC', 30))
+    assert config['INGEST_MAX_BACKLOG_SEC'] > 0, 'INGEST_MAX_BACKLOG_SEC must be positive'
+
+    config['WARM_MODEL_KEYS'] = [
+        key.strip() for key in os.environ.get('WARM_MODEL_KEYS', '').split(',') if key.strip()
+    ]
+
+    config['WARMUP_CONCURRENCY'] = int(os.environ.get('WARMUP_CONCURRENCY', 2))
+    assert config['WARMUP_CONCURRENCY'] >= 1, 'WARMUP_CONCURRENCY must be positive'
+
+    lazy_model_init = os.environ.get('LAZY_MODEL_INIT', 'false').lower()
+    assert lazy_model_init in ['true', 'false'], 'LAZY_MODEL_INIT must be one of: true, false'
+    config['LAZY_MODEL_INIT'] = lazy_model_init == 'true'
+
+    config['WORKERS'] = int(os.environ.get('WORKERS', 1))
+    assert config['WORKERS'] >= 1, 'WORKERS must be positive'
+
+    config['IN_PROGRESS_MIN_INTERVAL_MS'] = int(os.environ.get('IN_PROGRESS_MIN_INTERVAL_MS', 0))
+    assert config['IN_PROGRESS_MIN_INTERVAL_MS'] >= 0, \
+        'IN_PROGRESS_MIN_INTERVAL_MS must be nonnegative'
+
     return config
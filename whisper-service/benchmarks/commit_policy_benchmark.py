@@ -0,0 +1,156 @@
+'''
+Benchmark comparing how much audio LocalAgreeModelBase transcribes per decode under each
+commit policy, using a simulated model transcribing long run on sentences
+
+Run from whisper-service directory:
+    python -m benchmarks.commit_policy_benchmark [--sentence-words N] [--seconds N]
+
+Classes:
+    DiscardingWebSocket
+    SimulatedLocalAgreeModel
+
+Functions:
+    run_policy
+    main
+'''
+import argparse
+import asyncio
+import re
+import statistics
+import numpy as np
+from model_bases.local_agree_model_base import LocalAgreeModelBase, TranscriptionSegment
+from custom_types.config_types import CommitPolicy, LocalAgreeMode
+
+SAMPLE_RATE = 16_000
+# Seconds between starts of consecutive words, and duration of each word
+WORD_INTERVAL = 0.4
+WORD_DURATION = 0.35
+
+
+class DiscardingWebSocket:  # pylint: disable=too-few-public-methods
+    '''
+    Fake websocket that discards sent transcriptions
+    '''
+    __slots__ = []
+
+    async def send_json(self, message):
+        '''
+        Discards message
+        '''
+
+
+class SimulatedLocalAgreeModel(LocalAgreeModelBase):
+    '''
+    Local agreement model that transcribes a fixed stream of words. The last word of each
+    transcription alternates between two spellings, like a model revising trailing words.
+    Records the length of each transcribed segment and how far behind received audio each
+    word is when it is finalized.
+    '''
+    __slots__ = ['sentence_words', 'num_decodes', 'window_seconds', 'final_lags']
+
+    def __init__(self, ws, config, sentence_words):
+        super().__init__(ws, config, local_agree_dim=config['local_agree_dim'])
+        self.sentence_words = sentence_words
+        self.num_decodes = 0
+        self.window_seconds = []
+        self.final_lags = []
+
+    def load_model(self):
+        return None
+
+    def unload_model(self):
+        return None
+
+    async def transcribe_audio(self, audio_segment, prev_text):
+        self.num_decodes += 1
+        self.window_seconds.append(len(audio_segment) / SAMPLE_RATE)
+        window_start = self.num_purged_samples / SAMPLE_RATE
+        window_end = window_start + len(audio_segment) / SAMPLE_RATE
+
+        segments = []
+        word = int(window_start / WORD_INTERVAL + 0.5)
+        while word * WORD_INTERVAL + WORD_DURATION <= window_end:
+            text = f' word{word}'
+            if self.sentence_words and word % self.sentence_words == self.sentence_words - 1:
+                text += '.'
+            segments.append(TranscriptionSegment(
+                text,
+                max(0.0, word * WORD_INTERVAL - window_start),
+                word * WORD_INTERVAL + WORD_DURATION - window_start
+            ))
+            word += 1
+        if segments and self.num_decodes % 2:
+            segments[-1].text += '-'
+        return segments
+
+    async def on_final_transcript_block(self, text, start=-1.0, end=-1.0):
+        received_end = (self.num_purged_samples + len(self.buffer)) / SAMPLE_RATE
+        for word in re.findall(r'word(\d+)', text):
+            self.final_lags.append(received_end - int(word) * WORD_INTERVAL - WORD_DURATION)
+        await super().on_final_transcript_block(text, start, end)
+
+
+async def run_policy(
+    mode: LocalAgreeMode,
+    policy: CommitPolicy,
+    args: argparse.Namespace
+) -> SimulatedLocalAgreeModel:
+    '''
+    Streams silence through a simulated model, processing the buffer every min_new_samples.
+
+    Parameters:
+    mode    (LocalAgreeMode): Local agreement mode
+    policy  (CommitPolicy)  : Commit policy
+    args    (Namespace)     : Parsed command line arguments
+
+    Returns:
+    Model containing recorded measurements
+    '''
+    config = LocalAgreeModelBase.validate_config({
+        'local_agree_dim': 2,
+        'local_agree_mode': mode,
+        'min_new_samples': args.min_new_samples,
+        'max_segment_samples': args.max_segment_samples,
+        'silence_threshold': 0.0,
+        'commit_policy': policy,
+    })
+    model = SimulatedLocalAgreeModel(DiscardingWebSocket(), config, args.sentence_words)
+
+    chunk = np.zeros(args.min_new_samples, dtype=np.int16)
+    for _ in range(args.seconds * SAMPLE_RATE // args.min_new_samples):
+        extra_audio = model.append_audio(chunk)
+        while len(extra_audio) > 0:
+            await model.process_buffer()
+            extra_audio = model.append_audio(extra_audio)
+        await model.process_buffer()
+    return model
+
+
+def main() -> None:
+    '''
+    Runs each mode and commit policy and prints average decode window and word finalize lag.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark local agreement commit policies')
+    parser.add_argument('--sentence-words', type=int, default=150,
+                        help='Words per sentence, 0 for no sentence ends')
+    parser.add_argument('--seconds', type=int, default=600,
+                        help='Seconds of speech to stream')
+    parser.add_argument('--min-new-samples', type=int, default=16_000,
+                        help='Samples received between decodes, min_new_samples of model')
+    parser.add_argument('--max-segment-samples', type=int, default=480_000,
+                        help='Samples in buffer, max_segment_samples of model')
+    args = parser.parse_args()
+
+    print('mode        | policy   | decodes | mean window sec | mean word finalize lag sec')
+    for mode in LocalAgreeMode:
+        for policy in CommitPolicy:
+            model = asyncio.run(run_policy(mode, policy, args))
+            print(
+                f'{mode:11} | {policy:8} | {model.num_decodes:7} | '
+                f'{statistics.fmean(model.window_seconds):15.2f} | '
+                f'{statistics.fmean(model.final_lags) if model.final_lags else 0:26.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
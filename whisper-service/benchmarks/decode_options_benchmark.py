@@ -0,0 +1,165 @@
+'''
+Benchmark comparing faster whisper decode latency under different decode options. Chunked wav
+files are replayed as a sliding decode window that grows by min_new_samples per decode and
+holds at most max_segment_samples, like the buffer of FasterWhisperModel.
+
+Run from whisper-service directory:
+    python -m benchmarks.decode_options_benchmark --model-key faster-whisper:cpu-tiny-en
+
+Settings compared are the commit and in_progress decode_options of the model, and presets
+ranging from beam search with temperature fallback to greedy decoding with a token cap.
+Results contain decode latency summaries, including p50 and p99, and mean words per decode.
+
+Functions:
+    decode_windows
+    benchmark_setting
+    main
+'''
+import argparse
+import io
+import json
+import pathlib
+import statistics
+import time
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+from faster_whisper import WhisperModel
+from app_config.init_device_config import init_model
+from benchmarks.replay_benchmark import \
+    DEFAULT_CHUNKS_DIR, load_chunks, summarize, write_results
+from custom_types.config_types import DecodeType
+from model_implementations.faster_whisper_model import \
+    DecodeOptions, FasterWhisperModel, load_whisper_model, transcribe_words
+from utils.decode_wav import decode_pcm16
+
+# (beam_size, temperature_fallback, max_new_tokens) of preset settings
+PRESETS: dict[str, DecodeOptions] = {
+    'beam5_fallback': (5, True, 0),
+    'beam5': (5, False, 0),
+    'greedy': (1, False, 0),
+    'greedy_max32': (1, False, 32),
+}
+
+
+def decode_windows(
+    num_samples: int,
+    min_new_samples: int,
+    max_segment_samples: int
+) -> list[tuple[int, int]]:
+    '''
+    Parameters:
+    num_samples         (int): Number of samples of replayed audio
+    min_new_samples     (int): Samples received between decodes
+    max_segment_samples (int): Maximum samples in a decode window
+
+    Returns:
+    List of (start sample, end sample) tuples of each decode window
+    '''
+    return [
+        (max(0, end - max_segment_samples), end)
+        for end in range(min_new_samples, num_samples + 1, min_new_samples)
+    ]
+
+
+def benchmark_setting(
+    model: WhisperModel,
+    audio: npt.NDArray,
+    windows: list[tuple[int, int]],
+    decode_options: DecodeOptions,
+    word_timestamps: bool
+) -> dict[str, Any]:
+    '''
+    Transcribes each decode window with decode options, timing each decode.
+
+    Parameters:
+    model           (WhisperModel)  : Model to transcribe with
+    audio           (1D numpy array): Replayed audio normalized to [-1, 1]
+    windows         (list)          : (start sample, end sample) tuples of decode windows
+    decode_options  (DecodeOptions) : Options used to decode
+    word_timestamps (bool)          : Align words to audio
+
+    Returns:
+    Dict of decode options and measurements
+    '''
+    latencies = []
+    num_words = []
+    for start, end in windows:
+        decode_start = time.perf_counter()
+        words = transcribe_words(
+            model, audio[start:end], '', word_timestamps=word_timestamps,
+            decode_options=decode_options
+        )
+        latencies.append(time.perf_counter() - decode_start)
+        num_words.append(len(words))
+
+    beam_size, temperature_fallback, max_new_tokens = decode_options
+    return {
+        'beam_size': beam_size,
+        'temperature_fallback': temperature_fallback,
+        'max_new_tokens': max_new_tokens,
+        'decode_latency_sec': summarize(latencies),
+        'words_per_decode': statistics.fmean(num_words),
+    }
+
+
+def main() -> None:
+    '''
+    Parses command line arguments, runs each setting, and writes JSON results.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark faster whisper decode options')
+    parser.add_argument('--device-config', type=pathlib.Path,
+                        default=pathlib.Path('device_config.template.json'),
+                        help='Device config containing faster whisper model to benchmark')
+    parser.add_argument('--model-key', default='faster-whisper:cpu-tiny-en',
+                        help='Key of faster whisper model in device config to benchmark')
+    parser.add_argument('--chunks-dir', type=pathlib.Path, default=DEFAULT_CHUNKS_DIR,
+                        help='Directory of 16khz mono 16 bit wav chunks')
+    parser.add_argument('--max-chunks', type=int, default=0,
+                        help='Only replay the first N chunks, 0 for all')
+    parser.add_argument('--no-word-timestamps', action='store_true',
+                        help='Interpolate word times instead of aligning words')
+    parser.add_argument('--output', type=pathlib.Path,
+                        help='File to write JSON results to, defaults to stdout')
+    args = parser.parse_args()
+
+    with open(args.device_config, 'r', encoding='utf-8') as file:
+        loaded_config = json.load(file)
+    config = FasterWhisperModel.validate_config(
+        init_model(loaded_config, args.model_key)['implementation_configuration'])
+
+    chunks = load_chunks(args.chunks_dir)[:args.max_chunks or None]
+    audio = np.concatenate([
+        decode_pcm16(io.BytesIO(data)) for data, _ in chunks
+    ]).astype(np.float32) / 32768
+    windows = decode_windows(
+        len(audio), config['min_new_samples'], config['max_segment_samples'])
+
+    settings = dict(PRESETS)
+    for decode_type in DecodeType:
+        options = config['decode_options'][decode_type]
+        settings[f'config_{decode_type}'] = (
+            options['beam_size'], options['temperature_fallback'], options['max_new_tokens'])
+
+    model = load_whisper_model({'model': config['model'], 'device': config['device'],
+                                'num_workers': 1})
+    # Warm up model so first setting does not measure initialization
+    transcribe_words(model, audio[windows[0][0]:windows[0][1]], '')
+
+    results = {
+        'parameters': {
+            'model_key': args.model_key,
+            'decodes': len(windows),
+            'word_timestamps': not args.no_word_timestamps,
+        },
+        'settings': {
+            name: benchmark_setting(
+                model, audio, windows, decode_options, not args.no_word_timestamps)
+            for name, decode_options in settings.items()
+        },
+    }
+    write_results(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
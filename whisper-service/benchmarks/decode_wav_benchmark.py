@@ -0,0 +1,98 @@
+'''
+Microbenchmark comparing wave.open based wav decoding with decoding straight into the buffer
+
+Run from whisper-service directory:
+    python -m benchmarks.decode_wav_benchmark [--chunks-dir DIR] [--repeat N]
+
+Functions:
+    decode_wav_wave_module
+    run_wave_module
+    run_direct
+    main
+'''
+import argparse
+import io
+import pathlib
+import timeit
+import wave
+import numpy as np
+import numpy.typing as npt
+from utils.decode_wav import PCM16_SCALE, decode_pcm16
+from utils.np_circular_buffer import NPCircularBuffer
+
+DEFAULT_CHUNKS_DIR = pathlib.Path(__file__).parents[2] / \
+    'test-audio-files' / 'wikipedia-.fun' / 'chunked'
+
+
+def decode_wav_wave_module(wav_buffer: io.BytesIO) -> npt.NDArray:
+    '''
+    Previous implementation of decode_wav using the wave module and float16 normalization.
+
+    Parameters:
+    wav_buffer  (io.BytesIO): Wav audio buffer
+
+    Returns:
+    1D numpy array containing float16 data normalized to [-1, 1].
+    '''
+    with wave.open(wav_buffer, 'rb') as wav_audio:
+        assert wav_audio.getsampwidth() == 2
+        assert wav_audio.getframerate() == 16_000
+        assert wav_audio.getnchannels() == 1
+
+        frames = wav_audio.readframes(wav_audio.getnframes())
+        audio = np.frombuffer(frames, dtype=np.int16)
+        audio = audio.astype(np.float16) / abs(np.iinfo(np.int16).min)
+    return audio
+
+
+def run_wave_module(chunks: list[bytes], buffer: NPCircularBuffer) -> None:
+    '''
+    Decodes chunks with previous implementation and appends them to buffer.
+
+    Parameters:
+    chunks  (list[bytes])     : Wav chunks to decode
+    buffer  (NPCircularBuffer): Buffer to append decoded audio to
+    '''
+    for chunk in chunks:
+        buffer.shift_buffer(len(buffer))
+        buffer.append_sequence(decode_wav_wave_module(io.BytesIO(chunk)))
+
+
+def run_direct(chunks: list[bytes], buffer: NPCircularBuffer) -> None:
+    '''
+    Decodes chunks by parsing the RIFF header and normalizing samples into the buffer tail.
+
+    Parameters:
+    chunks  (list[bytes])     : Wav chunks to decode
+    buffer  (NPCircularBuffer): Buffer to append decoded audio to
+    '''
+    for chunk in chunks:
+        buffer.shift_buffer(len(buffer))
+        buffer.append_sequence(decode_pcm16(io.BytesIO(chunk)), PCM16_SCALE)
+
+
+def main() -> None:
+    '''
+    Times both decoding implementations and prints the time per chunk.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark wav chunk decoding')
+    parser.add_argument('--chunks-dir', type=pathlib.Path, default=DEFAULT_CHUNKS_DIR,
+                        help='Directory of 16khz mono 16 bit wav chunks')
+    parser.add_argument('--repeat', type=int, default=200,
+                        help='Number of times to decode all chunks')
+    args = parser.parse_args()
+
+    chunks = [path.read_bytes() for path in sorted(args.chunks_dir.glob('*.wav'))]
+    buffer = NPCircularBuffer(max(len(chunk) for chunk in chunks), dtype=np.float32, ring=True)
+
+    results = {}
+    for name, fun in (('wave_module', run_wave_module), ('direct', run_direct)):
+        seconds = min(timeit.repeat(lambda fun=fun: fun(chunks, buffer), number=args.repeat))
+        results[name] = seconds / (args.repeat * len(chunks))
+        print(f'{name:12}: {results[name] * 1e6:8.2f} us per chunk')
+
+    print(f'speedup     : {results["wave_module"] / results["direct"]:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
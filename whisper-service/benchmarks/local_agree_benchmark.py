@@ -0,0 +1,106 @@
+'''
+Microbenchmark comparing string based local agreement with token id array based agreement
+for increasing hypothesis lengths
+
+Run from whisper-service directory:
+    python -m benchmarks.local_agree_benchmark [--local-agree-dim N] [--repeat N]
+
+Functions:
+    agree_strings
+    agree_token_ids
+    main
+'''
+import argparse
+import timeit
+from model_bases.local_agree_model_base import TranscriptionSegment
+from utils.agreement_history import AgreementHistory
+
+
+def agree_strings(
+    segments: list[TranscriptionSegment],
+    prev_transcriptions: list[list[TranscriptionSegment]]
+) -> tuple[int, str]:
+    '''
+    Previous implementation comparing segment text one segment at a time and building text
+    with repeated concatenation.
+
+    Parameters:
+    segments            (list[TranscriptionSegment])      : New transcription
+    prev_transcriptions (list[list[TranscriptionSegment]]): Previous transcriptions
+
+    Returns:
+    Number of agreed segments and their text
+    '''
+    max_length = min(len(transcription) for transcription in prev_transcriptions)
+    agreed_text = ''
+    num_agreed = 0
+    for i in range(min(len(segments), max_length)):
+        if any(segments[i].text != transcription[i].text for transcription in prev_transcriptions):
+            break
+        agreed_text += segments[i].text
+        num_agreed += 1
+    return num_agreed, agreed_text
+
+
+def agree_token_ids(
+    segments: list[TranscriptionSegment],
+    history: AgreementHistory
+) -> tuple[int, str]:
+    '''
+    Encodes new transcription and finds agreed prefix with one vectorized comparison.
+
+    Parameters:
+    segments    (list[TranscriptionSegment]): New transcription
+    history     (AgreementHistory)          : History holding previous transcriptions
+
+    Returns:
+    Number of agreed segments and their text
+    '''
+    texts = [segment.text for segment in segments]
+    num_agreed = history.agreed_prefix_length(history.encode(texts))
+    return num_agreed, ''.join(texts[:num_agreed])
+
+
+def main() -> None:
+    '''
+    Times both implementations with hypotheses that fully agree and prints the time per step.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark local agreement')
+    parser.add_argument('--local-agree-dim', type=int, default=2,
+                        help='Number of transcriptions that must agree')
+    parser.add_argument('--repeat', type=int, default=2_000,
+                        help='Number of agreement steps per measurement')
+    args = parser.parse_args()
+
+    print(f'{"words":>6} | {"strings us":>10} | {"token ids us":>12} | speedup')
+    for num_words in (10, 50, 100, 250, 500):
+        segments = [
+            TranscriptionSegment(f' word{i % 97}', i * 0.3, i * 0.3 + 0.3)
+            for i in range(num_words)
+        ]
+        prev_transcriptions = [list(segments) for _ in range(args.local_agree_dim - 1)]
+        history = AgreementHistory(args.local_agree_dim - 1)
+        for transcription in prev_transcriptions:
+            history.append(history.encode([segment.text for segment in transcription]))
+        assert agree_strings(segments, prev_transcriptions) == agree_token_ids(segments, history)
+
+        results = {}
+        for name, fun, context in (
+            ('strings', agree_strings, prev_transcriptions),
+            ('token_ids', agree_token_ids, history)
+        ):
+            seconds = min(timeit.repeat(
+                lambda fun=fun, context=context, segments=segments: fun(segments, context),
+                number=args.repeat,
+                repeat=3
+            ))
+            results[name] = seconds / args.repeat
+        print(
+            f'{num_words:6} | {results["strings"] * 1e6:10.2f} | '
+            f'{results["token_ids"] * 1e6:12.2f} | '
+            f'{results["strings"] / results["token_ids"]:6.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+'''
+Microbenchmark comparing feature extraction of the whole decode window with incremental
+log mel frames from MelFeatureCache
+
+Run from whisper-service directory:
+    python -m benchmarks.mel_feature_benchmark [--max-segment-samples N] [--min-new-samples N]
+
+Functions:
+    extract_window
+    extract_incremental
+    main
+'''
+import argparse
+import timeit
+import numpy as np
+import numpy.typing as npt
+from faster_whisper.feature_extractor import FeatureExtractor
+from utils.mel_feature_cache import MelFeatureCache, normalize_log_mel
+
+
+def extract_window(
+    feature_extractor: FeatureExtractor,
+    audio: npt.NDArray,
+    new_audio: npt.NDArray
+) -> npt.NDArray:
+    '''
+    Previous implementation, computes features of every sample in the decode window.
+
+    Parameters:
+    feature_extractor   (FeatureExtractor): Feature extractor of model
+    audio               (1D numpy array)  : Audio in buffer before new audio was received
+    new_audio           (1D numpy array)  : Newly received audio
+
+    Returns:
+    Features of decode window
+    '''
+    return feature_extractor(np.concatenate((audio, new_audio)))
+
+
+def extract_incremental(
+    cache: MelFeatureCache,
+    audio: npt.NDArray,
+    new_audio: npt.NDArray
+) -> npt.NDArray:
+    '''
+    Computes frames of new audio, then gets features of decode window from cache.
+    Frames of new audio are dropped afterwards, so each repetition appends the same audio.
+
+    Parameters:
+    cache       (MelFeatureCache): Cache holding frames of audio
+    audio       (1D numpy array) : Audio in buffer before new audio was received
+    new_audio   (1D numpy array) : Newly received audio
+
+    Returns:
+    Features of decode window
+    '''
+    num_frames = len(cache)
+    pending_samples = cache.pending_samples
+    cache.append(new_audio)
+    features = normalize_log_mel(cache.get_frames(0, len(audio) + len(new_audio)))
+
+    cache.frames.end = cache.frames.start + num_frames
+    cache.pending_samples = pending_samples
+    cache.num_samples = len(audio)
+    return features
+
+
+def main() -> None:
+    '''
+    Times both methods for a full buffer and prints the time per decode.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark incremental log mel features')
+    parser.add_argument('--max-segment-samples', type=int, default=480_000,
+                        help='Samples in decode window, max_segment_samples of model')
+    parser.add_argument('--min-new-samples', type=int, default=48_000,
+                        help='Samples received between decodes, min_new_samples of model')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Number of decodes per measurement')
+    args = parser.parse_args()
+
+    feature_extractor = FeatureExtractor()
+    samples = np.random.default_rng(0).uniform(-1, 1, args.max_segment_samples)
+    samples = samples.astype(np.float32)
+    audio = samples[:-args.min_new_samples]
+    new_audio = samples[-args.min_new_samples:]
+
+    cache = MelFeatureCache(feature_extractor.mel_filters, args.max_segment_samples)
+    cache.append(audio)
+
+    results = {}
+    for name, fun, context in (
+        ('window', extract_window, feature_extractor),
+        ('incremental', extract_incremental, cache)
+    ):
+        seconds = min(timeit.repeat(
+            lambda fun=fun, context=context: fun(context, audio, new_audio),
+            number=args.repeat,
+            repeat=3
+        ))
+        results[name] = seconds / args.repeat
+        print(f'{name:12}: {results[name] * 1e3:8.2f} ms per decode')
+
+    print(f'speedup     : {results["window"] / results["incremental"]:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
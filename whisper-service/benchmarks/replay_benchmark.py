@@ -0,0 +1,339 @@
+'''
+End to end benchmark that replays chunked wav files through the /sourcesink websocket.
+
+Starts the app from create_server in a background thread, then connects simulated clients that
+authenticate, select a model, and stream the chunks at a configurable pace. Results are written
+as JSON so runs can be compared over time.
+
+Run from whisper-service directory:
+    python -m benchmarks.replay_benchmark --model-key mock_transcription_duration --clients 4
+    python -m benchmarks.replay_benchmark --model-key faster-whisper:cpu-tiny-en --speed 0
+
+Reported metrics:
+    first_token_latency_sec : Time from first chunk sent to first non empty transcription
+    final_latency_sec       : Time from the chunk containing the end of a final block being sent
+                              to the final block being received
+    real_time_factor        : Time from first chunk sent to last message received divided by
+                              seconds of audio sent. Use --speed 0 to measure processing speed
+    messages_per_sec        : Transcription messages received per second by all clients
+
+Functions:
+    load_chunks
+    summarize
+    write_results
+    run_client
+    measure_client
+    start_server
+    run_benchmark
+    main
+'''
+import argparse
+import asyncio
+import bisect
+import concurrent.futures
+import io
+import json
+import pathlib
+import secrets
+import statistics
+import sys
+import threading
+import time
+from typing import Any
+import uvicorn
+import websockets
+from app_config.init_device_config import init_model
+from custom_types.config_types import AppConfig, IngestOverflowPolicy, ModelReadiness
+from custom_types.transcription_types import BackendTranscriptionBlockType
+from model_implementations.import_model_implementation import import_model_implementation
+from server.create_server import create_server
+from server.helpers.authenticate_websocket import authenticate_websocket
+from server.helpers.select_model import select_model
+from utils.decode_wav import decode_pcm16
+from utils.model_warmer import MODEL_WARMER
+
+DEFAULT_CHUNKS_DIR = pathlib.Path(__file__).parents[2] / \
+    'test-audio-files' / 'wikipedia-.fun' / 'chunked'
+
+
+def load_chunks(chunks_dir: pathlib.Path) -> list[tuple[bytes, float]]:
+    '''
+    Loads wav chunks in name order.
+
+    Parameters:
+    chunks_dir  (Path): Directory of 16khz mono 16 bit wav chunks
+
+    Returns:
+    List of (wav bytes, duration in seconds) tuples
+    '''
+    chunks = []
+    for path in sorted(chunks_dir.glob('*.wav')):
+        data = path.read_bytes()
+        chunks.append((data, len(decode_pcm16(io.BytesIO(data))) / 16_000))
+    return chunks
+
+
+def summarize(values: list[float]) -> dict[str, float] | None:
+    '''
+    Summarizes a list of measurements.
+
+    Parameters:
+    values  (list[float]): Measurements
+
+    Returns:
+    Dict containing count, mean, p50, p95, p99, and max, None if there are no measurements
+    '''
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'mean': statistics.fmean(values),
+        'p50': values[int(0.50 * (len(values) - 1))],
+        'p95': values[int(0.95 * (len(values) - 1))],
+        'p99': values[int(0.99 * (len(values) - 1))],
+        'max': values[-1],
+    }
+
+
+def write_results(results: dict[str, Any], output: pathlib.Path | None) -> None:
+    '''
+    Writes benchmark results as JSON.
+
+    Parameters:
+    results (dict): Benchmark parameters and results
+    output  (Path): File to write results to, stdout if None
+    '''
+    if output:
+        output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+async def run_client(
+    url: str,
+    api_key: str,
+    chunks: list[tuple[bytes, float]],
+    args: argparse.Namespace
+) -> dict[str, Any]:
+    '''
+    Runs a simulated client that streams chunks and records received transcriptions.
+
+    Parameters:
+    url         (str)      : Websocket url of /sourcesink
+    api_key     (str)      : API key to authenticate with
+    chunks      (list)     : (wav bytes, duration) tuples to send
+    args        (Namespace): Parsed command line arguments containing model_key, speed,
+                             and drain_sec
+
+    Returns:
+    Dict of measurements for client
+    '''
+    received: list[tuple[float, dict]] = []
+
+    async with websockets.connect(url, max_size=None) as websocket:
+        await websocket.send(json.dumps({'api_key': api_key}))
+        await websocket.recv()
+        await websocket.send(json.dumps({
+            'model_key': args.model_key,
+            'feature_selection': {},
+            'audio_format': 'wav'
+        }))
+
+        async def receive():
+            async for message in websocket:
+                received.append((time.perf_counter(), json.loads(message)))
+
+        receiver = asyncio.create_task(receive())
+
+        send_times = []
+        audio_ends = []
+        start = time.perf_counter()
+        for data, duration in chunks:
+            # Audio can only be sent once it has been recorded
+            audio_ends.append((audio_ends[-1] if audio_ends else 0) + duration)
+            if args.speed > 0:
+                await asyncio.sleep(
+                    max(0, start + audio_ends[-1] / args.speed - time.perf_counter()))
+            await websocket.send(data)
+            send_times.append(time.perf_counter())
+
+        num_received = -1
+        while num_received != len(received):
+            num_received = len(received)
+            await asyncio.sleep(args.drain_sec)
+        receiver.cancel()
+
+    return measure_client(received, send_times, audio_ends)
+
+
+def measure_client(
+    received: list[tuple[float, dict]],
+    send_times: list[float],
+    audio_ends: list[float]
+) -> dict[str, Any]:
+    '''
+    Computes measurements for a client from what it sent and received.
+
+    Parameters:
+    received    (list[tuple[float, dict]]): (receive time, message) tuples
+    send_times  (list[float])             : Time each chunk was sent
+    audio_ends  (list[float])             : Audio timestamp of the end of each chunk
+
+    Returns:
+    Dict of measurements for client
+    '''
+    final_latencies = []
+    for receive_time, message in received:
+        if message.get('type') == BackendTranscriptionBlockType.FINAL:
+            # Find chunk containing end of final block
+            chunk_idx = min(
+                bisect.bisect_left(audio_ends, message['end'] - 1e-6), len(audio_ends) - 1)
+            final_latencies.append(receive_time - send_times[chunk_idx])
+
+    first_token_times = [
+        receive_time for receive_time, message in received if message.get('text', '').strip()
+    ]
+    return {
+        'first_token_latency_sec': first_token_times[0] - send_times[0]
+        if first_token_times else None,
+        'final_latencies_sec': final_latencies,
+        'processing_sec': (received[-1][0] if received else send_times[-1]) - send_times[0],
+        'audio_sec': audio_ends[-1],
+        'messages': len(received),
+        'errors': [message for _, message in received if message.get('error')],
+    }
+
+
+def start_server(app, port: int) -> tuple[uvicorn.Server, threading.Thread, int]:
+    '''
+    Starts uvicorn server in a background thread with its own event loop,
+    so server work does not delay client timing measurements.
+
+    Parameters:
+    app     (FastAPI): App to serve
+    port    (int)    : Port to listen on, 0 to pick a free port
+
+    Returns:
+    Server, thread running server, and port server is listening on
+    '''
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError('Server failed to start')
+        time.sleep(0.01)
+    return server, thread, server.servers[0].sockets[0].getsockname()[1]
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    '''
+    Starts server and runs clients according to command line arguments.
+
+    Parameters:
+    args    (Namespace): Parsed command line arguments
+
+    Returns:
+    Dict of benchmark parameters and results
+    '''
+    with open(args.device_config, 'r', encoding='utf-8') as file:
+        loaded_config = json.load(file)
+    model_config = init_model(loaded_config, args.model_key)
+    device_config = {args.model_key: model_config}
+    selection_options = [{
+        'model_key': args.model_key,
+        'display_name': model_config['display_name'],
+        'description': model_config['description'],
+        'available_features': model_config['available_features']
+    }]
+
+    config = AppConfig()
+    config['API_KEY'] = secrets.token_hex(16)
+    config['LOG_LEVEL'] = 'info'
+    config['HOST'] = '127.0.0.1'
+    config['PORT'] = args.port
+    config['MODEL_IDLE_TTL_SEC'] = 300
+    config['INGEST_QUEUE_SIZE'] = 16
+    config['INGEST_OVERFLOW_POLICY'] = IngestOverflowPolicy.COALESCE
+    config['INGEST_LOAD_SIGNAL_SEC'] = 3
+    config['INGEST_MAX_BACKLOG_SEC'] = 30
+    config['IN_PROGRESS_MIN_INTERVAL_MS'] = 0
+
+    # Keep model loaded so clients do not measure loading time
+    concurrent.futures.wait(
+        MODEL_WARMER.start(device_config, [args.model_key], import_model_implementation, 1))
+    if MODEL_WARMER.status() != ModelReadiness.READY:
+        raise RuntimeError(f'Failed to load model: {args.model_key}')
+    app = create_server(config, device_config, selection_options,
+                        import_model_implementation, authenticate_websocket, select_model)
+    server, thread, port = start_server(app, args.port)
+
+    chunks = load_chunks(args.chunks_dir)[:args.max_chunks or None]
+    start = time.perf_counter()
+    try:
+        clients = await asyncio.gather(*(
+            run_client(f'ws://127.0.0.1:{port}/sourcesink', config['API_KEY'], chunks, args)
+            for _ in range(args.clients)
+        ))
+    finally:
+        wall_sec = time.perf_counter() - start
+        server.should_exit = True
+        thread.join()
+
+    return {
+        'parameters': {
+            'model_key': args.model_key,
+            'implementation_configuration': model_config['implementation_configuration'],
+            'clients': args.clients,
+            'speed': args.speed,
+            'chunks': len(chunks),
+        },
+        'first_token_latency_sec': summarize([
+            client['first_token_latency_sec'] for client in clients
+            if client['first_token_latency_sec'] is not None
+        ]),
+        'final_latency_sec': summarize([
+            latency for client in clients for latency in client['final_latencies_sec']
+        ]),
+        'real_time_factor': summarize([
+            client['processing_sec'] / client['audio_sec'] for client in clients
+        ]),
+        'messages_per_sec': sum(client['messages'] for client in clients) / wall_sec,
+        'wall_sec': wall_sec,
+        'errors': [error for client in clients for error in client['errors']],
+    }
+
+
+def main() -> None:
+    '''
+    Parses command line arguments, runs benchmark, and writes JSON results.
+    '''
+    parser = argparse.ArgumentParser(description='Replay chunked audio through whisper service')
+    parser.add_argument('--device-config', type=pathlib.Path,
+                        default=pathlib.Path('device_config.template.json'),
+                        help='Device config containing model to benchmark')
+    parser.add_argument('--model-key', default='mock_transcription_duration',
+                        help='Key of model in device config to benchmark')
+    parser.add_argument('--clients', type=int, default=1,
+                        help='Number of concurrent websocket clients')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Multiple of real time to stream audio at, 0 for no pacing')
+    parser.add_argument('--chunks-dir', type=pathlib.Path, default=DEFAULT_CHUNKS_DIR,
+                        help='Directory of 16khz mono 16 bit wav chunks')
+    parser.add_argument('--max-chunks', type=int, default=0,
+                        help='Only replay the first N chunks, 0 for all')
+    parser.add_argument('--drain-sec', type=float, default=2.0,
+                        help='Seconds without messages before a client stops waiting')
+    parser.add_argument('--port', type=int, default=0,
+                        help='Port to run server on, 0 to pick a free port')
+    parser.add_argument('--output', type=pathlib.Path,
+                        help='File to write JSON results to, defaults to stdout')
+    args = parser.parse_args()
+
+    write_results(asyncio.run(run_benchmark(args)), args.output)
+
+
+if __name__ == '__main__':
+    main()
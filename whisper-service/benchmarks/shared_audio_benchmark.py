@@ -0,0 +1,96 @@
+'''
+Microbenchmark comparing pickled audio transfer with shared memory transfer to an inference
+worker process
+
+Run from whisper-service directory:
+    python -m benchmarks.shared_audio_benchmark [--max-segment-samples N] [--repeat N]
+
+Functions:
+    read_audio
+    run_pickled
+    run_shared
+    main
+'''
+import argparse
+import multiprocessing
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import numpy.typing as npt
+from utils.np_circular_buffer import NPCircularBuffer
+from utils.shared_array import SharedArrayRef, resolve_shared_array
+
+
+def read_audio(audio: npt.NDArray | SharedArrayRef) -> float:
+    '''
+    Stand in for inference that reads every sample of the audio it receives.
+
+    Parameters:
+    audio   (numpy array | SharedArrayRef): Audio sent to worker
+
+    Returns:
+    Peak amplitude of audio
+    '''
+    return float(np.abs(resolve_shared_array(audio)).max())
+
+
+def run_pickled(executor: ProcessPoolExecutor, buffer: NPCircularBuffer) -> None:
+    '''
+    Sends current buffer to worker as a pickled numpy array.
+
+    Parameters:
+    executor    (ProcessPoolExecutor): Executor with one worker process
+    buffer      (NPCircularBuffer)   : Buffer holding audio segment
+    '''
+    executor.submit(read_audio, buffer.get_curr_buffer()).result()
+
+
+def run_shared(executor: ProcessPoolExecutor, buffer: NPCircularBuffer) -> None:
+    '''
+    Sends reference to current buffer to worker, which maps it from shared memory.
+
+    Parameters:
+    executor    (ProcessPoolExecutor): Executor with one worker process
+    buffer      (NPCircularBuffer)   : Shared buffer holding audio segment
+    '''
+    executor.submit(read_audio, buffer.shared_ref(buffer.get_curr_buffer())).result()
+
+
+def main() -> None:
+    '''
+    Times both transfer methods with a full buffer and prints the time per transfer.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark audio transfer to worker process')
+    parser.add_argument('--max-segment-samples', type=int, default=480_000,
+                        help='Samples in buffer, max_segment_samples of model')
+    parser.add_argument('--repeat', type=int, default=200,
+                        help='Number of transfers per measurement')
+    args = parser.parse_args()
+
+    audio = np.random.default_rng(0).uniform(-1, 1, args.max_segment_samples)
+    buffers = {}
+    for name, shared in (('pickled', False), ('shared', True)):
+        buffers[name] = NPCircularBuffer(
+            args.max_segment_samples, dtype=np.float32, ring=True, shared=shared)
+        buffers[name].append_sequence(audio)
+
+    print(f'audio       : {buffers["pickled"].get_curr_buffer().nbytes / 1e6:8.2f} MB')
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        for name, fun in (('pickled', run_pickled), ('shared', run_shared)):
+            fun(executor, buffers[name])
+            seconds = min(timeit.repeat(
+                lambda fun=fun, name=name: fun(executor, buffers[name]),
+                number=args.repeat,
+                repeat=3
+            ))
+            results[name] = seconds / args.repeat
+            print(f'{name:12}: {results[name] * 1e6:8.2f} us per transfer')
+
+    print(f'speedup     : {results["pickled"] / results["shared"]:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
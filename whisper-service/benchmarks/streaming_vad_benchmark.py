@@ -0,0 +1,99 @@
+'''
+Microbenchmark comparing vad_filter over the whole decode window with StreamingVad, which only
+classifies newly received audio
+
+Run from whisper-service directory:
+    python -m benchmarks.streaming_vad_benchmark [--max-segment-samples N] [--min-new-samples N]
+
+Functions:
+    vad_window
+    vad_streaming
+    main
+'''
+import argparse
+import time
+import numpy as np
+import numpy.typing as npt
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+from utils.streaming_vad import StreamingVad
+
+
+def vad_window(
+    vad: StreamingVad,
+    audio: npt.NDArray,
+    window_start: int,
+    window_end: int
+) -> list[dict]:
+    '''
+    Previous implementation, runs VAD on every sample of the decode window.
+
+    Parameters:
+    vad             (StreamingVad)  : Unused
+    audio           (1D numpy array): Audio of whole stream
+    window_start    (int)           : Sample decode window starts at
+    window_end      (int)           : Sample decode window ends at
+
+    Returns:
+    Speech chunks of decode window
+    '''
+    del vad
+    return get_speech_timestamps(audio[window_start:window_end], VadOptions())
+
+
+def vad_streaming(
+    vad: StreamingVad,
+    audio: npt.NDArray,
+    window_start: int,
+    window_end: int
+) -> list[dict]:
+    '''
+    Classifies audio received since previous decode, then finds speech chunks of decode window.
+
+    Parameters:
+    vad             (StreamingVad)  : VAD holding audio before window_end
+    audio           (1D numpy array): Audio of whole stream
+    window_start    (int)           : Sample decode window starts at
+    window_end      (int)           : Sample decode window ends at
+
+    Returns:
+    Speech chunks of decode window
+    '''
+    vad.drop(window_start)
+    vad.append(audio[vad.num_samples:window_end])
+    return vad.speech_timestamps(window_start, window_end)
+
+
+def main() -> None:
+    '''
+    Runs both methods on each decode of a stream and prints the average time per decode.
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark streaming VAD')
+    parser.add_argument('--max-segment-samples', type=int, default=480_000,
+                        help='Samples in decode window, max_segment_samples of model')
+    parser.add_argument('--min-new-samples', type=int, default=48_000,
+                        help='Samples received between decodes, min_new_samples of model')
+    parser.add_argument('--num-decodes', type=int, default=30,
+                        help='Number of decodes in stream')
+    args = parser.parse_args()
+
+    num_samples = args.max_segment_samples + args.num_decodes * args.min_new_samples
+    audio = np.random.default_rng(0).uniform(-1, 1, num_samples).astype(np.float32)
+
+    results = {}
+    for name, fun in (('window', vad_window), ('streaming', vad_streaming)):
+        vad = StreamingVad(args.max_segment_samples)
+        vad.append(audio[:args.max_segment_samples])
+        elapsed = 0.0
+        for i in range(1, args.num_decodes + 1):
+            window_end = args.max_segment_samples + i * args.min_new_samples
+            start = time.perf_counter()
+            fun(vad, audio, window_end - args.max_segment_samples, window_end)
+            elapsed += time.perf_counter() - start
+        results[name] = elapsed / args.num_decodes
+        print(f'{name:12}: {results[name] * 1e3:8.2f} ms per decode')
+
+    print(f'speedup     : {results["window"] / results["streaming"]:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,13 @@ Type definitions for objects used to configure whisper service
 
 Enums:
   ModelImplementationId
+  InferenceExecutorKind
+  LocalAgreeMode
+  CommitPolicy
+  TimestampMode
+  DecodeType
+  IngestOverflowPolicy
+  ModelReadiness
 
 Types:
   JsonType
@@ -24,6 +31,16 @@ class AppConfig(TypedDict):
     LOG_LEVEL: str
     PORT: int
     HOST: str
+    MODEL_IDLE_TTL_SEC: float
+    INGEST_QUEUE_SIZE: int
+    INGEST_OVERFLOW_POLICY: 'IngestOverflowPolicy'
+    INGEST_LOAD_SIGNAL_SEC: float
+    INGEST_MAX_BACKLOG_SEC: float
+    WARM_MODEL_KEYS: list[str]
+    WARMUP_CONCURRENCY: int
+    LAZY_MODEL_INIT: bool
+    WORKERS: int
+    IN_PROGRESS_MIN_INTERVAL_MS: int
 
 
 class AvailableFeaturesConfig(TypedDict):
@@ -42,6 +59,88 @@ class ModelImplementationId(StrEnum):
     FASTER_WHISPER = "faster_whisper"
 
 
+class InferenceExecutorKind(StrEnum):
+    '''
+    Possible pools model inference can be dispatched to
+    '''
+    THREAD = "thread"
+    PROCESS = "process"
+    # Shared model hosting process, see utils/model_host.py
+    MODEL_HOST = "model_host"
+
+
+class LocalAgreeMode(StrEnum):
+    '''
+    How LocalAgreeModelBase handles audio once its transcription is agreed on
+    '''
+    # Keep audio until its text is finalized at a sentence end
+    FULL = "full"
+    # Trim audio as soon as its text is agreed on
+    INCREMENTAL = "incremental"
+
+
+class CommitPolicy(StrEnum):
+    '''
+    When LocalAgreeModelBase finalizes agreed text
+    '''
+    # Finalize agreed text once it ends in sentence end punctuation
+    SENTENCE = "sentence"
+    # Also finalize agreed words once they end commit_min_age_ms before the end of the audio
+    WORD = "word"
+    # Also finalize all agreed text once it spans commit_interval_ms
+    TIME = "time"
+
+
+class TimestampMode(StrEnum):
+    '''
+    How transcription models time words returned to LocalAgreeModelBase
+    '''
+    # Align every word to audio
+    WORD = "word"
+    # Only align words if the transcription can finalize or purge text, otherwise
+    # interpolate word times within segments
+    COMMIT = "commit"
+    # Interpolate word times within segments, in proportion to word length
+    SEGMENT = "segment"
+
+
+class DecodeType(StrEnum):
+    '''
+    Kinds of transcriptions run by local agreement models, which may use different decoding
+    options
+    '''
+    # Transcription that can finalize text or purge audio
+    COMMIT = "commit"
+    # Transcription that can only update in progress text, e.g. by draft model
+    IN_PROGRESS = "in_progress"
+
+
+class IngestOverflowPolicy(StrEnum):
+    '''
+    What a session's audio ingest queue does when it is full
+    '''
+    # Drop the oldest queued audio chunk
+    DROP_OLDEST = "drop_oldest"
+    # Merge queued audio chunks into one larger chunk
+    COALESCE = "coalesce"
+    # Skip in progress decodes and wait for room in queue
+    SKIP_IN_PROGRESS = "skip_in_progress"
+
+
+class ModelReadiness(StrEnum):
+    '''
+    Startup state of a configured model
+    '''
+    # Model is being loaded
+    WARMING = "warming"
+    # Model loaded successfully. Pinned models stay resident, others until idle TTL
+    READY = "ready"
+    # Model failed to load
+    FAILED = "failed"
+    # Model is not loaded until it is first requested
+    DEFERRED = "deferred"
+
+
 type JsonType = Union[None, int, str, bool,
                       List[JsonType], Dict[str, JsonType]]
 
@@ -1,16 +1,43 @@
 '''
 Type definitions for messages used for negotiating model selection
 
+Enums:
+    AudioFormat
+    TranscriptFormat
+
 Types:
     ModelOption
     SelectionOptions
     FeatureSelection
     ModelSelection
 '''
-from typing import TypedDict
+from enum import StrEnum
+from typing import NotRequired, TypedDict
 from custom_types.config_types import AvailableFeaturesConfig
 
 
+class AudioFormat(StrEnum):
+    '''
+    Possible formats of audio frames sent by frontend after selecting a model
+    '''
+    # Each frame is a complete 16khz mono 16 bit wav file
+    WAV = "wav"
+    # Each frame is headerless 16khz mono 16 bit little endian pcm
+    PCM_S16LE = "pcm_s16le"
+    # Each frame is a single raw opus packet
+    OPUS = "opus"
+
+
+class TranscriptFormat(StrEnum):
+    '''
+    Possible formats of transcript messages sent to frontend after selecting a model
+    '''
+    # Each message is a BackendTranscriptBlock JSON object
+    JSON = "json"
+    # Each message is a fixed size binary header followed by UTF-8 text
+    BINARY = "binary"
+
+
 class ModelOption(TypedDict):
     '''
     Type hint for a model option available to frontend
@@ -39,3 +66,6 @@ class SelectedOption(TypedDict):
     '''
     model_key: str
     feature_selection: FeatureSelection
+    audio_format: NotRequired[AudioFormat]
+    transcript_format: NotRequired[TranscriptFormat]
+    in_progress_deltas: NotRequired[bool]
@@ -4,9 +4,12 @@ Type definitions for transcription messages
 Enums:
     BackendTranscriptionBlockType
     BackendTranscriptBlockType
+
+Types:
+    BackendLoadSignal
 '''
 from enum import IntEnum
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 
 class BackendTranscriptionBlockType(IntEnum):
@@ -26,3 +29,15 @@ class BackendTranscriptBlock(TypedDict):
     text: str
     start: float
     end: float
+    # Only sent if in_progress_deltas was selected, see utils/transcript_encoder.py
+    keep: NotRequired[int]
+
+
+class BackendLoadSignal(TypedDict):
+    '''
+    Type hint for message telling the audio source whether whisper service is keeping up.
+    Sent when a session starts falling behind real time and again once it catches up.
+    '''
+    behind_real_time: bool
+    backlog_sec: float
+    dropped_sec: float
@@ -1,41 +1,110 @@
 '''
 Entry point for whisper-service application.
+
+Flags:
+    --dev           Run with auto reload and print loaded configuration
+    --importtime    Print how long the slowest modules took to import once each worker
+                    created the app, including model implementations imported by it
 '''
+# pylint: disable=wrong-import-position,wrong-import-order,ungrouped-imports
+#   Import timer must be installed before the rest of the application is imported
 import sys
+from utils.import_timer import IMPORT_TIMER
+
+if '--importtime' in sys.argv:
+    IMPORT_TIMER.install()
+
 import uvicorn
+from fastapi import FastAPI
 from app_config.load_config import load_config
 from app_config.init_device_config import init_device_config
+from custom_types.config_types import InferenceExecutorKind
 from server.create_server import create_server
 from server.helpers.authenticate_websocket import authenticate_websocket
 from server.helpers.select_model import select_model
 from model_implementations.import_model_implementation import import_model_implementation
+from utils.model_host import start_model_host
+from utils.model_pool import MODEL_POOL
+from utils.model_warmer import MODEL_WARMER
+from utils.shared_array import remove_orphaned_shared_arrays
 
 
 config = load_config()
-device_config, selection_options = init_device_config('device_config.json')
 
-APP = create_server(
-    config,
-    device_config,
-    selection_options,
-    import_model_implementation,
-    authenticate_websocket,
-    select_model
-)
+
+def create_app() -> FastAPI:
+    '''
+    Initializes device config, starts warming models, and creates server.
+    Called by uvicorn in each worker process.
+
+    Returns:
+    FastAPI webserver
+    '''
+    MODEL_POOL.idle_ttl = config['MODEL_IDLE_TTL_SEC']
+    device_config, selection_options = init_device_config(
+        'device_config.json',
+        validate_implementations=not config['LAZY_MODEL_INIT']
+    )
+    MODEL_WARMER.start(
+        device_config,
+        config['WARM_MODEL_KEYS'],
+        import_model_implementation,
+        config['WARMUP_CONCURRENCY'],
+        warm_all=not config['LAZY_MODEL_INIT']
+    )
+
+    if '--dev' in sys.argv:
+        print(device_config)
+
+    app = create_server(
+        config,
+        device_config,
+        selection_options,
+        import_model_implementation,
+        authenticate_websocket,
+        select_model
+    )
+
+    if '--importtime' in sys.argv:
+        print(IMPORT_TIMER.report(), file=sys.stderr)
+
+    return app
+
+
+def uses_model_host() -> bool:
+    '''
+    Returns:
+    True if any configured model runs inference on the model host
+    '''
+    device_config, _ = init_device_config('device_config.json', validate_implementations=False)
+    return any(
+        model_config['implementation_configuration'].get('inference_executor')
+        == InferenceExecutorKind.MODEL_HOST
+        for model_config in device_config.values()
+    )
+
 
 if __name__ == '__main__':
-    dev_mode = len(sys.argv) > 1 and sys.argv[1] == '--dev'
+    dev_mode = '--dev' in sys.argv
 
     if dev_mode:
-        APP = 'index:APP'
         print(config)
-        print(device_config)
+
+    # Shared audio buffers of workers killed in a previous run are never deleted otherwise
+    remove_orphaned_shared_arrays()
+
+    # Model host must start before uvicorn workers so they inherit its address
+    if uses_model_host():
+        start_model_host()
 
     uvicorn.run(
-        APP,
+        'index:create_app',
+        factory=True,
         log_level=config['LOG_LEVEL'],
         port=config['PORT'],
         host=config['HOST'],
         use_colors=dev_mode,
-        reload=dev_mode
+        reload=dev_mode,
+        # Each websocket stays on the worker that accepted it, keeping session state local
+        workers=None if dev_mode else config['WORKERS']
     )
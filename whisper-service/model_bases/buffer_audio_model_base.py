@@ -4,17 +4,42 @@ Provides a helper class for implementing Transcription Models
 Classes:
     BufferAudioModelBase
 '''
+import functools
+import itertools
+import time
 from abc import abstractmethod
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 import numpy as np
 import numpy.typing as npt
-from utils.config_dict_contains import config_dict_contains_int, config_dict_contains_float
-from utils.decode_wav import decode_wav
+from fastapi.concurrency import run_in_threadpool
+from utils.audio_energy import rms, leading_silence_samples
+from utils.batch_scheduler import get_batch_scheduler
+from utils.config_dict_contains import \
+    config_dict_contains_int, config_dict_contains_float, config_dict_contains_one_of
+from utils.decode_wav import PCM16_SCALE, decode_pcm16
+from utils.inference_executor import InferenceExecutor, get_inference_executor
+from utils.load_monitor import LoadMonitor, get_load_monitor
+from utils.mel_feature_cache import MelFeatureCache
+from utils.metrics import AUDIO_PROCESSED_SECONDS, AUDIO_PURGED_SECONDS, \
+    BUFFER_FILL_RATIO, DECODE_WAV_SECONDS, DEFERRED_DECODES, FINALIZE_LAG_SECONDS
+from utils.model_pool import model_pool_key
 from utils.np_circular_buffer import NPCircularBuffer
+from utils.shared_array import SharedArrayRef
 from model_bases.transcription_model_base import TranscriptionModelBase
-from custom_types.config_types import ImplementationModelConfig
+from custom_types.config_types import ImplementationModelConfig, InferenceExecutorKind
+
+if TYPE_CHECKING:
+    # Imports faster whisper and onnxruntime, which are slow to import and not needed by
+    # implementations that do not use VAD
+    from utils.streaming_vad import StreamingVad
+
+# Ids of sessions in this process, unlike id() they are never reused
+_session_ids = itertools.count()
 
 
 class BufferAudioModelBase(TranscriptionModelBase):
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
     '''
     A partial TranscriptionModelBase implementation that handles buffering audio chunks 
     into larger segments.
@@ -24,10 +49,38 @@ class BufferAudioModelBase(TranscriptionModelBase):
 
     Implements the queue_audio_chunk() method. The load_model(), unload_model(), 
     and process_segment() methods must be implemented.
+
+    Audio with RMS amplitude below silence_threshold is treated as silence. Leading silence is
+    purged from the buffer, and process_segment() is skipped once the new samples have been
+    silent for more than max_silent_segments() consecutive segments.
+
+    The real time factor of each session is reported to a load monitor shared by sessions using
+    the same model. While the load is above target_load, the number of new samples needed before
+    process_segment() is called while speech continues is stretched up to
+    max_cadence_multiplier * min_new_samples. Pauses in speech and full buffers are still
+    processed right away, so finalized text is not held back by the longer interval.
+
+    Blocking inference should be dispatched with run_inference() or run_batched_inference()
+    so that it runs on the model's inference executor instead of the event loop. When inference
+    runs in another process, the buffer is placed in shared memory and inference_audio()
+    converts audio segments into references the process reads without copying. Each such
+    session uses 8 * max_segment_samples bytes of shared memory. If it cannot be allocated,
+    the buffer is not shared and audio segments are copied to the process instead.
+
+    Implementations can set feature_cache to a MelFeatureCache, which is kept in sync with the
+    buffer so log mel frames are only computed for newly received audio. log_mel_frames()
+    returns the cached frames of an audio segment. Similarly, implementations can set vad to a
+    StreamingVad, so speech_timestamps() finds speech without running VAD on the whole buffer.
     '''
-    __slots__ = ['max_segment_samples', 'min_new_samples',
-                 'num_last_processed_samples', 'num_purged_samples', 'buffer', 'silence_threshold']
+    __slots__ = ['max_segment_samples', 'min_new_samples', 'num_last_processed_samples',
+                 'num_purged_samples', 'buffer', 'silence_threshold',
+                 'num_silent_segments', 'num_skipped_inferences', 'under_load',
+                 'cadence_multiplier', 'feature_cache', 'vad', 'session_id']
     SAMPLE_RATE = 16_000
+    # Frame size used to find leading silence
+    SILENCE_FRAME_SAMPLES = 1_600
+    # Silent samples kept before speech when purging leading silence
+    SILENCE_PADDING_SAMPLES = 8_000
 
     def __init__(self, ws, config):
         '''
@@ -45,10 +98,30 @@ class BufferAudioModelBase(TranscriptionModelBase):
 
         self.num_last_processed_samples = 0
         self.num_purged_samples = 0
-        self.buffer = NPCircularBuffer(
-            self.max_segment_samples,
-            dtype=np.float32
-        )
+        # Number of consecutive segments with silent new samples
+        self.num_silent_segments = 0
+        self.num_skipped_inferences = 0
+        self.under_load = False
+        # Multiple of min_new_samples to wait for while speech continues, adapted to load
+        self.cadence_multiplier = 1.0
+        try:
+            self.buffer = NPCircularBuffer(
+                self.max_segment_samples,
+                dtype=np.float32,
+                ring=True,
+                shared=self.config['inference_executor'] != InferenceExecutorKind.THREAD
+            )
+        except OSError:
+            # Shared memory is full, copy audio to inference executor instead
+            self.logger.warning(
+                'Could not allocate shared audio buffer, audio is copied to inference executor',
+                exc_info=True
+            )
+            self.buffer = NPCircularBuffer(self.max_segment_samples, dtype=np.float32, ring=True)
+        self.feature_cache: MelFeatureCache | None = None
+        self.vad: 'StreamingVad | None' = None
+        # Identifies session in load monitor
+        self.session_id = next(_session_ids)
 
     @staticmethod
     def validate_config(config: dict) -> ImplementationModelConfig:
@@ -72,8 +145,283 @@ class BufferAudioModelBase(TranscriptionModelBase):
             minimum=config['min_new_samples']
         )
         config_dict_contains_float(config, 'silence_threshold')
+
+        config.setdefault('inference_executor', InferenceExecutorKind.THREAD)
+        config_dict_contains_one_of(
+            config, 'inference_executor', list(InferenceExecutorKind))
+        config.setdefault('inference_concurrency', 1)
+        config_dict_contains_int(config, 'inference_concurrency', minimum=1)
+
+        config.setdefault('max_batch_size', 1)
+        config_dict_contains_int(config, 'max_batch_size', minimum=1)
+        config.setdefault('max_batch_wait_ms', 10)
+        config_dict_contains_int(config, 'max_batch_wait_ms', minimum=0)
+
+        config.setdefault('max_cadence_multiplier', 1)
+        config_dict_contains_int(config, 'max_cadence_multiplier', minimum=1)
+        config.setdefault('target_load', 0.8)
+        config_dict_contains_float(config, 'target_load', minimum=0.01)
         return config
 
+    def shared_model_key(self) -> str:
+        '''
+        Key identifying the model shared between sessions with this configuration.
+        Sessions with the same key share a model and its inference executor.
+        Override to only include configuration that affects the loaded model.
+
+        Returns:
+        Key to use with model pool and inference executor
+        '''
+        return model_pool_key(type(self).__qualname__, self.config)
+
+    async def run_inference(self, fun: Callable[..., Any], *args: Any) -> Any:
+        '''
+        Runs a blocking inference function on the model's inference executor.
+        At most inference_concurrency inferences run at once for each shared model.
+
+        Parameters:
+        fun     (function): Function to run. Must be picklable if using a process executor
+                            or model host
+        *args             : Arguments passed to fun
+
+        Returns:
+        Return value of fun
+        '''
+        return await self.inference_executor().run(fun, *args)
+
+    async def run_batched_inference(
+        self,
+        batch_fun: Callable[[Any, list[Any]], list[Any]],
+        context: Any,
+        item: Any
+    ) -> Any:
+        '''
+        Runs a blocking batch inference function on the model's inference executor.
+        Items from all sessions sharing the model are collected into batches of up to
+        max_batch_size items, waiting at most max_batch_wait_ms for a batch to fill.
+        If max_batch_size is 1, items are run immediately in batches of one.
+
+        Parameters:
+        batch_fun (function): Function called as batch_fun(context, items) that returns a list
+                              of results in the same order as items. Must be picklable if
+                              using a process executor or model host
+        context   (Any)     : Context shared by batch, e.g. the loaded model
+        item      (Any)     : Item to run
+
+        Returns:
+        Result of batch_fun corresponding to item
+        '''
+        if self.config['max_batch_size'] == 1:
+            results = await self.run_inference(batch_fun, context, [item])
+            return results[0]
+
+        scheduler = get_batch_scheduler(
+            f'{self.shared_model_key()}:{self.config["inference_executor"]}',
+            functools.partial(self.inference_executor().run, batch_fun),
+            self.config['max_batch_size'],
+            self.config['max_batch_wait_ms'],
+            self.config['inference_concurrency']
+        )
+        return await scheduler.submit(context, item)
+
+    def inference_audio(self, audio_segment: npt.NDArray) -> npt.NDArray | SharedArrayRef:
+        '''
+        Converts audio segment passed to process_segment() into a reference to the shared
+        buffer if inference runs in another process, so only indices are pickled.
+        Inference functions should call resolve_shared_array() on the audio they receive.
+        The buffer is not changed while process_segment() is awaited, so the referenced audio
+        stays valid until inference completes.
+
+        Parameters:
+        audio_segment (1D numpy array): View of buffer, e.g. audio_segment of process_segment()
+
+        Returns:
+        SharedArrayRef to audio_segment if buffer is shared, otherwise audio_segment
+        '''
+        ref = self.buffer.shared_ref(audio_segment)
+        return audio_segment if ref is None else ref
+
+    def log_mel_frames(self, audio_segment: npt.NDArray) -> tuple[npt.NDArray, int] | None:
+        '''
+        Gets cached log mel frames of the audio segment passed to process_segment().
+        Frames are centered on samples at multiples of the cache's hop_length since the start
+        of the session, so the first frame may be centered after the start of audio_segment.
+
+        Parameters:
+        audio_segment (1D numpy array): Audio segment passed to process_segment()
+
+        Returns:
+        Tuple of log10 mel frames of shape (n_frames, n_mels) and the sample of audio_segment
+        the first frame is centered on. None if feature_cache is not set.
+        '''
+        if self.feature_cache is None:
+            return None
+        frames = self.feature_cache.get_frames(
+            self.num_purged_samples,
+            self.num_purged_samples + len(audio_segment)
+        )
+        return frames, -self.num_purged_samples % self.feature_cache.hop_length
+
+    async def speech_timestamps(self, audio_segment: npt.NDArray) -> list[dict] | None:
+        '''
+        Gets speech chunks of the audio segment passed to process_segment() from vad.
+        Audio received since the previous call is classified off the event loop, on the model's
+        inference executor if it runs on threads of this process.
+
+        Parameters:
+        audio_segment (1D numpy array): Audio segment passed to process_segment()
+
+        Returns:
+        List of dicts containing start and end samples of each speech chunk in audio_segment,
+        in the format of faster whisper's get_speech_timestamps(). None if vad is not set.
+        '''
+        if self.vad is None:
+            return None
+        start_sample = self.num_purged_samples
+        end_sample = self.num_purged_samples + len(audio_segment)
+        if self.config['inference_executor'] == InferenceExecutorKind.THREAD:
+            return await self.run_inference(self.vad.speech_timestamps, start_sample, end_sample)
+        # VAD state belongs to this process, so it cannot run in the executor's processes
+        return await run_in_threadpool(self.vad.speech_timestamps, start_sample, end_sample)
+
+    def append_audio(self, audio: npt.NDArray) -> npt.NDArray:
+        '''
+        Appends decoded PCM16 audio to buffer. Computes its log mel frames and passes it to VAD
+        if feature_cache or vad are set.
+
+        Parameters:
+        audio   (numpy array): Decoded PCM16 samples
+
+        Returns:
+        Samples that did not fit in buffer
+        '''
+        extra_audio = self.buffer.append_sequence(audio, PCM16_SCALE)
+        num_appended = len(audio) - len(extra_audio)
+        if num_appended > 0:
+            appended_audio = self.buffer.get_curr_buffer()[-num_appended:]
+            if self.feature_cache is not None:
+                self.feature_cache.append(appended_audio)
+            if self.vad is not None:
+                self.vad.append(appended_audio)
+        return extra_audio
+
+    def purge_samples(self, num_samples: int) -> None:
+        '''
+        Purges samples from the start of buffer, along with their cached log mel frames and
+        VAD windows.
+
+        Parameters:
+        num_samples (int): Number of samples to purge
+        '''
+        self.buffer.shift_buffer(num_samples)
+        self.num_purged_samples += num_samples
+        if self.feature_cache is not None:
+            self.feature_cache.drop(self.num_purged_samples)
+        if self.vad is not None:
+            self.vad.drop(self.num_purged_samples)
+
+    def inference_executor(self) -> InferenceExecutor:
+        '''
+        Returns:
+        The process wide inference executor shared by sessions using this model
+        '''
+        return get_inference_executor(
+            self.shared_model_key(),
+            self.config['inference_executor'],
+            self.config['inference_concurrency']
+        )
+
+    def load_monitor(self) -> LoadMonitor:
+        '''
+        Returns:
+        The process wide load monitor shared by sessions using this model's inference executor
+        '''
+        return get_load_monitor(
+            f'{self.shared_model_key()}:{self.config["inference_executor"]}',
+            self.config['inference_concurrency']
+        )
+
+    def remove_from_load_monitor(self) -> None:
+        '''
+        Stops counting session towards load of the shared model, so remaining sessions are not
+        slowed down by it. Implementations should call this from unload_model().
+        '''
+        self.load_monitor().remove(self.session_id)
+
+    def update_cadence(self, processing_sec: float, new_samples: int) -> None:
+        '''
+        Reports session's real time factor and adapts cadence_multiplier so that the load of the
+        model moves towards target_load.
+
+        Parameters:
+        processing_sec  (float): Seconds spent in process_segment()
+        new_samples     (int)  : Samples received since previous call of process_segment()
+        '''
+        if new_samples <= 0:
+            return
+        load = self.load_monitor().update(
+            self.session_id, processing_sec, new_samples / self.SAMPLE_RATE)
+        self.cadence_multiplier = min(
+            max(self.cadence_multiplier * load / self.config['target_load'], 1.0),
+            self.config['max_cadence_multiplier']
+        )
+
+    def defer_processing(self, new_samples: int) -> bool:
+        '''
+        Checks if processing should wait for more samples because of load.
+        Only processing while speech continues is deferred, since it mostly updates
+        in progress text.
+
+        Parameters:
+        new_samples (int): Samples received since previous call of process_segment()
+
+        Returns:
+        True if process_segment() should not be called yet
+        '''
+        if new_samples > self.min_new_samples * self.cadence_multiplier:
+            return False
+        latest_audio = self.buffer.get_curr_buffer()[-self.min_new_samples:]
+        return rms(latest_audio) >= self.silence_threshold
+
+    def set_under_load(self, under_load: bool) -> None:
+        '''
+        While under load, process_segment() is only called once the buffer is full.
+
+        Parameters:
+        under_load  (bool): True if session is falling behind real time
+        '''
+        self.under_load = under_load
+
+    def max_silent_segments(self) -> int:
+        '''
+        Override if the model needs to keep processing segments after speech ends,
+        e.g. to finalize trailing speech.
+
+        Returns:
+        Number of consecutive segments with silent new samples to process before skipping
+        '''
+        return 0
+
+    def purge_leading_silence(self) -> bool:
+        '''
+        Purges silence at the start of the buffer, keeping SILENCE_PADDING_SAMPLES before speech.
+
+        Returns:
+        True if buffer contained only silence
+        '''
+        silent_samples = leading_silence_samples(
+            self.buffer.get_curr_buffer(),
+            self.silence_threshold,
+            self.SILENCE_FRAME_SAMPLES
+        )
+        only_silence = silent_samples == len(self.buffer)
+
+        samples_to_purge = max(0, silent_samples - self.SILENCE_PADDING_SAMPLES)
+        self.purge_samples(samples_to_purge)
+        self.num_last_processed_samples = max(
+            0, self.num_last_processed_samples - samples_to_purge)
+        return only_silence
+
     def load_model(self) -> None:
         '''
         Should load model into memory to be ready for transcription.
@@ -105,7 +453,7 @@ class BufferAudioModelBase(TranscriptionModelBase):
 
         Parameters:
         audio_segment       (1D numpy array): 
-            Contains float16 audio normalized to [-1, 1] at 16k sample rate.
+            Contains float32 audio normalized to [-1, 1] at 16k sample rate.
             It contains at least min_new_segment new samples since previous call of process_segment.
             It also contains at most max_segment_samples samples.
 
@@ -119,6 +467,37 @@ class BufferAudioModelBase(TranscriptionModelBase):
         '''
         raise NotImplementedError('Must implement per model')
 
+    async def process_buffer(self) -> None:
+        '''
+        Calls process_segment() on current buffer and purges samples it returns.
+        '''
+        AUDIO_PROCESSED_SECONDS.inc(len(self.buffer) / self.SAMPLE_RATE)
+        BUFFER_FILL_RATIO.observe(len(self.buffer) / self.max_segment_samples)
+        new_samples = len(self.buffer) - self.num_last_processed_samples
+        process_start = time.perf_counter()
+        samples_to_purge = await self.process_segment(
+            self.buffer.get_curr_buffer(),
+            self.num_purged_samples / self.SAMPLE_RATE
+        )
+        self.update_cadence(time.perf_counter() - process_start, new_samples)
+
+        AUDIO_PURGED_SECONDS.inc(samples_to_purge / self.SAMPLE_RATE)
+        self.purge_samples(samples_to_purge)
+        self.num_last_processed_samples = len(self.buffer)
+
+    async def on_final_transcript_block(self, text: str, start=-1.0, end=-1.0) -> None:
+        '''
+        Records how far behind the received audio the finalized block is, then sends block.
+
+        Parameters:
+        text    (str)  : Finalized transcribed text
+        start   (float): Start time of this transcription chunk [Optional]
+        end     (float): End time of this transcription chunk [Optional]
+        '''
+        received_end = (self.num_purged_samples + len(self.buffer)) / self.SAMPLE_RATE
+        FINALIZE_LAG_SECONDS.observe(received_end - end)
+        await super().on_final_transcript_block(text, start, end)
+
     async def queue_audio_chunk(self, audio_chunk) -> None:
         '''
         Called when an audio chunk is received.
@@ -128,34 +507,53 @@ class BufferAudioModelBase(TranscriptionModelBase):
         process_segment() again to transcribe audio. Purges the designated number of samples
         from buffer based on return value of process_segment.
 
+        Skips calling process_segment() if new samples are silent and either the buffer only
+        contains silence or more than max_silent_segments() silent segments were processed.
+        While under load, process_segment() is only called if the buffer is full.
+        While load of the shared model is above target_load, process_segment() is called less
+        often during speech.
+
         Parameters:
-        audio_chunk   (io.BytesIO): A buffer containing wav audio
+        audio_chunk   (io.BytesIO): A buffer containing wav or headerless pcm audio
         '''
-        audio = decode_wav(audio_chunk)
-
-        extra_audio = self.buffer.append_sequence(audio)
+        # Samples are normalized while being copied into the buffer
+        decode_start = time.perf_counter()
+        audio = decode_pcm16(audio_chunk)
+        extra_audio = self.append_audio(audio)
+        DECODE_WAV_SECONDS.observe(time.perf_counter() - decode_start)
 
         # If buffer is full, process segments until entire audio chunk can be
         # inserted into buffer
         while len(extra_audio) > 0:
-            samples_to_purge = await self.process_segment(
-                self.buffer.get_curr_buffer().copy(),
-                self.num_purged_samples / self.SAMPLE_RATE
-            )
+            # Make room without processing if start of buffer is silent
+            self.purge_leading_silence()
+            extra_audio = self.append_audio(extra_audio)
+            if len(extra_audio) == 0:
+                break
 
-            self.buffer.shift_buffer(samples_to_purge)
-            self.num_purged_samples += samples_to_purge
-            self.num_last_processed_samples = len(self.buffer)
+            await self.process_buffer()
 
-            extra_audio = self.buffer.append_sequence(extra_audio)
+            extra_audio = self.append_audio(extra_audio)
 
         # Once there are enough new samples, process segments once
-        if (len(self.buffer) - self.num_last_processed_samples) > self.min_new_samples:
-            samples_to_purge = await self.process_segment(
-                self.buffer.get_curr_buffer(),
-                self.num_purged_samples / self.SAMPLE_RATE
-            )
+        new_samples = len(self.buffer) - self.num_last_processed_samples
+        if not self.under_load and new_samples > self.min_new_samples:
+            if self.defer_processing(new_samples):
+                DEFERRED_DECODES.inc()
+                return
+
+            new_audio = self.buffer.get_curr_buffer()[self.num_last_processed_samples:]
+            if rms(new_audio) < self.silence_threshold:
+                self.num_silent_segments += 1
+            else:
+                self.num_silent_segments = 0
+
+            only_silence = self.purge_leading_silence()
+            if self.num_silent_segments > 0 and (
+                only_silence or self.num_silent_segments > self.max_silent_segments()
+            ):
+                self.num_skipped_inferences += 1
+                self.num_last_processed_samples = len(self.buffer)
+                return
 
-            self.buffer.shift_buffer(samples_to_purge)
-            self.num_purged_samples += samples_to_purge
-            self.num_last_processed_samples = len(self.buffer)
+            await self.process_buffer()
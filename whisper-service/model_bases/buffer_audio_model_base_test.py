@@ -0,0 +1,221 @@
+'''
+Unit tests for BufferAudioModelBase class
+'''
+import io
+import wave
+import numpy as np
+import pytest
+from faster_whisper.feature_extractor import FeatureExtractor
+from model_bases.buffer_audio_model_base import BufferAudioModelBase
+from utils.mel_feature_cache import MelFeatureCache
+from utils.metrics import AUDIO_PROCESSED_SECONDS, AUDIO_PURGED_SECONDS
+from utils.shared_array import resolve_shared_array
+
+fake_config = {
+    'min_new_samples': 16_000,
+    'max_segment_samples': 160_000,
+    'silence_threshold': 0.01
+}
+
+
+class FakeBufferAudioModel(BufferAudioModelBase):
+    '''
+    Fake buffer audio model that records audio segments it is asked to process
+    '''
+    __slots__ = ['segments']
+
+    def __init__(self, ws, config):
+        super().__init__(ws, config)
+        self.segments = []
+
+    def load_model(self):
+        return None
+
+    def unload_model(self):
+        return None
+
+    def max_silent_segments(self):
+        return 1
+
+    async def process_segment(self, audio_segment, audio_segment_start_time):
+        self.segments.append((len(audio_segment), audio_segment_start_time))
+        return 0
+
+
+def make_wav(amplitude: float, num_samples: int = 17_000) -> io.BytesIO:
+    '''
+    Create a wav chunk containing a tone with given amplitude
+    '''
+    tone = amplitude * np.sin(np.arange(num_samples) * 2 * np.pi * 440 / 16_000)
+    wav_buffer = io.BytesIO()
+    with wave.Wave_write(wav_buffer) as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16_000)
+        wav_file.writeframes((tone * 32767).astype(np.int16).tobytes())
+    wav_buffer.seek(0)
+    return wav_buffer
+
+
+@pytest.mark.asyncio
+async def test_skips_silence():
+    '''
+    Test that silent audio is purged without being processed
+    '''
+    model = FakeBufferAudioModel(None, BufferAudioModelBase.validate_config(dict(fake_config)))
+
+    for _ in range(3):
+        await model.queue_audio_chunk(make_wav(0))
+
+    assert not model.segments, 'No silent segments processed'
+    assert model.num_skipped_inferences == 3
+    assert len(model.buffer) < 17_000, 'Silence purged from buffer'
+    assert model.num_purged_samples + len(model.buffer) == 3 * 17_000
+
+
+@pytest.mark.asyncio
+async def test_processes_silence_after_speech():
+    '''
+    Test that max_silent_segments() silent segments are processed after speech
+    '''
+    model = FakeBufferAudioModel(None, BufferAudioModelBase.validate_config(dict(fake_config)))
+
+    await model.queue_audio_chunk(make_wav(0))
+    await model.queue_audio_chunk(make_wav(0.5))
+    await model.queue_audio_chunk(make_wav(0))
+    await model.queue_audio_chunk(make_wav(0))
+
+    assert len(model.segments) == 2, 'Speech and first silent segment processed'
+    assert model.num_skipped_inferences == 2
+    assert model.segments[0][1] == 9_000 / 16_000, 'Leading silence purged before speech'
+
+
+@pytest.mark.asyncio
+async def test_defers_processing_during_speech():
+    '''
+    Test that processing waits for cadence_multiplier * min_new_samples during speech,
+    but pauses are processed right away
+    '''
+    model = FakeBufferAudioModel(None, BufferAudioModelBase.validate_config(dict(fake_config)))
+    model.cadence_multiplier = 3
+
+    await model.queue_audio_chunk(make_wav(0.5))
+    await model.queue_audio_chunk(make_wav(0.5))
+    assert not model.segments, 'Processing deferred while speech continues'
+
+    await model.queue_audio_chunk(make_wav(0))
+    assert len(model.segments) == 1, 'Pause processed without waiting'
+
+    # Processing adapts multiplier to measured load, keep it stretched
+    model.cadence_multiplier = 3
+    await model.queue_audio_chunk(make_wav(0.5))
+    await model.queue_audio_chunk(make_wav(0.5))
+    await model.queue_audio_chunk(make_wav(0.5))
+    assert len(model.segments) == 2, 'Processed once 3 * min_new_samples were received'
+
+
+
+@pytest.mark.asyncio
+async def test_processed_audio_metrics(mocker):
+    '''
+    Test that audio is counted as processed each time it is passed to process_segment,
+    but only counted as purged once, and leading silence that was not processed is not counted
+    '''
+    model = FakeBufferAudioModel(None, BufferAudioModelBase.validate_config(dict(fake_config)))
+    mocker.patch.object(FakeBufferAudioModel, 'process_segment', side_effect=[0, 25_000])
+    processed_start = AUDIO_PROCESSED_SECONDS.values.get((), 0)
+    purged_start = AUDIO_PURGED_SECONDS.values.get((), 0)
+
+    await model.queue_audio_chunk(make_wav(0))
+    assert AUDIO_PURGED_SECONDS.values.get((), 0) == purged_start, \
+        'Purged leading silence not counted'
+
+    await model.queue_audio_chunk(make_wav(0.5))
+    await model.queue_audio_chunk(make_wav(0.5))
+
+    processed = AUDIO_PROCESSED_SECONDS.values[()] - processed_start
+    purged = AUDIO_PURGED_SECONDS.values[()] - purged_start
+    assert processed == pytest.approx((25_000 + 42_000) / 16_000), \
+        'Padding and first chunk processed twice'
+    assert purged == pytest.approx(25_000 / 16_000)
+
+
+def test_update_cadence():
+    '''
+    Test that cadence_multiplier follows load of shared model up to max_cadence_multiplier
+    '''
+    config = BufferAudioModelBase.validate_config(
+        dict(fake_config, model='cadence_test', max_cadence_multiplier=4))
+    model = FakeBufferAudioModel(None, config)
+
+    model.update_cadence(1.0, 16_000)
+    assert model.cadence_multiplier == pytest.approx(1 / 0.8), 'Stretched above target load'
+
+    for _ in range(10):
+        model.update_cadence(4.0, 16_000)
+    assert model.cadence_multiplier == 4, 'Limited to max_cadence_multiplier'
+
+    model.remove_from_load_monitor()
+    assert model.load_monitor().session_rtf(model.session_id) == 0, 'Session not counted'
+    for _ in range(20):
+        model.update_cadence(0.01, 16_000)
+    assert model.cadence_multiplier == 1, 'Back to min_new_samples once load drops'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('inference_executor', ['thread', 'process'])
+async def test_inference_audio(inference_executor):
+    '''
+    Test that audio is passed by reference to shared buffer only if inference runs in
+    another process
+    '''
+    config = BufferAudioModelBase.validate_config(
+        dict(fake_config, inference_executor=inference_executor))
+    model = FakeBufferAudioModel(None, config)
+    await model.queue_audio_chunk(make_wav(0.5))
+
+    audio_segment = model.buffer.get_curr_buffer()
+    audio = model.inference_audio(audio_segment)
+
+    if inference_executor == 'thread':
+        assert audio is audio_segment, 'Audio passed as is'
+    else:
+        assert np.array_equal(resolve_shared_array(audio), audio_segment), \
+            'Reference reads buffered audio'
+
+
+
+@pytest.mark.asyncio
+async def test_unshared_buffer_when_shared_memory_full(mocker):
+    '''
+    Test that audio is copied to the inference executor if the shared buffer cannot be allocated
+    '''
+    mocker.patch('utils.np_circular_buffer.create_shared_array',
+                 side_effect=OSError(28, 'No space left on device'))
+    config = BufferAudioModelBase.validate_config(
+        dict(fake_config, inference_executor='process'))
+    model = FakeBufferAudioModel(None, config)
+    await model.queue_audio_chunk(make_wav(0.5))
+
+    audio_segment = model.buffer.get_curr_buffer()
+    assert model.inference_audio(audio_segment) is audio_segment, 'Audio passed as is'
+
+
+@pytest.mark.asyncio
+async def test_feature_cache_follows_buffer():
+    '''
+    Test that log mel frames are computed for appended audio and dropped with purged audio
+    '''
+    model = FakeBufferAudioModel(None, BufferAudioModelBase.validate_config(dict(fake_config)))
+    model.feature_cache = MelFeatureCache(
+        FeatureExtractor().mel_filters, fake_config['max_segment_samples'])
+
+    for _ in range(2):
+        await model.queue_audio_chunk(make_wav(0.5))
+    model.purge_samples(1_000)
+
+    frames, first_sample = model.log_mel_frames(model.buffer.get_curr_buffer())
+    assert first_sample == 120, 'First frame centered at multiple of hop_length'
+    assert len(frames) == (2 * 17_000 - 1_120) // 160 + 1, \
+        'One frame per hop_length samples in buffer'
+    assert model.feature_cache.num_samples == 2 * 17_000, 'Cache received every sample'
@@ -6,11 +6,14 @@ Classes:
     LocalAgreeModelBase
 '''
 from abc import abstractmethod
-import math
+import time
 import numpy.typing as npt
 from model_bases.buffer_audio_model_base import BufferAudioModelBase
-from utils.config_dict_contains import config_dict_contains_int
-from custom_types.config_types import ImplementationModelConfig
+from utils.agreement_history import AgreementHistory
+from utils.config_dict_contains import config_dict_contains_int, config_dict_contains_one_of
+from utils.metrics import AUDIO_TRANSCRIBED_SECONDS, INFERENCE_SECONDS, TRANSCRIBE_AUDIO_SECONDS
+from custom_types.config_types import \
+    CommitPolicy, ImplementationModelConfig, LocalAgreeMode, TimestampMode
 
 
 class TranscriptionSegment:
@@ -55,6 +58,34 @@ class LocalAgreeModelBase(BufferAudioModelBase):
     to that transcription is then purged from the buffer. Any remaining transcription text 
     is emitted as an in_progress transcription.
 
+    In incremental mode, agreed text is committed as stable as soon as it is agreed on,
+    even if it does not end in sentence end punctuation. The audio samples corresponding
+    to stable text are purged from the buffer right away and the stable text is used to
+    precondition the next transcription, so each transcription only covers audio that has not
+    been agreed on yet. Stable text is still only emitted as a finalized transcription once it
+    ends in sentence end punctuation.
+
+    In both modes, commit_policy can finalize agreed text before a sentence end, so audio of long
+    run on sentences is purged sooner and fewer samples are transcribed again:
+    - sentence: Only finalize agreed text ending in sentence end punctuation
+    - word: Also finalize agreed words ending at least commit_min_age_ms before the end of the
+      transcribed audio, since words near the end are most likely to change
+    - time: Also finalize all agreed text once it spans at least commit_interval_ms
+
+    Implementations may use can_commit() to pick cheaper decoding options for transcriptions
+    that can only update in progress text, and needs_word_timestamps() to decide if words of a
+    transcription must be aligned to audio, as set by timestamp_mode:
+    - word: Always align words
+    - commit: Only align words if the transcription can finalize text or purge audio,
+      otherwise word times can be interpolated within segments
+    - segment: Never align words, word times are interpolated within segments
+
+    If transcribe_draft_audio() is implemented, draft_decodes_per_confirm segments are
+    transcribed by the cheaper draft model between each transcription by the main model.
+    Segments with silent new samples are always transcribed by the main model.
+    Draft transcriptions are only emitted as in progress transcriptions and are not used for
+    local agreement, so finalized text is always confirmed by the main model.
+
     Implements the process_segment() method.
     The load_model(), unload_model(), and transcribe_audio() methods need to be implemented.
 
@@ -78,7 +109,8 @@ class LocalAgreeModelBase(BufferAudioModelBase):
       url={https://arxiv.org/abs/2307.14743}, 
     }
     '''
-    __slots__ = ['prev_text', 'local_agree_dim', 'prev_transcriptions']
+    __slots__ = ['prev_text', 'local_agree_dim', 'history', 'stable_segments',
+                 'num_draft_decodes', 'history_has_sentence_end']
 
     SENTENCE_ENDS = ('.', '?', '!')
     SENTENCE_ENDS_WHITELIST = '...'
@@ -96,7 +128,14 @@ class LocalAgreeModelBase(BufferAudioModelBase):
 
         self.prev_text = ''
         self.local_agree_dim = local_agree_dim
-        self.prev_transcriptions: list[list[TranscriptionSegment]] = []
+        # Previous local_agree_dim - 1 transcriptions as token id arrays
+        self.history = AgreementHistory(local_agree_dim - 1)
+        # Agreed segments not yet finalized in incremental mode, timed relative to first block
+        self.stable_segments: list[TranscriptionSegment] = []
+        # Draft transcriptions since main model last transcribed
+        self.num_draft_decodes = 0
+        # If latest transcription in history contains a sentence end
+        self.history_has_sentence_end = False
 
     @staticmethod
     def validate_config(config: dict) -> ImplementationModelConfig:
@@ -115,8 +154,39 @@ class LocalAgreeModelBase(BufferAudioModelBase):
         '''
         config = BufferAudioModelBase.validate_config(config)
         config_dict_contains_int(config, 'local_agree_dim', minimum=1)
+
+        config.setdefault('local_agree_mode', LocalAgreeMode.FULL)
+        config_dict_contains_one_of(config, 'local_agree_mode', list(LocalAgreeMode))
+
+        config.setdefault('draft_decodes_per_confirm', 0)
+        config_dict_contains_int(config, 'draft_decodes_per_confirm', minimum=0)
+
+        config.setdefault('commit_policy', CommitPolicy.SENTENCE)
+        config_dict_contains_one_of(config, 'commit_policy', list(CommitPolicy))
+        config.setdefault('commit_min_age_ms', 1000)
+        config_dict_contains_int(config, 'commit_min_age_ms', minimum=0)
+        config.setdefault('commit_interval_ms', 5000)
+        config_dict_contains_int(config, 'commit_interval_ms', minimum=0)
+
+        config.setdefault('timestamp_mode', TimestampMode.WORD)
+        config_dict_contains_one_of(config, 'timestamp_mode', list(TimestampMode))
         return config
 
+    def max_silent_segments(self) -> int:
+        '''
+        Trailing speech needs local_agree_dim transcriptions by the main model to be agreed on,
+        so keep processing segments for local_agree_dim - 1 segments after speech ends.
+        Silent segments are transcribed by the main model, but the last segment with speech
+        may have been transcribed by the draft model, so one more segment is processed if
+        draft transcriptions are enabled.
+
+        Returns:
+        Number of consecutive segments with silent new samples to process before skipping
+        '''
+        if self.config['draft_decodes_per_confirm'] > 0:
+            return self.local_agree_dim
+        return self.local_agree_dim - 1
+
     def load_model(self) -> None:
         '''
         Should load model into memory to be ready for transcription.
@@ -142,7 +212,7 @@ class LocalAgreeModelBase(BufferAudioModelBase):
 
         Parameters:
         audio_segment   (1D numpy array):
-            Contains float16 audio normalized to [-1, 1] at 16k sample rate.
+            Contains float32 audio normalized to [-1, 1] at 16k sample rate.
 
         prev_text       (str):
             The previously finalized text that occurred before the current audio_segment. 
@@ -153,7 +223,119 @@ class LocalAgreeModelBase(BufferAudioModelBase):
         '''
         raise NotImplementedError('Must implement per model')
 
-    async def process_segment(self, audio_segment, audio_segment_start_time):
+    async def transcribe_draft_audio(
+        self,
+        audio_segment: npt.NDArray,
+        prev_text: str
+    ) -> list[TranscriptionSegment] | None:
+        '''
+        Override to transcribe in progress text with a cheaper draft model.
+
+        Parameters:
+        audio_segment   (1D numpy array):
+            Contains float32 audio normalized to [-1, 1] at 16k sample rate.
+
+        prev_text       (str):
+            The previously finalized text that occurred before the current audio_segment.
+
+        Returns:
+        A list of TranscriptionSegments, None if there is no draft model
+        '''
+
+    async def timed_transcribe_audio(
+        self,
+        audio_segment: npt.NDArray,
+        prev_text: str,
+        draft: bool = False
+    ) -> list[TranscriptionSegment] | None:
+        '''
+        Calls transcribe_audio() and records its latency and the amount of audio transcribed.
+
+        Parameters:
+        audio_segment   (1D numpy array): Audio passed to transcribe_audio()
+        prev_text       (str)           : Previous text passed to transcribe_audio()
+        draft           (bool)          : Call transcribe_draft_audio() instead
+
+        Returns:
+        A list of TranscriptionSegments, None if draft is True and there is no draft model
+        '''
+        transcribe = self.transcribe_draft_audio if draft else self.transcribe_audio
+        transcribe_start = time.perf_counter()
+        segments = await transcribe(audio_segment, prev_text)
+        duration = time.perf_counter() - transcribe_start
+
+        TRANSCRIBE_AUDIO_SECONDS.observe(duration)
+        INFERENCE_SECONDS.inc(duration)
+        AUDIO_TRANSCRIBED_SECONDS.inc(len(audio_segment) / self.SAMPLE_RATE)
+        return segments
+
+    def can_commit(self, audio_segment: npt.NDArray, draft: bool = False) -> bool:
+        '''
+        Checks if a transcription can finalize text or purge audio. Nothing can be agreed on
+        for draft transcriptions, before history is full, or in full mode with sentence commit
+        policy when the previous transcription has no sentence end.
+
+        Parameters:
+        audio_segment   (1D numpy array): Audio segment about to be transcribed
+        draft           (bool)          : If audio_segment is transcribed by the draft model
+
+        Returns:
+        True if transcription can commit text, False if it only updates in progress text
+        '''
+        if draft:
+            return False
+        # Text is forcibly finalized when buffer is full
+        if len(audio_segment) >= self.max_segment_samples:
+            return True
+        if not self.history.is_full():
+            return False
+        return (
+            self.config['local_agree_mode'] == LocalAgreeMode.INCREMENTAL or
+            self.config['commit_policy'] != CommitPolicy.SENTENCE or
+            self.history_has_sentence_end
+        )
+
+    def defer_processing(self, new_samples: int) -> bool:
+        '''
+        Checks if processing should wait for more samples because of load. Transcriptions that
+        can commit text are never deferred, so finalized text keeps priority over in progress
+        text while the shared model is over target load.
+
+        Parameters:
+        new_samples (int): Samples received since previous call of process_segment()
+
+        Returns:
+        True if process_segment() should not be called yet
+        '''
+        if self.can_commit(self.buffer.get_curr_buffer()):
+            return False
+        return super().defer_processing(new_samples)
+
+    def needs_word_timestamps(self, audio_segment: npt.NDArray, draft: bool = False) -> bool:
+        '''
+        Checks if words of a transcription must be aligned to audio under timestamp_mode.
+        Only the start and end of agreed segments decide what is finalized and purged, so
+        in commit mode alignment is skipped unless the transcription can commit text.
+
+        Parameters:
+        audio_segment   (1D numpy array): Audio segment about to be transcribed
+        draft           (bool)          : If audio_segment is transcribed by the draft model
+
+        Returns:
+        True if words must be aligned, False if interpolated word times are sufficient
+        '''
+        match self.config['timestamp_mode']:
+            case TimestampMode.WORD:
+                return True
+            case TimestampMode.SEGMENT:
+                return False
+        return self.can_commit(audio_segment, draft)
+
+    async def process_segment(  # pylint: disable=too-many-locals
+        self,
+        audio_segment,
+        audio_segment_start_time
+    ):
         '''
         Called when an audio segment is ready to be transcribed.
 
@@ -162,7 +344,7 @@ class LocalAgreeModelBase(BufferAudioModelBase):
 
         Parameters:
         audio_segment       (1D numpy array): 
-            Contains float16 audio normalized to [-1, 1] at 16k sample rate.
+            Contains float32 audio normalized to [-1, 1] at 16k sample rate.
             It contains at least min_new_segment new samples since previous call of process_segment.
             It also contains at most max_segment_samples samples.
 
@@ -178,50 +360,65 @@ class LocalAgreeModelBase(BufferAudioModelBase):
         max_segment_length_reached = len(
             audio_segment) >= self.max_segment_samples
 
-        segments = await self.transcribe_audio(audio_segment, self.prev_text)
+        # Full buffers must be purged, so only the main model can handle them. Silent segments
+        # after speech are only processed so trailing speech can be agreed on, which needs
+        # transcriptions by the main model
+        if (
+            not max_segment_length_reached and
+            self.num_silent_segments == 0 and
+            self.num_draft_decodes < self.config['draft_decodes_per_confirm'] and
+            await self.process_segment_draft(audio_segment, audio_segment_start_time)
+        ):
+            self.num_draft_decodes += 1
+            return 0
+        self.num_draft_decodes = 0
+
+        if self.config['local_agree_mode'] == LocalAgreeMode.INCREMENTAL:
+            return await self.process_segment_incremental(
+                audio_segment,
+                audio_segment_start_time,
+                max_segment_length_reached
+            )
+
+        segments = await self.timed_transcribe_audio(audio_segment, self.prev_text)
+        texts = [segment.text for segment in segments]
+        token_ids = self.history.encode(texts)
 
-        # Extract segments that satisfy local agreement
-        final_text = ''
+        # Finalize text within prefix that satisfies local agreement
+        num_agreed = self.history.agreed_prefix_length(token_ids)
         final_end_idx = 0
         final_end_time = 0
-        for i in range(min(len(segments), self.max_local_agree_length())):
-            if not self.local_agree(segments[i], i):
-                break
-            final_text += segments[i].text
-
-            if (
-                final_text.endswith(self.SENTENCE_ENDS) and
-                not final_text.endswith(self.SENTENCE_ENDS_WHITELIST)
-            ):
-                start = final_end_time
-                final_end_time = max(final_end_time, segments[i].end)
-
-                self.prev_text = final_text
-                await self.on_final_transcript_block(
-                    final_text,
-                    audio_segment_start_time + start,
-                    audio_segment_start_time + final_end_time
-                )
-                final_end_idx = i + 1
-                final_text = ''
+        for end_idx in self.final_block_ends(
+            texts,
+            num_agreed,
+            self.policy_commit_length(segments, num_agreed, len(audio_segment) / self.SAMPLE_RATE)
+        ):
+            final_text = ''.join(texts[final_end_idx:end_idx])
+            start = final_end_time
+            final_end_time = max(final_end_time, segments[end_idx - 1].end)
+
+            self.prev_text = final_text
+            await self.on_final_transcript_block(
+                final_text,
+                audio_segment_start_time + start,
+                audio_segment_start_time + final_end_time
+            )
+            final_end_idx = end_idx
 
         # If max segment length has been reached, force finalization of some text
         if max_segment_length_reached:
             start = final_end_time
-            forced_final_text = ''
+            forced_start_idx = final_end_idx
             while (
                 final_end_idx < len(segments) and
                 final_end_time < self.min_new_samples / self.SAMPLE_RATE
             ):
-                forced_final_text += segments[final_end_idx].text
-
-                final_end_time = max(
-                    final_end_time,
-                    segments[final_end_idx].end
-                )
+                final_end_time = max(final_end_time, segments[final_end_idx].end)
                 final_end_idx += 1
-                self.prev_text = forced_final_text
 
+            forced_final_text = ''.join(texts[forced_start_idx:final_end_idx])
+            if final_end_idx > forced_start_idx:
+                self.prev_text = forced_final_text
             await self.on_final_transcript_block(
                 forced_final_text,
                 audio_segment_start_time + start,
@@ -229,21 +426,20 @@ class LocalAgreeModelBase(BufferAudioModelBase):
             )
 
         # Output remaining text as in progress transcription
-        in_progress = ''
-        in_progress_end_time = final_end_time
-        for i in range(final_end_idx, len(segments)):
-            in_progress += segments[i].text
-            in_progress_end_time = max(in_progress_end_time, segments[i].end)
+        in_progress_end_time = max(
+            [final_end_time] + [segment.end for segment in segments[final_end_idx:]])
         await self.on_in_progress_transcript_block(
-            in_progress,
+            ''.join(texts[final_end_idx:]),
             audio_segment_start_time + final_end_time,
             audio_segment_start_time + in_progress_end_time
         )
 
-        # Update transcription history
-        self.prev_transcriptions.append(segments)
-        if len(self.prev_transcriptions) >= self.local_agree_dim:
-            self.prev_transcriptions.pop(0)
+        # Finalized segments are purged from audio, so drop them from transcription history
+        # to keep history aligned with the next transcription
+        self.history.drop_prefix(final_end_idx)
+        self.history.append(token_ids[final_end_idx:])
+        self.history_has_sentence_end = any(
+            text.endswith(self.SENTENCE_ENDS) for text in texts[final_end_idx:])
 
         finalized_samples = int(final_end_time * self.SAMPLE_RATE)
         if max_segment_length_reached:
@@ -252,34 +448,226 @@ class LocalAgreeModelBase(BufferAudioModelBase):
             finalized_samples = max(self.min_new_samples, finalized_samples)
         return min(finalized_samples, len(audio_segment))
 
-    def local_agree(self, segment: TranscriptionSegment, index: int) -> bool:
+    async def process_segment_draft(
+        self,
+        audio_segment: npt.NDArray,
+        audio_segment_start_time: float
+    ) -> bool:
         '''
-        Checks if segment at given index is in local agreement with transcription history.
+        Transcribes segment with draft model and emits it as an in progress transcription.
+        Stable text not yet finalized is kept at the start of the in progress transcription.
 
         Parameters:
-        segment (TranscriptionSegment): New TranscriptionSegment to compare with history.
-        index   (int)                 : Position TranscriptSegment corresponds to in history.
+        audio_segment               (1D numpy array): Audio segment passed to process_segment()
+        audio_segment_start_time    (float)         : Timestamp of the start of audio_segment
 
         Returns:
-        True if in local agreement, False otherwise
+        True if segment was transcribed, False if there is no draft model
         '''
-        # Reject if there is not enough history to form required agreement
-        if len(self.prev_transcriptions) != self.local_agree_dim - 1:
+        stable_text = ''.join(segment.text for segment in self.stable_segments)
+        segments = await self.timed_transcribe_audio(
+            audio_segment, self.prev_text + stable_text, draft=True)
+        if segments is None:
             return False
 
-        # Reject if any transcription doesn't match
-        for transcription in self.prev_transcriptions:
-            if segment.text != transcription[index].text:
-                return False
-
+        in_progress_start_time = audio_segment_start_time
+        if self.stable_segments:
+            in_progress_start_time = self.stable_segments[0].start
+        in_progress_end_time = max(
+            [in_progress_start_time] +
+            [segment.end for segment in self.stable_segments] +
+            [audio_segment_start_time + segment.end for segment in segments]
+        )
+        await self.on_in_progress_transcript_block(
+            stable_text + ''.join(segment.text for segment in segments),
+            in_progress_start_time,
+            in_progress_end_time
+        )
         return True
 
-    def max_local_agree_length(self) -> int:
+    async def process_segment_incremental(
+        self,
+        audio_segment: npt.NDArray,
+        audio_segment_start_time: float,
+        max_segment_length_reached: bool
+    ) -> int:
+        '''
+        Implements process_segment() for incremental mode.
+        Agreed segments are committed as stable and their audio is purged immediately.
+
+        Parameters:
+        audio_segment               (1D numpy array): Audio segment passed to process_segment()
+        audio_segment_start_time    (float)         : Timestamp of the start of audio_segment
+        max_segment_length_reached  (bool)          : If audio_segment fills the buffer
+
+        Returns:
+        Number samples of audio to purge from audio buffer.
+        '''
+        stable_text = ''.join(segment.text for segment in self.stable_segments)
+        segments = await self.timed_transcribe_audio(
+            audio_segment, self.prev_text + stable_text)
+        texts = [segment.text for segment in segments]
+        token_ids = self.history.encode(texts)
+
+        num_stable = self.history.agreed_prefix_length(token_ids)
+
+        stable_end_time = segments[num_stable - 1].end if num_stable > 0 else 0
+
+        # If max segment length has been reached, force some text to become stable
+        if max_segment_length_reached:
+            while (
+                num_stable < len(segments) and
+                stable_end_time < self.min_new_samples / self.SAMPLE_RATE
+            ):
+                stable_end_time = max(stable_end_time, segments[num_stable].end)
+                num_stable += 1
+
+        for segment in segments[:num_stable]:
+            self.stable_segments.append(TranscriptionSegment(
+                segment.text,
+                audio_segment_start_time + segment.start,
+                audio_segment_start_time + segment.end
+            ))
+        await self.finalize_stable_segments(
+            force=max_segment_length_reached,
+            audio_end_time=audio_segment_start_time + len(audio_segment) / self.SAMPLE_RATE
+        )
+
+        # Output stable and remaining text as in progress transcription
+        in_progress = ''.join(
+            [segment.text for segment in self.stable_segments] + texts[num_stable:])
+        in_progress_start_time = audio_segment_start_time + stable_end_time
+        if self.stable_segments:
+            in_progress_start_time = self.stable_segments[0].start
+        in_progress_end_time = audio_segment_start_time + max(
+            [stable_end_time] + [segment.end for segment in segments[num_stable:]])
+        await self.on_in_progress_transcript_block(
+            in_progress,
+            in_progress_start_time,
+            in_progress_end_time
+        )
+
+        # Stable segments are purged from audio, so drop them from transcription history
+        # to keep history aligned with the next transcription
+        self.history.drop_prefix(num_stable)
+        self.history.append(token_ids[num_stable:])
+
+        stable_samples = int(stable_end_time * self.SAMPLE_RATE)
+        if max_segment_length_reached:
+            # Ensure at least at least the minimum number of samples is purged in case of silence
+            stable_samples = max(self.min_new_samples, stable_samples)
+        return min(stable_samples, len(audio_segment))
+
+    async def finalize_stable_segments(
+        self,
+        force: bool = False,
+        audio_end_time: float = 0.0
+    ) -> None:
+        '''
+        Emits stable text ending in sentence end punctuation, or committed by commit_policy,
+        as finalized transcriptions.
+
+        Parameters:
+        force           (bool) : If True, also finalize any trailing stable text without a
+                                 sentence end
+        audio_end_time  (float): Timestamp of the end of the transcribed audio
+        '''
+        texts = [segment.text for segment in self.stable_segments]
+        num_committed = len(texts) if force else self.policy_commit_length(
+            self.stable_segments, len(texts), audio_end_time)
+
+        final_end_idx = 0
+        for end_idx in self.final_block_ends(texts, len(texts), num_committed):
+            final_text = ''.join(texts[final_end_idx:end_idx])
+            self.prev_text = final_text
+            await self.on_final_transcript_block(
+                final_text,
+                self.stable_segments[final_end_idx].start,
+                max(s.end for s in self.stable_segments[final_end_idx:end_idx])
+            )
+            final_end_idx = end_idx
+
+        del self.stable_segments[:final_end_idx]
+
+    def policy_commit_length(
+        self,
+        segments: list[TranscriptionSegment],
+        num_agreed: int,
+        audio_end_time: float
+    ) -> int:
         '''
+        Finds how many agreed segments commit_policy finalizes regardless of sentence ends.
+
+        Parameters:
+        segments        (list[TranscriptionSegment]): Segments starting with agreed segments
+        num_agreed      (int)                       : Number of leading agreed segments
+        audio_end_time  (float)                     : End of transcribed audio, timed the same
+                                                      way as segments
+
+        Returns:
+        Number of leading segments to finalize, 0 if only sentence ends are finalized
+        '''
+        match self.config['commit_policy']:
+            case CommitPolicy.WORD:
+                max_end_time = audio_end_time - self.config['commit_min_age_ms'] / 1000
+                num_committed = 0
+                while (
+                    num_committed < num_agreed and
+                    segments[num_committed].end <= max_end_time
+                ):
+                    num_committed += 1
+                return num_committed
+            case CommitPolicy.TIME:
+                if num_agreed > 0 and segments[num_agreed - 1].end - segments[0].start >= \
+                        self.config['commit_interval_ms'] / 1000:
+                    return num_agreed
+                return 0
+            case _:
+                return 0
+
+    def final_block_ends(
+        self,
+        texts: list[str],
+        num_agreed: int,
+        num_committed: int
+    ) -> list[int]:
+        '''
+        Splits agreed segments into finalized transcriptions. Each sentence is finalized
+        separately, along with any committed text following the last sentence end.
+
+        Parameters:
+        texts           (list[str]): Text of each segment
+        num_agreed      (int)      : Number of leading agreed segments
+        num_committed   (int)      : Number of leading segments to finalize even without a
+                                     sentence end
+
+        Returns:
+        Exclusive end index of each finalized transcription
+        '''
+        ends = []
+        for i in range(num_agreed):
+            start_idx = ends[-1] if ends else 0
+            if i == num_committed - 1 or self.sentence_end_text(texts, start_idx, i) is not None:
+                ends.append(i + 1)
+        return ends
+
+    def sentence_end_text(self, texts: list[str], start_idx: int, end_idx: int) -> str | None:
+        '''
+        Checks if text of segments start_idx to end_idx, inclusive, ends a sentence.
+        Text is only joined if the last segment ends in sentence end punctuation.
+
+        Parameters:
+        texts       (list[str]): Text of each segment
+        start_idx   (int)      : Index of first segment of sentence
+        end_idx     (int)      : Index of last segment of sentence
+
         Returns:
-        The shortest transcription history sequence. This is also the maximum number of
-        transcription segments that could possibly agree in required dimensions.
+        Joined text if it ends in sentence end punctuation, None otherwise
         '''
-        if len(self.prev_transcriptions) == 0:
-            return math.inf
-        return min(len(transcription) for transcription in self.prev_transcriptions)
+        # Segments before end_idx did not end a sentence, so only the last one can
+        if not texts[end_idx].endswith(self.SENTENCE_ENDS):
+            return None
+        text = ''.join(texts[start_idx:end_idx + 1])
+        if text.endswith(self.SENTENCE_ENDS_WHITELIST):
+            return None
+        return text
@@ -0,0 +1,317 @@
+'''
+Unit tests for LocalAgreeModelBase class
+'''
+# pylint: disable=too-few-public-methods
+import io
+import numpy as np
+import pytest
+from model_bases.local_agree_model_base import LocalAgreeModelBase, TranscriptionSegment
+from custom_types.config_types import CommitPolicy, LocalAgreeMode, TimestampMode
+from custom_types.transcription_types import BackendTranscriptionBlockType
+
+
+class FakeWebSocket:
+    '''
+    Simple fake websocket to capture what send_json is called with.
+    '''
+
+    def __init__(self):
+        self.sent_messages = []
+
+    async def send_json(self, message):
+        '''
+        Records what send_json() is called with
+        '''
+        self.sent_messages.append(message)
+
+
+class FakeLocalAgreeModel(LocalAgreeModelBase):
+    '''
+    Fake local agreement model that returns scripted transcriptions
+    '''
+    __slots__ = ['transcriptions', 'prompts']
+
+    def __init__(self, ws, config, transcriptions):
+        super().__init__(ws, config)
+        self.transcriptions = transcriptions
+        self.prompts = []
+
+    def load_model(self):
+        return None
+
+    def unload_model(self):
+        return None
+
+    async def transcribe_audio(self, audio_segment, prev_text):
+        self.prompts.append(prev_text)
+        return [TranscriptionSegment(*segment) for segment in self.transcriptions.pop(0)]
+
+
+class FakeDraftLocalAgreeModel(FakeLocalAgreeModel):
+    '''
+    Fake local agreement model that also returns scripted draft transcriptions
+    '''
+    __slots__ = ['draft_transcriptions']
+
+    def __init__(self, ws, config, transcriptions, draft_transcriptions):
+        super().__init__(ws, config, transcriptions)
+        self.draft_transcriptions = draft_transcriptions
+
+    async def transcribe_draft_audio(self, audio_segment, prev_text):
+        return [TranscriptionSegment(*segment) for segment in self.draft_transcriptions.pop(0)]
+
+
+def make_config(mode):
+    '''
+    Create model config using given local agreement mode
+    '''
+    return LocalAgreeModelBase.validate_config({
+        'local_agree_dim': 2,
+        'min_new_samples': 16_000,
+        'max_segment_samples': 160_000,
+        'silence_threshold': 0.01,
+        'local_agree_mode': mode
+    })
+
+
+def final_texts(fake_ws):
+    '''
+    Get text of finalized transcriptions sent to fake websocket
+    '''
+    return [
+        message['text'] for message in fake_ws.sent_messages
+        if message['type'] == BackendTranscriptionBlockType.FINAL
+    ]
+
+
+def test_defaults_to_full_mode():
+    '''
+    Test that local agreement mode defaults to full
+    '''
+    config = make_config(LocalAgreeMode.FULL)
+    del config['local_agree_mode']
+
+    config = LocalAgreeModelBase.validate_config(config)
+
+    assert config['local_agree_mode'] == LocalAgreeMode.FULL
+
+
+@pytest.mark.asyncio
+async def test_incremental_purges_agreed_audio():
+    '''
+    Test that incremental mode purges audio of agreed text before a sentence end and
+    finalizes it once the sentence end is agreed on
+    '''
+    fake_ws = FakeWebSocket()
+    model = FakeLocalAgreeModel(fake_ws, make_config(LocalAgreeMode.INCREMENTAL), [
+        [(' Hello', 0, 0.5), (' world', 0.5, 1), (' foo', 1, 1.5)],
+        [(' Hello', 0, 0.5), (' world.', 0.5, 1), (' Next', 1, 1.5)],
+        [(' world.', 0, 0.5), (' Nest', 0.5, 1)],
+    ])
+    audio = np.zeros(48_000, dtype=np.float32)
+
+    assert await model.process_segment(audio, 0) == 0, 'Nothing agreed yet'
+    assert await model.process_segment(audio, 0) == 8_000, 'Agreed word purged'
+    assert await model.process_segment(audio[8_000:], 0.5) == 8_000, 'Agreed word purged'
+
+    assert model.prompts == ['', '', ' Hello'], 'Stable text used as prompt'
+    final = [
+        message for message in fake_ws.sent_messages
+        if message['type'] == BackendTranscriptionBlockType.FINAL
+    ]
+    assert final == [{
+        'type': BackendTranscriptionBlockType.FINAL,
+        'text': ' Hello world.',
+        'start': 0,
+        'end': 1
+    }], 'Finalized once sentence end agreed'
+    assert fake_ws.sent_messages[-1]['text'] == ' Nest', 'Remaining text in progress'
+    assert fake_ws.sent_messages[-1]['start'] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_keeps_audio_until_sentence_end():
+    '''
+    Test that full mode only purges audio once agreed text ends in a sentence end
+    '''
+    fake_ws = FakeWebSocket()
+    model = FakeLocalAgreeModel(fake_ws, make_config(LocalAgreeMode.FULL), [
+        [(' Hello', 0, 0.5), (' world', 0.5, 1)],
+        [(' Hello', 0, 0.5), (' world', 0.5, 1)],
+    ])
+    audio = np.zeros(48_000, dtype=np.float32)
+
+    assert await model.process_segment(audio, 0) == 0
+    assert await model.process_segment(audio, 0) == 0, 'No sentence end agreed'
+    assert fake_ws.sent_messages[-1]['text'] == ' Hello world'
+
+
+@pytest.mark.asyncio
+async def test_draft_model_only_emits_in_progress():
+    '''
+    Test that draft transcriptions are emitted as in progress and main model confirms finals
+    '''
+    fake_ws = FakeWebSocket()
+    config = make_config(LocalAgreeMode.FULL)
+    config['draft_decodes_per_confirm'] = 1
+    model = FakeDraftLocalAgreeModel(fake_ws, config, [
+        [(' Hello.', 0, 0.5)],
+        [(' Hello.', 0, 0.5), (' Bye', 0.5, 1)],
+    ], [
+        [(' Hallo', 0, 0.5)],
+        [(' Hello.', 0, 0.5), (' By', 0.5, 1)],
+    ])
+    audio = np.zeros(48_000, dtype=np.float32)
+
+    assert await model.process_segment(audio, 0) == 0
+    assert fake_ws.sent_messages[-1]['text'] == ' Hallo', 'Draft emitted as in progress'
+    assert await model.process_segment(audio, 0) == 0
+    assert await model.process_segment(audio, 0) == 0
+    assert fake_ws.sent_messages[-1]['text'] == ' Hello. By'
+    assert await model.process_segment(audio, 0) == 8_000, 'Main model agreed on sentence'
+
+    assert [
+        message['type'] for message in fake_ws.sent_messages
+    ] == [BackendTranscriptionBlockType.IN_PROGRESS] * 3 + [
+        BackendTranscriptionBlockType.FINAL,
+        BackendTranscriptionBlockType.IN_PROGRESS
+    ], 'Only main model finalized text'
+    assert fake_ws.sent_messages[-1]['text'] == ' Bye'
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_skips_draft_model():
+    '''
+    Test that full buffers are always transcribed by the main model
+    '''
+    config = make_config(LocalAgreeMode.FULL)
+    config['draft_decodes_per_confirm'] = 1
+    model = FakeDraftLocalAgreeModel(FakeWebSocket(), config, [[(' Hello', 0, 0.5)]], [])
+
+    purged = await model.process_segment(np.zeros(160_000, dtype=np.float32), 0)
+
+    assert purged == 16_000, 'Main model forced finalization'
+    assert not model.transcriptions
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('mode', list(LocalAgreeMode))
+async def test_word_commit_policy(mode):
+    '''
+    Test that word commit policy finalizes agreed words once they are old enough, without
+    waiting for a sentence end
+    '''
+    fake_ws = FakeWebSocket()
+    config = make_config(mode)
+    config['commit_policy'] = CommitPolicy.WORD
+    config['commit_min_age_ms'] = 1_500
+    model = FakeLocalAgreeModel(fake_ws, config, [
+        [(' one', 0, 0.5), (' two', 0.5, 1), (' three', 1, 2)],
+        [(' one', 0, 0.5), (' two', 0.5, 1), (' three', 1, 2), (' four', 2, 2.5)],
+    ])
+    audio = np.zeros(48_000, dtype=np.float32)
+
+    assert await model.process_segment(audio, 0) == 0, 'Nothing agreed yet'
+    purged = await model.process_segment(audio, 0)
+    assert final_texts(fake_ws) == [' one two'], 'Only words 1.5 seconds before end finalized'
+    if mode == LocalAgreeMode.FULL:
+        assert purged == 16_000, 'Finalized words purged'
+
+
+@pytest.mark.asyncio
+async def test_time_commit_policy():
+    '''
+    Test that time commit policy finalizes all agreed text once it spans commit_interval_ms
+    '''
+    fake_ws = FakeWebSocket()
+    config = make_config(LocalAgreeMode.FULL)
+    config['commit_policy'] = CommitPolicy.TIME
+    config['commit_interval_ms'] = 2_000
+    model = FakeLocalAgreeModel(fake_ws, config, [
+        [(' one', 0, 0.5), (' two.', 0.5, 1), (' three', 1, 1.5)],
+        [(' one', 0, 0.5), (' two.', 0.5, 1), (' three', 1, 1.5), (' four', 1.5, 2.5)],
+        [(' three', 0, 0.5), (' four', 0.5, 1.5), (' five', 1.5, 2)],
+        [(' three', 0, 0.5), (' four', 0.5, 1.5), (' five', 1.5, 2.5)],
+    ])
+    audio = np.zeros(48_000, dtype=np.float32)
+
+    assert await model.process_segment(audio, 0) == 0
+    assert await model.process_segment(audio, 0) == 16_000, 'Sentence end finalized'
+    assert await model.process_segment(audio[16_000:], 1) == 0, 'Agreed text spans 1.5 seconds'
+    assert await model.process_segment(audio[16_000:], 1) == 32_000, \
+        'Agreed text spanning 2.5 seconds finalized'
+    assert final_texts(fake_ws) == [' one two.', ' three four five']
+
+
+@pytest.mark.asyncio
+async def test_commit_timestamp_mode():
+    '''
+    Test that commit timestamp mode only needs word timestamps if text can be finalized
+    '''
+    config = make_config(LocalAgreeMode.FULL)
+    config['timestamp_mode'] = TimestampMode.COMMIT
+    model = FakeLocalAgreeModel(FakeWebSocket(), config, [
+        [(' Hello', 0, 0.5), (' world', 0.5, 1)],
+        [(' Hello', 0, 0.5), (' world.', 0.5, 1), (' Next', 1, 1.5)],
+    ])
+    audio = np.zeros(48_000, dtype=np.float32)
+
+    assert not model.needs_word_timestamps(audio), 'Nothing can be agreed on yet'
+    await model.process_segment(audio, 0)
+    assert not model.needs_word_timestamps(audio), 'Previous transcription has no sentence end'
+    await model.process_segment(audio, 0)
+    assert model.needs_word_timestamps(audio), 'Previous transcription has sentence end'
+    assert not model.needs_word_timestamps(audio, draft=True), 'Drafts are never finalized'
+    assert model.needs_word_timestamps(np.zeros(160_000, dtype=np.float32)), \
+        'Full buffer is forcibly finalized'
+
+    model.config['timestamp_mode'] = TimestampMode.SEGMENT
+    assert not model.needs_word_timestamps(audio)
+    model.config['timestamp_mode'] = TimestampMode.WORD
+    assert model.needs_word_timestamps(audio, draft=True)
+
+
+@pytest.mark.asyncio
+async def test_defers_only_in_progress_processing():
+    '''
+    Test that processing during speech is only deferred under load if it cannot commit text
+    '''
+    model = FakeLocalAgreeModel(FakeWebSocket(), make_config(LocalAgreeMode.FULL), [
+        [(' Hello', 0, 0.5), (' world', 0.5, 1)],
+        [(' Hello', 0, 0.5), (' world.', 0.5, 1), (' Next', 1, 1.5)],
+    ])
+    model.cadence_multiplier = 3
+    model.append_audio(np.full(16_000, 8_000, dtype='<i2'))
+    audio = np.zeros(48_000, dtype=np.float32)
+
+    await model.process_segment(audio, 0)
+    assert model.defer_processing(16_000), 'Nothing can be agreed on yet'
+    await model.process_segment(audio, 0)
+    assert not model.defer_processing(16_000), 'Previous transcription has sentence end'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('draft_decodes_per_confirm', [0, 1])
+async def test_silence_after_speech_finalized(draft_decodes_per_confirm):
+    '''
+    Test that trailing speech is agreed on by the main model while silence follows it,
+    even if draft transcriptions run between main model transcriptions
+    '''
+    fake_ws = FakeWebSocket()
+    config = make_config(LocalAgreeMode.FULL)
+    config['draft_decodes_per_confirm'] = draft_decodes_per_confirm
+    model = FakeDraftLocalAgreeModel(
+        fake_ws,
+        config,
+        [[(' Hello', 0, 0.5), (' world.', 0.5, 1)] for _ in range(7)],
+        [[(' Hello', 0, 0.5), (' word', 0.5, 1)] for _ in range(7)]
+    )
+    speech = np.full(24_000, 8_000, dtype='<i2')
+    silence = np.zeros(24_000, dtype='<i2')
+
+    await model.queue_audio_chunk(io.BytesIO(speech.tobytes()))
+    # Pause shorter than buffer, so text is not forcibly finalized
+    for _ in range(4):
+        await model.queue_audio_chunk(io.BytesIO(silence.tobytes()))
+
+    assert final_texts(fake_ws) == [' Hello world.']
@@ -8,23 +8,35 @@ Classes:
 Types:
     TranscriptionModelConfig
 '''
+import asyncio
 import io
 import logging
+import math
+import time
 from abc import ABC, abstractmethod
 from fastapi import WebSocket
 from custom_types.config_types import ImplementationModelConfig
-from custom_types.transcription_types import BackendTranscriptionBlockType, BackendTranscriptBlock
+from custom_types.transcription_types import BackendTranscriptionBlockType
+from utils.metrics import SUPPRESSED_IN_PROGRESS_BLOCKS, WEBSOCKET_SEND_SECONDS
+from utils.transcript_encoder import JsonTranscriptEncoder, TranscriptEncoder
 
 
-class TranscriptionModelBase(ABC):
+class TranscriptionModelBase(ABC):  # pylint: disable=too-many-instance-attributes
     '''
     Base transcription model class.
     Presents a unified interface for using different transcription models on the backend.
 
     The validate_config(), load_model(), unload_model(), and 
     queue_audio_chunk() methods must be implemented.
+
+    In progress blocks repeating the previous in progress block are not sent. In progress
+    blocks arriving less than min_in_progress_interval seconds after the previous one are held
+    back, and the newest held back block is sent once the interval has passed unless a final
+    block is sent first. Final blocks are always sent.
     '''
-    __slots__ = ['logger', 'ws', 'config']
+    __slots__ = ['logger', 'ws', 'config', 'transcript_encoder', 'min_in_progress_interval',
+                 'prev_in_progress_block', 'prev_in_progress_time', 'pending_in_progress_block',
+                 'pending_in_progress_task']
 
     def __init__(self, ws: WebSocket, config: ImplementationModelConfig):
         '''
@@ -38,6 +50,15 @@ class TranscriptionModelBase(ABC):
         self.ws = ws
         self.config = self.validate_config(config)
         self.logger = logging.getLogger('uvicorn.error')
+        self.transcript_encoder: TranscriptEncoder = JsonTranscriptEncoder()
+        self.min_in_progress_interval = 0.0
+        # (text, start) of last in progress block sent, None if a final block was sent since
+        self.prev_in_progress_block: tuple[str, float] | None = None
+        self.prev_in_progress_time = -math.inf
+        # (text, start, end) of newest in progress block held back by min_in_progress_interval
+        self.pending_in_progress_block: tuple[str, float, float] | None = None
+        # Sends pending_in_progress_block once min_in_progress_interval has passed
+        self.pending_in_progress_task: asyncio.Task | None = None
 
     @staticmethod
     @abstractmethod
@@ -83,10 +104,113 @@ class TranscriptionModelBase(ABC):
         is ready, call on_final_transcript_block() or on_in_progress_transcript_block().
 
         Parameters:
-        audio_chunk   (io.BytesIO): A buffer containing wav audio
+        audio_chunk   (io.BytesIO): A buffer containing wav or headerless pcm audio
         '''
         raise NotImplementedError('Must implement per model')
 
+    def set_under_load(self, under_load: bool) -> None:
+        '''
+        Called before each queue_audio_chunk() call with whether the session is falling behind.
+        Override to reduce work while under load, e.g. by skipping in progress transcriptions.
+
+        Parameters:
+        under_load  (bool): True if session is falling behind real time
+        '''
+
+    def set_transcript_encoder(self, transcript_encoder: TranscriptEncoder) -> None:
+        '''
+        Called before audio is queued with the encoder for the websocket's selected
+        transcript format. Transcript blocks are sent as JSON objects by default.
+
+        Parameters:
+        transcript_encoder  (TranscriptEncoder): Encoder used to send transcript blocks
+        '''
+        self.transcript_encoder = transcript_encoder
+
+    def set_min_in_progress_interval(self, min_in_progress_interval: float) -> None:
+        '''
+        Called before audio is queued with the minimum time between in progress blocks.
+
+        Parameters:
+        min_in_progress_interval    (float): Minimum seconds between in progress blocks
+        '''
+        self.min_in_progress_interval = min_in_progress_interval
+
+    async def send_transcript_block(
+        self,
+        block_type: BackendTranscriptionBlockType,
+        text: str,
+        start: float,
+        end: float
+    ) -> None:
+        '''
+        Encodes a transcript block with the transcript encoder and sends it over websocket.
+
+        Parameters:
+        block_type  (BackendTranscriptionBlockType): Whether block is final or in progress
+        text        (str)                          : Transcribed text
+        start       (float)                        : Start time of block
+        end         (float)                        : End time of block
+        '''
+        message = self.transcript_encoder.encode(block_type, text, start, end)
+        send_start = time.perf_counter()
+        if isinstance(message, bytes):
+            await self.ws.send_bytes(message)
+        else:
+            await self.ws.send_json(message)
+        WEBSOCKET_SEND_SECONDS.observe(
+            time.perf_counter() - send_start,
+            ('final' if block_type == BackendTranscriptionBlockType.FINAL else 'in_progress',)
+        )
+
+    def cancel_pending_in_progress_block(self) -> bool:
+        '''
+        Discards the in progress block held back by min_in_progress_interval, if any.
+        Called when a newer block is ready and when the websocket disconnects.
+
+        Returns:
+        True if a block was discarded
+        '''
+        if self.pending_in_progress_task is not None:
+            self.pending_in_progress_task.cancel()
+            self.pending_in_progress_task = None
+        discarded = self.pending_in_progress_block is not None
+        self.pending_in_progress_block = None
+        return discarded
+
+    async def send_pending_in_progress_block(self, delay: float) -> None:
+        '''
+        Sends the pending in progress block after delay seconds.
+
+        Parameters:
+        delay   (float): Seconds until min_in_progress_interval has passed
+        '''
+        await asyncio.sleep(delay)
+        # Once sending starts, a newer block must not cancel it
+        self.pending_in_progress_task = None
+        if self.pending_in_progress_block is not None:
+            text, start, end = self.pending_in_progress_block
+            self.pending_in_progress_block = None
+            await self.send_in_progress_block(text, start, end)
+
+    async def send_in_progress_block(self, text: str, start: float, end: float) -> None:
+        '''
+        Records in progress block as the previous one sent and sends it.
+
+        Parameters:
+        text    (str)  : In progress transcribed text
+        start   (float): Start time of this transcription block
+        end     (float): End time of this transcription block
+        '''
+        self.prev_in_progress_block = (text, start)
+        self.prev_in_progress_time = time.monotonic()
+
+        # Sent every decode, only log when debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('[%6.2f - %6.2f] In Progress: %s', start, end, text)
+        await self.send_transcript_block(
+            BackendTranscriptionBlockType.IN_PROGRESS, text, start, end)
+
     async def on_final_transcript_block(self, text: str, start=-1.0, end=-1.0) -> None:
         '''
         Call this when a block of finalized transcription is ready
@@ -96,31 +220,38 @@ class TranscriptionModelBase(ABC):
         start   (float): Start time of this transcription chunk [Optional]
         end     (float): End time of this transcription chunk [Optional]
         '''
+        # In progress block following the final text replaces held back block right away
+        self.cancel_pending_in_progress_block()
         self.logger.info('[%6.2f - %6.2f] Final      : %s', start, end, text)
-        transcript_block: BackendTranscriptBlock = {
-            'type': BackendTranscriptionBlockType.FINAL,
-            'text': text,
-            'start': start,
-            'end': end
-        }
-        await self.ws.send_json(transcript_block)
+        await self.send_transcript_block(BackendTranscriptionBlockType.FINAL, text, start, end)
+        # Next in progress block follows new final text, send it right away
+        self.prev_in_progress_block = None
+        self.prev_in_progress_time = -math.inf
 
     async def on_in_progress_transcript_block(self, text: str, start=-1.0, end=-1.0) -> None:
         '''
         Call this when a block of in progress transcription is ready.
         This is used to provide a lower latency transcription at the cost of some accuracy.
         If model does not support in progress guesses, only call on_final_transcript_chunk().
+        Blocks are dropped if they repeat the previous in progress block. Blocks arriving less
+        than min_in_progress_interval seconds after it are held back until the interval has
+        passed, replacing any block already held back.
 
         Parameters:
         text    (str)  : Finalized transcribed text
         start   (float): Start time of this transcription block [Optional]
         end     (float): End time of this transcription block [Optional]
         '''
-        self.logger.info('[%6.2f - %6.2f] In Progress: %s', start, end, text)
-        transcript_block: BackendTranscriptBlock = {
-            'type': BackendTranscriptionBlockType.IN_PROGRESS,
-            'text': text,
-            'start': start,
-            'end': end
-        }
-        await self.ws.send_json(transcript_block)
+        # Newer block replaces any held back block, whether it is sent or held back itself
+        if self.cancel_pending_in_progress_block():
+            SUPPRESSED_IN_PROGRESS_BLOCKS.inc(labels=('rate_limited',))
+        if (text, start) == self.prev_in_progress_block:
+            SUPPRESSED_IN_PROGRESS_BLOCKS.inc(labels=('duplicate',))
+            return
+        wait = self.prev_in_progress_time + self.min_in_progress_interval - time.monotonic()
+        if wait > 0:
+            self.pending_in_progress_block = (text, start, end)
+            self.pending_in_progress_task = asyncio.create_task(
+                self.send_pending_in_progress_block(wait))
+            return
+        await self.send_in_progress_block(text, start, end)
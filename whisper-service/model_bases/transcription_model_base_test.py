@@ -2,6 +2,7 @@
 Unit tests for TranscriptionModelBase class
 '''
 # pylint: disable=redefined-outer-name
+import asyncio
 import pytest
 from model_bases.transcription_model_base import TranscriptionModelBase
 from custom_types.transcription_types import BackendTranscriptionBlockType
@@ -104,6 +105,77 @@ async def test_on_in_progress_transcript(fake_implementation):
     assert message['end'] == 1
 
 
+@pytest.mark.asyncio
+async def test_suppresses_duplicate_in_progress(fake_implementation):
+    '''
+    Test that in progress blocks repeating the previous in progress block are not sent,
+    unless a final block was sent in between
+    '''
+    fake_ws = FakeWebSocket()
+    model_base = fake_implementation(fake_ws, fake_config)
+
+    await model_base.on_in_progress_transcript_block("Hello", start=0, end=1)
+    await model_base.on_in_progress_transcript_block("Hello", start=0, end=2)
+    await model_base.on_in_progress_transcript_block("Hello world", start=0, end=2)
+    await model_base.on_final_transcript_block("Hello world", start=0, end=2)
+    await model_base.on_final_transcript_block("Hello world", start=0, end=2)
+    await model_base.on_in_progress_transcript_block("Hello world", start=0, end=2)
+
+    assert [message['text'] for message in fake_ws.get_sent_messages()] == \
+        ["Hello", "Hello world", "Hello world", "Hello world", "Hello world"], \
+        'Only repeated in progress block dropped'
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_in_progress(fake_implementation, mocker):
+    '''
+    Test that in progress blocks within min_in_progress_interval are held back and
+    discarded when a final block is sent
+    '''
+    monotonic = mocker.patch('time.monotonic', return_value=10.0)
+    fake_ws = FakeWebSocket()
+    model_base = fake_implementation(fake_ws, fake_config)
+    model_base.set_min_in_progress_interval(0.5)
+
+    await model_base.on_in_progress_transcript_block("one", start=0, end=1)
+    monotonic.return_value = 10.2
+    await model_base.on_in_progress_transcript_block("one two", start=0, end=1)
+    await model_base.on_final_transcript_block("one two.", start=0, end=1)
+    await model_base.on_in_progress_transcript_block("three", start=1, end=2)
+    monotonic.return_value = 10.8
+    await model_base.on_in_progress_transcript_block("three four", start=1, end=2)
+
+    assert [message['text'] for message in fake_ws.get_sent_messages()] == \
+        ["one", "one two.", "three", "three four"], \
+        'In progress block within interval discarded by final block, final blocks always sent'
+
+
+@pytest.mark.asyncio
+async def test_sends_held_back_in_progress(fake_implementation):
+    '''
+    Test that the newest in progress block held back by min_in_progress_interval is sent
+    once the interval has passed, even if no newer block arrives
+    '''
+    fake_ws = FakeWebSocket()
+    model_base = fake_implementation(fake_ws, fake_config)
+    model_base.set_min_in_progress_interval(0.05)
+
+    await model_base.on_in_progress_transcript_block("one", start=0, end=1)
+    await model_base.on_in_progress_transcript_block("one two", start=0, end=1)
+    await model_base.on_in_progress_transcript_block("one two three", start=0, end=1)
+    assert [message['text'] for message in fake_ws.get_sent_messages()] == ["one"]
+
+    await asyncio.sleep(0.1)
+    assert [message['text'] for message in fake_ws.get_sent_messages()] == \
+        ["one", "one two three"], 'Only newest held back block sent after interval'
+
+    model_base.set_min_in_progress_interval(10)
+    await model_base.on_in_progress_transcript_block("one two three four", start=0, end=1)
+    model_base.cancel_pending_in_progress_block()
+    await asyncio.sleep(0.1)
+    assert len(fake_ws.get_sent_messages()) == 2, 'Cancelled block not sent'
+
+
 def test_validate_config_called(fake_implementation):
     '''
     Test that validate_config() is called when model is instantiated and 
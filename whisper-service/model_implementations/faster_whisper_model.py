@@ -3,16 +3,548 @@ Implementation of TranscriptionModelBase using faster_whisper
 
 Classes:
     FasterWhisperModel
+
+Functions:
+    load_whisper_model
+    transcribe_options
+    interpolate_words
+    segment_words
+    transcribe_words
+    prepare_speech_features
+    split_generated_segments
+    restore_word_timestamps
+    set_detected_languages
+    decode_words_batch
+    transcribe_words_batch
+    transcribe_words_batch_in_worker
 '''
+import re
+import threading
+import numpy as np
+import numpy.typing as npt
+from ctranslate2 import StorageView
+from ctranslate2.models import WhisperGenerationResult
 from faster_whisper import WhisperModel
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import Segment, get_suppressed_tokens
+from faster_whisper.vad import \
+    VadOptions, SpeechTimestampsMap, collect_chunks, get_speech_timestamps
 from model_bases.local_agree_model_base import LocalAgreeModelBase, TranscriptionSegment
+from custom_types.config_types import DecodeType, ModelImplementationId, InferenceExecutorKind
+from utils.config_dict_contains import \
+    config_dict_contains_dict, config_dict_contains_int, config_dict_contains_one_of, \
+    config_dict_contains_str
+from utils.mel_feature_cache import MelFeatureCache, normalize_log_mel
+from utils.model_pool import MODEL_POOL, model_pool_key
+from utils.shared_array import resolve_shared_array
+from utils.streaming_vad import StreamingVad
+
+# Type hint for transcribed words passed back from inference executor as (text, start, end)
+type TranscribedWord = tuple[str, float, float]
+# Type hint for log mel frames of an audio segment and the sample its first frame is centered on
+type LogMelFrames = tuple[npt.NDArray, int]
+# Type hint for (beam_size, temperature_fallback, max_new_tokens) used to decode.
+# max_new_tokens is 0 if the number of generated tokens is only limited by the model
+type DecodeOptions = tuple[int, bool, int]
+# Type hint for (audio_segment, prev_text, log_mel, speech_chunks, word_timestamps,
+# decode_options) passed to inference. log_mel and speech_chunks are None if they were not
+# computed while buffering audio. Word times are interpolated within segments if word_timestamps
+# is False
+type TranscriptionRequest = \
+    tuple[npt.NDArray, str, LogMelFrames | None, list[dict] | None, bool, DecodeOptions]
+
+# Same as faster whisper's transcribe()
+DEFAULT_DECODE_OPTIONS: DecodeOptions = (5, True, 0)
+# Prompt uses up to 228 tokens of the model's 448 token context
+MAX_NEW_TOKENS = 220
+
+
+def load_whisper_model(model_options: dict) -> WhisperModel:
+    '''
+    Loads a faster whisper model.
+
+    Parameters:
+    model_options (dict): Options used to construct model, see FasterWhisperModel.model_options()
+
+    Returns:
+    Loaded WhisperModel
+    '''
+    return WhisperModel(
+        model_options['model'],
+        device=model_options['device'],
+        num_workers=model_options['num_workers']
+    )
+
+
+def transcribe_options(decode_options: DecodeOptions) -> dict:
+    '''
+    Parameters:
+    decode_options (DecodeOptions): Options used to decode
+
+    Returns:
+    Keyword arguments of faster whisper's transcribe() for decode options
+    '''
+    beam_size, temperature_fallback, max_new_tokens = decode_options
+    return {
+        'beam_size': beam_size,
+        # Temperatures transcribe() falls back to when decoding fails
+        'temperature': [0.0, 0.2, 0.4, 0.6, 0.8, 1.0] if temperature_fallback else 0.0,
+        'max_new_tokens': max_new_tokens or None
+    }
+
+
+def interpolate_words(text: str, start: float, end: float) -> list[TranscribedWord]:
+    '''
+    Splits segment text into words, timing each word in proportion to its length.
+    Much cheaper than aligning words to audio, but less accurate.
+
+    Parameters:
+    text    (str)  : Text of segment
+    start   (float): Start time of segment
+    end     (float): End time of segment
+
+    Returns:
+    A list of words, each including leading whitespace
+    '''
+    words = re.findall(r'\s*\S+', text)
+    num_chars = sum(len(word.strip()) for word in words)
+    interpolated = []
+    chars_before = 0
+    for word in words:
+        word_start = start + (end - start) * chars_before / num_chars
+        chars_before += len(word.strip())
+        interpolated.append((word, word_start, start + (end - start) * chars_before / num_chars))
+    return interpolated
+
+
+def segment_words(segment: Segment, word_timestamps: bool) -> list[TranscribedWord]:
+    '''
+    Parameters:
+    segment         (Segment): Segment returned by transcribe()
+    word_timestamps (bool)   : If segment was transcribed with word_timestamps
+
+    Returns:
+    Aligned words of segment, or words interpolated within segment if words were not aligned
+    '''
+    if word_timestamps:
+        return [(word.word, word.start, word.end) for word in segment.words]
+    return interpolate_words(segment.text, segment.start, segment.end)
+
+
+def transcribe_words(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    model: WhisperModel,
+    audio_segment: npt.NDArray,
+    prev_text: str,
+    speech_chunks: list[dict] | None = None,
+    word_timestamps: bool = True,
+    decode_options: DecodeOptions = DEFAULT_DECODE_OPTIONS
+) -> list[TranscribedWord]:
+    '''
+    Runs faster whisper transcription to completion. Blocks until transcription is done,
+    so it should be run on an inference executor.
+
+    Parameters:
+    model           (WhisperModel)  : Model to transcribe with
+    audio_segment   (1D numpy array): Audio normalized to [-1, 1] at 16k sample rate
+    prev_text       (str)           : Previously finalized text used as prompt
+    speech_chunks   (list[dict])    : Speech chunks of audio_segment. If not provided,
+                                      they are found with vad_filter [Optional]
+    word_timestamps (bool)          : Align words to audio. Otherwise word times are
+                                      interpolated within segments [Optional]
+    decode_options  (DecodeOptions) : Options used to decode [Optional]
+
+    Returns:
+    A list of transcribed words
+    '''
+    if speech_chunks is None:
+        transcription, _ = model.transcribe(
+            audio_segment,
+            initial_prompt=prev_text,
+            word_timestamps=word_timestamps,
+            vad_filter=True,
+            **transcribe_options(decode_options)
+        )
+        return [
+            word
+            for segment in transcription
+            for word in segment_words(segment, word_timestamps)
+        ]
+
+    if not speech_chunks:
+        return []
+
+    # Same as vad_filter, using the provided speech chunks
+    transcription, _ = model.transcribe(
+        np.concatenate(collect_chunks(audio_segment, speech_chunks)[0]),
+        initial_prompt=prev_text,
+        word_timestamps=word_timestamps,
+        vad_filter=False,
+        **transcribe_options(decode_options)
+    )
+    speech_map = SpeechTimestampsMap(speech_chunks, model.feature_extractor.sampling_rate)
+    words = []
+    for segment in transcription:
+        for text, start, end in segment_words(segment, word_timestamps):
+            chunk_index = speech_map.get_chunk_index((start + end) / 2)
+            words.append((
+                text,
+                speech_map.get_original_time(start, chunk_index),
+                speech_map.get_original_time(end, chunk_index)
+            ))
+    return words
+
+
+def prepare_speech_features(
+    model: WhisperModel,
+    audio_segment: npt.NDArray,
+    log_mel: LogMelFrames | None = None,
+    speech_chunks: list[dict] | None = None
+) -> tuple[npt.NDArray, SpeechTimestampsMap] | None:
+    '''
+    Removes non speech from audio and computes its features the same way transcribe() does
+    with vad_filter enabled.
+
+    If log mel frames of audio_segment are provided, frames centered within speech are selected
+    instead of computing features of the concatenated speech. Speech chunks are aligned to
+    frames, so timestamps are restored from the audio the selected frames cover.
+
+    Parameters:
+    model           (WhisperModel)  : Model to compute features for
+    audio_segment   (1D numpy array): Audio normalized to [-1, 1] at 16k sample rate
+    log_mel         (LogMelFrames)  : Cached log mel frames of audio_segment [Optional]
+    speech_chunks   (list[dict])    : Speech chunks of audio_segment. If not provided,
+                                      they are found with VAD [Optional]
+
+    Returns:
+    Features of speech, without padding, and map to restore original timestamps.
+    None if audio has no speech.
+    '''
+    if speech_chunks is None:
+        speech_chunks = get_speech_timestamps(audio_segment, VadOptions())
+    if not speech_chunks:
+        return None
+
+    if log_mel is not None:
+        frames, first_sample = log_mel
+        hop_length = model.feature_extractor.hop_length
+        speech_frames = []
+        frame_chunks = []
+        for chunk in speech_chunks:
+            start = max(0, -(-(chunk['start'] - first_sample) // hop_length))
+            end = min(len(frames), -(-(chunk['end'] - first_sample) // hop_length))
+            if start >= end:
+                continue
+            speech_frames.append(frames[start:end])
+            frame_chunks.append({
+                'start': first_sample + start * hop_length,
+                'end': first_sample + end * hop_length
+            })
+        if not speech_frames:
+            return None
+        return (
+            normalize_log_mel(np.concatenate(speech_frames)),
+            SpeechTimestampsMap(frame_chunks, model.feature_extractor.sampling_rate)
+        )
+
+    speech_audio = np.concatenate(collect_chunks(audio_segment, speech_chunks)[0])
+    features = model.feature_extractor(speech_audio)
+    return (
+        features[:, :features.shape[-1] - 1],
+        SpeechTimestampsMap(speech_chunks, model.feature_extractor.sampling_rate)
+    )
+
+
+def split_generated_segments(
+    model: WhisperModel,
+    tokenizer: Tokenizer,
+    result: WhisperGenerationResult,
+    segment_size: int
+) -> list[dict] | None:
+    '''
+    Splits a generation result into segments the same way as transcribe() does.
+
+    Parameters:
+    model        (WhisperModel)           : Model used for generation
+    tokenizer    (Tokenizer)              : Tokenizer used for generation
+    result       (WhisperGenerationResult): Generation result for one item of batch
+    segment_size (int)                    : Number of feature frames in item
+
+    Returns:
+    List of segments, None if result is silence or contains no text
+    '''
+    tokens = result.sequences_ids[0]
+    avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+    if result.no_speech_prob > 0.6 and avg_logprob < -1.0:
+        return None
+    if not any(token < tokenizer.eot for token in tokens):
+        return None
+
+    # pylint: disable-next=protected-access
+    subsegments, _, _ = model._split_segments_by_timestamps(
+        tokenizer=tokenizer,
+        tokens=tokens,
+        time_offset=0,
+        segment_size=segment_size,
+        segment_duration=segment_size * model.feature_extractor.time_per_frame,
+        seek=0
+    )
+    return subsegments
+
+
+def restore_word_timestamps(
+    tokenizer: Tokenizer,
+    subsegments: list[dict],
+    speech_map: SpeechTimestampsMap
+) -> list[TranscribedWord]:
+    '''
+    Extracts words from segments, mapping timestamps back to the original audio.
+    Word times are interpolated within segments that do not have word timestamps added.
+
+    Parameters:
+    tokenizer   (Tokenizer)          : Tokenizer used for generation
+    subsegments (list)               : Segments, optionally with word timestamps added
+    speech_map  (SpeechTimestampsMap): Map from speech only audio to original audio
+
+    Returns:
+    A list of transcribed words
+    '''
+    words = []
+    for subsegment in subsegments:
+        text = tokenizer.decode(subsegment['tokens'])
+        if subsegment['start'] == subsegment['end'] or not text.strip():
+            continue
+
+        if 'words' in subsegment:
+            timed_words = [
+                (word['word'], word['start'], word['end']) for word in subsegment['words']]
+        else:
+            timed_words = interpolate_words(text, subsegment['start'], subsegment['end'])
+
+        for word, start, end in timed_words:
+            chunk_index = speech_map.get_chunk_index((start + end) / 2)
+            words.append((
+                word,
+                speech_map.get_original_time(start, chunk_index),
+                speech_map.get_original_time(end, chunk_index)
+            ))
+    return words
+
+
+def set_detected_languages(
+    model: WhisperModel,
+    tokenizer: Tokenizer,
+    encoder_output: StorageView,
+    prompts: list[list[int]]
+) -> None:
+    '''
+    Detects language of each item in batch and sets language token of its prompt.
+
+    Parameters:
+    model           (WhisperModel): Multilingual model used for generation
+    tokenizer       (Tokenizer)   : Tokenizer used to create prompts
+    encoder_output  (StorageView) : Encoded batch
+    prompts         (list)        : Prompt for each item in batch, modified in place
+    '''
+    language_index = prompts[0].index(tokenizer.language)
+    for prompt, languages in zip(prompts, model.model.detect_language(encoder_output)):
+        prompt[language_index] = tokenizer.tokenizer.token_to_id(languages[0][0])
+
+
+def decode_words_batch(  # pylint: disable=too-many-locals
+    model: WhisperModel,
+    requests: list[TranscriptionRequest]
+) -> list[list[TranscribedWord]]:
+    '''
+    Transcribes audio segments from several sessions using a single batched encoder
+    and decoder pass. Each request keeps its own prompt. Blocks until transcription is done,
+    so it should be run on an inference executor.
+
+    Matches transcribe_words() except that temperature fallback is not used for batches.
+    All requests must have the same decode options. max_new_tokens is counted from the longest
+    prompt in the batch.
+    Words are only aligned for requests with word_timestamps set.
+    Requests with more than 30 seconds of speech are transcribed individually.
+    A single request is transcribed with transcribe_words() unless it has cached log mel frames.
+
+    Parameters:
+    model       (WhisperModel): Model to transcribe with
+    requests    (list)        : List of TranscriptionRequests
+
+    Returns:
+    A list of transcribed words for each request
+    '''
+    if len(requests) == 1 and requests[0][2] is None:
+        audio_segment, prev_text, _, speech_chunks, word_timestamps, decode_options = requests[0]
+        return [transcribe_words(
+            model, audio_segment, prev_text, speech_chunks, word_timestamps, decode_options)]
+
+    results: list[list[TranscribedWord]] = [[] for _ in requests]
+    beam_size, _, max_new_tokens = requests[0][5]
+    tokenizer = Tokenizer(
+        model.hf_tokenizer, model.model.is_multilingual, task='transcribe', language='en'
+    )
+
+    # (request index, features, speech map, prompt, word timestamps) for each request in batch
+    batch = []
+    for i, (audio_segment, prev_text, log_mel, speech_chunks, word_timestamps, decode_options) \
+            in enumerate(requests):
+        prepared = prepare_speech_features(model, audio_segment, log_mel, speech_chunks)
+        if prepared is None:
+            continue
+        if prepared[0].shape[-1] > model.feature_extractor.nb_max_frames:
+            results[i] = transcribe_words(
+                model, audio_segment, prev_text, speech_chunks, word_timestamps, decode_options)
+            continue
+        batch.append((
+            i,
+            *prepared,
+            model.get_prompt(tokenizer, tokenizer.encode(' ' + prev_text.strip())),
+            word_timestamps
+        ))
+
+    if not batch:
+        return results
+
+    encoder_output = model.encode(np.stack([pad_or_trim(item[1]) for item in batch]))
+
+    if model.model.is_multilingual:
+        set_detected_languages(model, tokenizer, encoder_output, [item[3] for item in batch])
+
+    max_length = model.max_length
+    if max_new_tokens:
+        max_length = min(max_length, max(len(item[3]) for item in batch) + max_new_tokens)
+
+    generated = model.model.generate(
+        encoder_output,
+        [item[3] for item in batch],
+        beam_size=beam_size,
+        patience=1,
+        max_length=max_length,
+        return_scores=True,
+        return_no_speech_prob=True,
+        suppress_blank=True,
+        suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+        max_initial_timestamp_index=int(round(1.0 / model.time_precision))
+    )
+
+    # Split generated tokens into segments, skipping silence the same way as transcribe() does
+    transcribed = []
+    for item, result in zip(batch, generated):
+        subsegments = split_generated_segments(model, tokenizer, result, item[1].shape[-1])
+        if subsegments is not None:
+            transcribed.append((item, subsegments))
+
+    aligned = [(item, subsegments) for item, subsegments in transcribed if item[4]]
+    if aligned:
+        # Word alignment needs text for every item in batch, re-encode if some were skipped
+        if len(aligned) < len(batch):
+            encoder_output = model.encode(
+                np.stack([pad_or_trim(item[1]) for item, _ in aligned]))
+
+        model.add_word_timestamps(
+            [subsegments for _, subsegments in aligned],
+            tokenizer,
+            encoder_output,
+            [item[1].shape[-1] for item, _ in aligned],
+            "\"'“¿([{-",
+            "\"'.。,，!！?？:：”)]}、",
+            0.0
+        )
+
+    for item, subsegments in transcribed:
+        results[item[0]] = restore_word_timestamps(tokenizer, subsegments, item[2])
+    return results
+
+
+def transcribe_words_batch(
+    model: WhisperModel,
+    requests: list[TranscriptionRequest]
+) -> list[list[TranscribedWord]]:
+    '''
+    Transcribes audio segments from several sessions, decoding requests with the same
+    decode options in a single batch with decode_words_batch(). Blocks until transcription
+    is done, so it should be run on an inference executor.
+
+    Parameters:
+    model       (WhisperModel): Model to transcribe with
+    requests    (list)        : List of TranscriptionRequests
+
+    Returns:
+    A list of transcribed words for each request
+    '''
+    request_groups: dict[DecodeOptions, list[int]] = {}
+    for i, request in enumerate(requests):
+        request_groups.setdefault(request[5], []).append(i)
+
+    results: list[list[TranscribedWord]] = [[] for _ in requests]
+    for indices in request_groups.values():
+        group_results = decode_words_batch(model, [requests[i] for i in indices])
+        for i, words in zip(indices, group_results):
+            results[i] = words
+    return results
+
+
+# Models loaded by this process when it is a worker of a process inference executor
+# or the model host
+_worker_models: dict[str, WhisperModel] = {}
+# Model host runs requests on threads, only load each model once
+_worker_models_lock = threading.Lock()
+
+
+def transcribe_words_batch_in_worker(
+    model_options: dict,
+    requests: list[TranscriptionRequest]
+) -> list[list[TranscribedWord]]:
+    '''
+    Same as transcribe_words_batch(), but loads model within the current process if needed.
+    Used with process inference executors and the model host, where the model cannot be sent
+    to the process running inference.
+
+    Parameters:
+    model_options   (dict): Options used to construct model
+    requests        (list): List of TranscriptionRequests. audio_segment may be a
+                            SharedArrayRef to audio in the session's shared buffer
+
+    Returns:
+    A list of transcribed words for each request
+    '''
+    key = model_pool_key(ModelImplementationId.FASTER_WHISPER, model_options)
+    with _worker_models_lock:
+        if key not in _worker_models:
+            _worker_models[key] = load_whisper_model(model_options)
+    return transcribe_words_batch(
+        _worker_models[key],
+        [
+            (resolve_shared_array(audio_segment), *request)
+            for audio_segment, *request in requests
+        ]
+    )
 
 
 class FasterWhisperModel(LocalAgreeModelBase):
     '''
     Implementation of TranscriptionModelBase using faster whisper and local agreement.
+
+    If draft_model is configured, e.g. tiny.en, it transcribes in progress text between
+    transcriptions by model, which confirms finalized text.
+
+    If cache_features is enabled and inference runs on threads, log mel frames of received
+    audio are computed once as it is buffered, instead of for every decode of the buffer.
+    Decodes using cached frames skip temperature fallback, like batched decodes.
+
+    If streaming_vad is enabled, VAD classifies received audio once as it is buffered, and its
+    speech chunks are passed to inference instead of running vad_filter on every decode.
+
+    Words are aligned to audio as set by timestamp_mode, see LocalAgreeModelBase. Otherwise
+    word times are interpolated within segments in proportion to word length.
+
+    decode_options sets beam_size, temperature_fallback, and max_new_tokens for each DecodeType.
+    Transcriptions that can only update in progress text, including draft transcriptions, use
+    in_progress options, e.g. greedy decoding without fallback to limit worst case latency.
+    Transcriptions that can commit text use commit options.
     '''
-    __slots__ = ['model']
+    __slots__ = ['model', 'draft_model']
 
     def __init__(self, ws, config):
         '''
@@ -20,19 +552,20 @@ class FasterWhisperModel(LocalAgreeModelBase):
 
         Parameters:
         ws  (WebSocket)                  : FastAPI websocket that requested the model
-        config (TranscriptionModelConfig): Custom JSON object containing configuration for model 
+        config (TranscriptionModelConfig): Custom JSON object containing configuration for model
                                            Defined by implementation
         '''
         super().__init__(ws, config)
         self.model = None
+        self.draft_model = None
 
     @staticmethod
     def validate_config(config):
         '''
         Should check if loaded JSON config is valid. Called model is instantiated.
         Throw an error if provided config is not valid
-        Remember to call valididate_config for any model_bases to ensure configuration 
-        for model_bases is checked as well. 
+        Remember to call valididate_config for any model_bases to ensure configuration
+        for model_bases is checked as well.
         e.g. if you use LocalAgreeModelBase: config = LocalAgreeModelBase.validate(config)
 
         Parameters:
@@ -42,52 +575,216 @@ class FasterWhisperModel(LocalAgreeModelBase):
         config (TranscriptionModelConfig): Validated config object
         '''
         config = LocalAgreeModelBase.validate_config(config)
+        if 'draft_model' in config:
+            config_dict_contains_str(config, 'draft_model', min_length=1)
+        config.setdefault('cache_features', False)
+        config_dict_contains_one_of(config, 'cache_features', [True, False])
+        config.setdefault('streaming_vad', False)
+        config_dict_contains_one_of(config, 'streaming_vad', [True, False])
+
+        config.setdefault('decode_options', {})
+        config_dict_contains_dict(config, 'decode_options')
+        for decode_type in DecodeType:
+            config['decode_options'].setdefault(decode_type, {})
+            config_dict_contains_dict(config['decode_options'], decode_type)
+            options = config['decode_options'][decode_type]
+            options.setdefault('beam_size', DEFAULT_DECODE_OPTIONS[0])
+            config_dict_contains_int(options, 'beam_size', minimum=1)
+            options.setdefault('temperature_fallback', DEFAULT_DECODE_OPTIONS[1])
+            config_dict_contains_one_of(options, 'temperature_fallback', [True, False])
+            options.setdefault('max_new_tokens', DEFAULT_DECODE_OPTIONS[2])
+            config_dict_contains_int(options, 'max_new_tokens', minimum=0, maximum=MAX_NEW_TOKENS)
         return config
 
+    def model_options(self, draft: bool = False) -> dict:
+        '''
+        Parameters:
+        draft   (bool): Get options for draft model instead
+
+        Returns:
+        Options used to construct the WhisperModel for this configuration
+        '''
+        # Model host runs inferences for a model on threads sharing one loaded model
+        uses_threads = self.config['inference_executor'] != InferenceExecutorKind.PROCESS
+        return {
+            'model': self.config['draft_model'] if draft else self.config['model'],
+            'device': self.config['device'],
+            # Allow concurrent decodes from executor threads to run in parallel
+            'num_workers': self.config['inference_concurrency'] if uses_threads else 1
+        }
+
+    def decode_options(self, audio_segment: npt.NDArray, draft: bool = False) -> DecodeOptions:
+        '''
+        Parameters:
+        audio_segment   (1D numpy array): Audio segment about to be transcribed
+        draft           (bool)          : If audio_segment is transcribed by the draft model
+
+        Returns:
+        Configured decode options for the type of transcription
+        '''
+        decode_type = DecodeType.IN_PROGRESS
+        if self.can_commit(audio_segment, draft):
+            decode_type = DecodeType.COMMIT
+        options = self.config['decode_options'][decode_type]
+        return (options['beam_size'], options['temperature_fallback'], options['max_new_tokens'])
+
+    def shared_model_key(self, draft: bool = False):
+        '''
+        Parameters:
+        draft   (bool): Get key of draft model instead
+
+        Returns:
+        Key identifying loaded WhisperModel and its inference executor
+        '''
+        return model_pool_key(ModelImplementationId.FASTER_WHISPER, self.model_options(draft))
+
     def load_model(self):
         '''
-        Loads model into memory to be ready for transcription.
-        Called when websocket connects.
+        Acquires a reference to the shared model, loading it into memory if needed.
+        When using a process inference executor or model host, the model is loaded by the
+        process running inference. Called when websocket connects.
         '''
-        self.model = WhisperModel(
-            self.config['model'],
-            device=self.config['device']
+        if self.config['streaming_vad']:
+            self.vad = StreamingVad(self.max_segment_samples)
+
+        if self.config['inference_executor'] != InferenceExecutorKind.THREAD:
+            return
+
+        model_options = self.model_options()
+        self.model = MODEL_POOL.acquire(
+            self.shared_model_key(),
+            lambda: load_whisper_model(model_options),
+            FasterWhisperModel.free_model
         )
+        if 'draft_model' in self.config:
+            draft_model_options = self.model_options(draft=True)
+            self.draft_model = MODEL_POOL.acquire(
+                self.shared_model_key(draft=True),
+                lambda: load_whisper_model(draft_model_options),
+                FasterWhisperModel.free_model
+            )
+
+        if self.config['cache_features']:
+            feature_extractor = self.model.feature_extractor
+            self.feature_cache = MelFeatureCache(
+                feature_extractor.mel_filters,
+                self.max_segment_samples,
+                feature_extractor.n_fft,
+                feature_extractor.hop_length
+            )
 
     def unload_model(self):
         '''
-        Unloads model from memory and cleans up.
+        Releases reference to the shared model. The model pool unloads it once idle.
         Called when websocket disconnects.
         '''
-        if self.model and self.model.model.model_is_loaded:
-            self.model.model.unload_model()
+        self.remove_from_load_monitor()
+        if self.model:
+            self.model = None
+            MODEL_POOL.release(self.shared_model_key())
+        if self.draft_model:
+            self.draft_model = None
+            MODEL_POOL.release(self.shared_model_key(draft=True))
+
+    @staticmethod
+    def free_model(model: WhisperModel) -> None:
+        '''
+        Unloads model weights from memory. Called by the model pool once model is idle.
+
+        Parameters:
+        model (WhisperModel): Model to unload
+        '''
+        if model.model.model_is_loaded:
+            model.model.unload_model()
 
     async def transcribe_audio(self, audio_segment, prev_text):
         '''
-        Transcribes audio into TranscriptionSegments containing text, start, and end times
+        Transcribes audio into TranscriptionSegments containing text, start, and end times.
+        Transcription runs on the model's inference executor, batched with other sessions
+        using the same model if max_batch_size is greater than 1.
 
         Parameters:
         audio_segment   (1D numpy array):
-            Contains float16 audio normalized to [-1, 1] at 16k sample rate.
+            Contains float32 audio normalized to [-1, 1] at 16k sample rate.
 
         prev_text       (str):
-            The previously finalized text that occurred before the current audio_segment. 
+            The previously finalized text that occurred before the current audio_segment.
             Used to precondition model for accuracy.
 
         Returns:
         A list of TranscriptionSegments
         '''
-        transcription, _ = self.model.transcribe(
-            audio_segment,
-            initial_prompt=prev_text,
-            word_timestamps=True,
-            vad_filter=True
-        )
-
-        segments = []
-        for part in transcription:
-            for word in part.words:
-                segments.append(
-                    TranscriptionSegment(word.word, word.start, word.end)
+        speech_chunks = await self.speech_timestamps(audio_segment)
+        if self.config['inference_executor'] != InferenceExecutorKind.THREAD:
+            words = await self.run_batched_inference(
+                transcribe_words_batch_in_worker,
+                self.model_options(),
+                (
+                    self.inference_audio(audio_segment),
+                    prev_text,
+                    None,
+                    speech_chunks,
+                    self.needs_word_timestamps(audio_segment),
+                    self.decode_options(audio_segment)
+                )
+            )
+        else:
+            words = await self.run_batched_inference(
+                transcribe_words_batch,
+                self.model,
+                (
+                    audio_segment,
+                    prev_text,
+                    self.log_mel_frames(audio_segment),
+                    speech_chunks,
+                    self.needs_word_timestamps(audio_segment),
+                    self.decode_options(audio_segment)
                 )
-        return segments
+            )
+
+        return [TranscriptionSegment(text, start, end) for text, start, end in words]
+
+    async def transcribe_draft_audio(self, audio_segment, prev_text):
+        '''
+        Transcribes audio with draft model. Draft transcriptions are not batched, but run on
+        the same inference executor as model so they are limited by inference_concurrency.
+
+        Parameters:
+        audio_segment   (1D numpy array):
+            Contains float32 audio normalized to [-1, 1] at 16k sample rate.
+
+        prev_text       (str):
+            The previously finalized text that occurred before the current audio_segment.
+
+        Returns:
+        A list of TranscriptionSegments, None if draft_model is not configured
+        '''
+        if 'draft_model' not in self.config:
+            return None
+
+        speech_chunks = await self.speech_timestamps(audio_segment)
+        if self.config['inference_executor'] != InferenceExecutorKind.THREAD:
+            words = (await self.run_inference(
+                transcribe_words_batch_in_worker,
+                self.model_options(draft=True),
+                [(
+                    self.inference_audio(audio_segment),
+                    prev_text,
+                    None,
+                    speech_chunks,
+                    self.needs_word_timestamps(audio_segment, draft=True),
+                    self.decode_options(audio_segment, draft=True)
+                )]
+            ))[0]
+        else:
+            words = await self.run_inference(
+                transcribe_words,
+                self.draft_model,
+                audio_segment,
+                prev_text,
+                speech_chunks,
+                self.needs_word_timestamps(audio_segment, draft=True),
+                self.decode_options(audio_segment, draft=True)
+            )
+
+        return [TranscriptionSegment(text, start, end) for text, start, end in words]
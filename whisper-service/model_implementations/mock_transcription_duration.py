@@ -4,8 +4,8 @@ Mock implementation of TranscriptionModelBase that returns duration of received
 Classes:
     MockTranscribeDuration
 '''
-import wave
 from model_bases.transcription_model_base import TranscriptionModelBase
+from utils.decode_wav import decode_pcm16
 
 
 class MockTranscribeDuration(TranscriptionModelBase):
@@ -51,13 +51,9 @@ class MockTranscribeDuration(TranscriptionModelBase):
         Generates final transcription blocks containing duration of audio received.
 
         Parameters:
-        audio_chunk   (io.BytesIO): A buffer containing wav audio
+        audio_chunk   (io.BytesIO): A buffer containing wav or headerless pcm audio
         '''
-        infofile = wave.open(audio_chunk, 'r')
-        frames = infofile.getnframes()
-        rate = infofile.getframerate()
-
-        duration = frames / float(rate)
+        duration = len(decode_pcm16(audio_chunk)) / 16_000
 
         start = self.time
         self.time += duration
@@ -6,12 +6,21 @@ Functions:
     create_server
 '''
 # pylint: disable=too-many-arguments,too-many-positional-arguments
-import io
 from typing import Callable, Type, Literal
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import anyio
+from fastapi import FastAPI, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 from model_bases.transcription_model_base import TranscriptionModelBase
-from custom_types.config_types import AppConfig, DeviceConfig, ModelImplementationId
-from custom_types.model_selection_types import SelectionOptions, SelectedOption
+from custom_types.config_types import \
+    AppConfig, DeviceConfig, ModelImplementationId, ModelReadiness
+from custom_types.model_selection_types import \
+    AudioFormat, SelectionOptions, SelectedOption, TranscriptFormat
+from server.helpers.ingest_audio import ingest_audio
+from utils.audio_decoder import create_audio_decoder
+from utils.metrics import ACTIVE_SESSIONS, METRICS
+from utils.model_warmer import MODEL_WARMER
+from utils.transcript_encoder import create_transcript_encoder
 
 
 def create_server(
@@ -59,6 +68,9 @@ def create_server(
             return await websocket.close()
 
         model_key = selected_option['model_key']
+        audio_decoder = create_audio_decoder(
+            selected_option.get('audio_format', AudioFormat.WAV)
+        )
 
         # Create and setup requested model
         model_config = device_config[model_key]
@@ -69,22 +81,53 @@ def create_server(
             websocket,
             model_config['implementation_configuration']
         )
-        transcription_model.load_model()
+        transcription_model.set_transcript_encoder(create_transcript_encoder(
+            selected_option.get('transcript_format', TranscriptFormat.JSON),
+            selected_option.get('in_progress_deltas', False)
+        ))
+        transcription_model.set_min_in_progress_interval(
+            config['IN_PROGRESS_MIN_INTERVAL_MS'] / 1000)
+        # Loading can take a while, keep event loop free for other websockets
+        await run_in_threadpool(transcription_model.load_model)
+        ACTIVE_SESSIONS.inc(labels=(model_key,))
 
         # Send any audio chunks to transcription model
-        while True:
-            try:
-                data = await websocket.receive_bytes()
-                await transcription_model.queue_audio_chunk(io.BytesIO(data))
-            except WebSocketDisconnect:
-                transcription_model.unload_model()
-                return
+        try:
+            await ingest_audio(websocket, transcription_model, audio_decoder, config)
+        finally:
+            # Always free model, even if handler is cancelled while finishing queued audio
+            with anyio.CancelScope(shield=True):
+                ACTIVE_SESSIONS.dec(labels=(model_key,))
+                transcription_model.cancel_pending_in_progress_block()
+                await run_in_threadpool(transcription_model.unload_model)
 
     @fastapi_app.get("/healthcheck")
     def healthcheck():
         '''
-        Simple healthcheck endpoint to see if server is alive
+        Simple healthcheck endpoint to see if server is alive.
+        Reports warming until pinned models are loaded, or failed if one could not be loaded.
         '''
+        status = MODEL_WARMER.status()
+        if status != ModelReadiness.READY:
+            return JSONResponse(status, status_code=503)
         return 'ok'
 
+    @fastapi_app.get("/readiness")
+    def readiness():
+        '''
+        Startup state of each configured model
+        '''
+        return MODEL_WARMER.readiness()
+
+    @fastapi_app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        '''
+        Metrics in the Prometheus text exposition format.
+        Metrics are only formatted when this endpoint is scraped.
+        '''
+        return PlainTextResponse(
+            METRICS.render(),
+            media_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
     return fastapi_app
@@ -7,8 +7,11 @@ from pytest_mock import MockerFixture
 from fastapi import WebSocket
 from fastapi.testclient import TestClient
 from app_config.load_config import AppConfig
+from custom_types.config_types import IngestOverflowPolicy, ModelReadiness
 from model_bases.transcription_model_base import TranscriptionModelBase
 from server.create_server import create_server
+from utils.model_warmer import ModelWarmer
+from utils.transcript_encoder import BinaryTranscriptEncoder
 
 
 # Load some test files to send through websocket
@@ -36,6 +39,12 @@ fake_config['API_KEY'] = 'SOME_API_KEY'
 fake_config['LOG_LEVEL'] = 'info'
 fake_config['PORT'] = -1
 fake_config['HOST'] = '127.0.0.1'
+fake_config['MODEL_IDLE_TTL_SEC'] = 0
+fake_config['INGEST_QUEUE_SIZE'] = 16
+fake_config['INGEST_OVERFLOW_POLICY'] = IngestOverflowPolicy.COALESCE
+fake_config['INGEST_LOAD_SIGNAL_SEC'] = 3
+fake_config['INGEST_MAX_BACKLOG_SEC'] = 30
+fake_config['IN_PROGRESS_MIN_INTERVAL_MS'] = 0
 
 fake_device_config = {
     'model_key_1': {
@@ -155,3 +164,125 @@ def test_queues_audio_chunks(mocker: MockerFixture,):
     for i, data in enumerate(wav_data):
         assert queue_spy.call_args_list[i].args[1].getvalue() == data, \
             "Correct data transferred"
+
+
+def test_decodes_negotiated_audio_format(mocker: MockerFixture,):
+    '''
+    Test that websocket handler decodes audio frames using the selected audio format
+    '''
+    queue_spy = mocker.spy(FakeModelImplementation, 'queue_audio_chunk')
+
+    async def select_pcm_model(*args):
+        return {
+            'model_key': 'model_key_1',
+            'feature_selection': {},
+            'audio_format': 'pcm_s16le'
+        }
+
+    app = create_server(
+        fake_config,
+        fake_device_config,
+        fake_selection_options,
+        import_fun,
+        auth_fun,
+        select_pcm_model
+    )
+    test_client = TestClient(app)
+
+    with test_client.websocket_connect("/sourcesink") as websocket:
+        websocket.send_bytes(b'\x01\x02\x03\x04')
+
+    assert queue_spy.call_count == 1
+    assert queue_spy.call_args_list[0].args[1].getvalue() == b'\x01\x02\x03\x04', \
+        "Pcm frame passed through"
+
+
+def test_encodes_negotiated_transcript_format(mocker: MockerFixture,):
+    '''
+    Test that transcript blocks are sent using the selected transcript format
+    '''
+    async def send_in_progress(self, audio_chunk):
+        await self.on_in_progress_transcript_block('Hello', 0.0, 1.0)
+        await self.on_in_progress_transcript_block('Hello world', 0.0, 2.0)
+
+    mocker.patch.object(FakeModelImplementation, 'queue_audio_chunk', send_in_progress)
+
+    async def select_binary_model(*args):
+        return {
+            'model_key': 'model_key_1',
+            'feature_selection': {},
+            'transcript_format': 'binary',
+            'in_progress_deltas': True
+        }
+
+    app = create_server(
+        fake_config,
+        fake_device_config,
+        fake_selection_options,
+        import_fun,
+        auth_fun,
+        select_binary_model
+    )
+    test_client = TestClient(app)
+
+    with test_client.websocket_connect("/sourcesink") as websocket:
+        websocket.send_bytes(wav_data[0])
+        first = websocket.receive_bytes()
+        second = websocket.receive_bytes()
+
+    header_size = BinaryTranscriptEncoder.HEADER.size
+    assert BinaryTranscriptEncoder.HEADER.unpack(first[:header_size]) == (1, 0, 0.0, 1.0)
+    assert first[header_size:] == b'Hello', 'First block contains full text'
+    assert BinaryTranscriptEncoder.HEADER.unpack(second[:header_size]) == (1, 5, 0.0, 2.0)
+    assert second[header_size:] == b' world', 'Second block only contains new text'
+
+
+def test_metrics_endpoint():
+    '''
+    Test that metrics endpoint reports active sessions
+    '''
+    app = create_server(
+        fake_config,
+        fake_device_config,
+        fake_selection_options,
+        import_fun,
+        auth_fun,
+        select_model
+    )
+    test_client = TestClient(app)
+
+    with test_client.websocket_connect("/sourcesink") as websocket:
+        websocket.send_bytes(wav_data[0])
+        metrics = test_client.get('/metrics')
+
+    assert metrics.status_code == 200
+    assert metrics.headers['content-type'].startswith('text/plain')
+    assert 'whisper_active_sessions{model_key="model_key_1"} 1.0' in metrics.text
+
+    assert 'whisper_active_sessions{model_key="model_key_1"} 0.0' in \
+        test_client.get('/metrics').text, 'Session removed once websocket closes'
+
+
+def test_healthcheck_reports_warming(mocker: MockerFixture):
+    '''
+    Test that healthcheck reports warming until pinned models are loaded
+    '''
+    status = mocker.patch.object(ModelWarmer, 'status', return_value=ModelReadiness.WARMING)
+    app = create_server(
+        fake_config,
+        fake_device_config,
+        fake_selection_options,
+        import_fun,
+        auth_fun,
+        select_model
+    )
+    test_client = TestClient(app)
+
+    response = test_client.get('/healthcheck')
+    assert response.status_code == 503
+    assert response.json() == 'warming'
+
+    status.return_value = ModelReadiness.READY
+    response = test_client.get('/healthcheck')
+    assert response.status_code == 200
+    assert response.json() == 'ok'
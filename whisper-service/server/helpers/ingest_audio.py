@@ -0,0 +1,261 @@
+'''
+Helpers to decouple receiving audio from a websocket from transcribing it
+
+Classes:
+    AudioIngestQueue
+
+Functions:
+    ingest_audio
+'''
+import asyncio
+import collections
+import io
+import logging
+from fastapi import WebSocket, WebSocketDisconnect
+from model_bases.transcription_model_base import TranscriptionModelBase
+from custom_types.config_types import AppConfig, IngestOverflowPolicy
+from custom_types.transcription_types import BackendLoadSignal
+from utils.audio_decoder import AudioDecoder
+from utils.decode_wav import decode_pcm16
+
+SAMPLE_RATE = 16_000
+
+
+class AudioIngestQueue:  # pylint: disable=too-many-instance-attributes
+    '''
+    Bounded queue of audio chunks received by a session but not yet passed to its model.
+
+    When the queue is full, the overflow policy decides what happens to a new chunk:
+        drop_oldest      : The oldest queued chunk is dropped
+        coalesce         : Queued chunks and the new chunk are merged into a single headerless
+                           pcm chunk, so the model handles the backlog in one
+                           queue_audio_chunk() call
+        skip_in_progress : skip_in_progress is set until the queue drains and the new chunk
+                           waits for room in the queue
+
+    The queue is also full once it holds max_samples samples. With drop_oldest and coalesce,
+    the oldest queued samples are dropped to make room for the new chunk.
+    '''
+    __slots__ = ['max_chunks', 'max_samples', 'policy', 'chunks', 'merged_chunk',
+                 'backlog_samples', 'dropped_samples', 'skip_in_progress', 'closed', 'changed']
+
+    def __init__(self, max_chunks: int, max_samples: int, policy: IngestOverflowPolicy):
+        '''
+        Parameters:
+        max_chunks  (int)                 : Maximum number of chunks to queue
+        max_samples (int)                 : Maximum number of samples to queue. A single chunk
+                                            longer than this is still queued
+        policy      (IngestOverflowPolicy): What to do with new chunks when queue is full
+        '''
+        self.max_chunks = max_chunks
+        self.max_samples = max_samples
+        self.policy = policy
+
+        self.chunks: collections.deque[tuple[io.BytesIO, int]] = collections.deque()
+        # Chunk at head of queue created by coalescing, extended by later coalescing
+        self.merged_chunk: io.BytesIO | None = None
+        self.backlog_samples = 0
+        self.dropped_samples = 0
+        self.skip_in_progress = False
+        self.closed = False
+        self.changed = asyncio.Event()
+
+    async def put(self, audio_chunk: io.BytesIO) -> None:
+        '''
+        Adds an audio chunk to the queue, applying overflow policy if queue is full.
+
+        Parameters:
+        audio_chunk (io.BytesIO): Buffer containing wav or headerless pcm audio
+        '''
+        num_samples = len(decode_pcm16(audio_chunk))
+
+        if self.policy == IngestOverflowPolicy.SKIP_IN_PROGRESS:
+            while self.chunks and (
+                len(self.chunks) >= self.max_chunks or
+                self.backlog_samples + num_samples > self.max_samples
+            ):
+                self.skip_in_progress = True
+                await self.wait_for_change()
+        else:
+            self.drop_samples(self.backlog_samples + num_samples - self.max_samples)
+            if len(self.chunks) >= self.max_chunks:
+                if self.policy == IngestOverflowPolicy.COALESCE:
+                    self.coalesce(audio_chunk, num_samples)
+                    return
+                self.drop_samples(self.chunks[0][1])
+
+        self.chunks.append((audio_chunk, num_samples))
+        self.backlog_samples += num_samples
+        self.changed.set()
+
+    def drop_samples(self, num_samples: int) -> None:
+        '''
+        Drops the oldest queued samples. A partially dropped chunk is replaced by a headerless
+        pcm chunk of its remaining samples.
+
+        Parameters:
+        num_samples (int): Number of samples to drop, nothing is dropped if not positive
+        '''
+        while num_samples > 0 and self.chunks:
+            audio_chunk, chunk_samples = self.chunks.popleft()
+            dropped_samples = min(num_samples, chunk_samples)
+            if dropped_samples < chunk_samples:
+                self.chunks.appendleft((
+                    io.BytesIO(decode_pcm16(audio_chunk)[dropped_samples:].tobytes()),
+                    chunk_samples - dropped_samples
+                ))
+            num_samples -= dropped_samples
+            self.backlog_samples -= dropped_samples
+            self.dropped_samples += dropped_samples
+
+    def coalesce(self, audio_chunk: io.BytesIO, num_samples: int) -> None:
+        '''
+        Merges queued chunks and a new chunk into a single headerless pcm chunk. If the queue
+        starts with a chunk merged earlier, the other chunks are appended to it, so its samples
+        are not copied again.
+
+        Parameters:
+        audio_chunk (io.BytesIO): New chunk
+        num_samples (int)       : Number of samples in new chunk
+        '''
+        chunks = [chunk for chunk, _ in self.chunks] + [audio_chunk]
+        if chunks[0] is self.merged_chunk:
+            merged_chunk = chunks.pop(0)
+            merged_chunk.seek(0, io.SEEK_END)
+        else:
+            merged_chunk = io.BytesIO()
+        for chunk in chunks:
+            merged_chunk.write(decode_pcm16(chunk).tobytes())
+        merged_chunk.seek(0)
+
+        self.backlog_samples += num_samples
+        self.chunks = collections.deque([(merged_chunk, self.backlog_samples)])
+        self.merged_chunk = merged_chunk
+        self.changed.set()
+
+    async def get(self) -> io.BytesIO | None:
+        '''
+        Removes the oldest audio chunk from the queue, waiting for one if queue is empty.
+
+        Returns:
+        Oldest audio chunk, None if queue is closed and empty
+        '''
+        while not self.chunks:
+            # Consumer has caught up with the backlog
+            self.skip_in_progress = False
+            if self.closed:
+                return None
+            await self.wait_for_change()
+
+        audio_chunk, num_samples = self.chunks.popleft()
+        self.backlog_samples -= num_samples
+        self.changed.set()
+        return audio_chunk
+
+    def close(self) -> None:
+        '''
+        Marks that no more chunks will be added. Queued chunks can still be retrieved.
+        '''
+        self.closed = True
+        self.changed.set()
+
+    async def wait_for_change(self) -> None:
+        '''
+        Waits until a chunk is added or removed, or the queue is closed.
+        '''
+        self.changed.clear()
+        await self.changed.wait()
+
+    def backlog_sec(self) -> float:
+        '''
+        Returns:
+        Seconds of audio waiting in queue
+        '''
+        return self.backlog_samples / SAMPLE_RATE
+
+
+async def ingest_audio(
+    websocket: WebSocket,
+    transcription_model: TranscriptionModelBase,
+    audio_decoder: AudioDecoder,
+    config: AppConfig
+) -> None:
+    '''
+    Receives audio from websocket and passes it to transcription model until websocket closes.
+
+    A reader task receives and decodes frames into a bounded AudioIngestQueue while a consumer
+    task passes queued chunks to the model, so a slow model does not stop the websocket from
+    being read. At most INGEST_QUEUE_SIZE chunks and INGEST_MAX_BACKLOG_SEC seconds of audio
+    are queued. The source is sent a BackendLoadSignal once the queued audio exceeds
+    INGEST_LOAD_SIGNAL_SEC and again once the backlog has dropped below half of that.
+
+    Parameters:
+    websocket           (WebSocket)             : Websocket sending audio
+    transcription_model (TranscriptionModelBase): Loaded model to pass audio to
+    audio_decoder       (AudioDecoder)          : Decoder for websocket's audio format
+    config              (AppConfig)             : Application configuration object
+    '''
+    logger = logging.getLogger('uvicorn.error')
+    ingest_queue = AudioIngestQueue(
+        config['INGEST_QUEUE_SIZE'],
+        int(config['INGEST_MAX_BACKLOG_SEC'] * SAMPLE_RATE),
+        config['INGEST_OVERFLOW_POLICY']
+    )
+    load_signal_sec = config['INGEST_LOAD_SIGNAL_SEC']
+
+    async def send_load_signal(behind_real_time: bool) -> None:
+        load_signal: BackendLoadSignal = {
+            'behind_real_time': behind_real_time,
+            'backlog_sec': ingest_queue.backlog_sec(),
+            'dropped_sec': ingest_queue.dropped_samples / SAMPLE_RATE
+        }
+        logger.info('Ingest load signal: %s', load_signal)
+        await websocket.send_json(load_signal)
+
+    async def read_audio() -> None:
+        behind_real_time = False
+        while True:
+            try:
+                data = await websocket.receive_bytes()
+            except WebSocketDisconnect:
+                return
+
+            audio_chunk = audio_decoder.decode(data)
+            if audio_chunk is not None:
+                await ingest_queue.put(audio_chunk)
+
+            backlog_sec = ingest_queue.backlog_sec()
+            if not behind_real_time and backlog_sec > load_signal_sec:
+                behind_real_time = True
+                await send_load_signal(True)
+            elif behind_real_time and backlog_sec < load_signal_sec / 2:
+                behind_real_time = False
+                await send_load_signal(False)
+
+    async def consume_audio() -> None:
+        while (audio_chunk := await ingest_queue.get()) is not None:
+            transcription_model.set_under_load(ingest_queue.skip_in_progress)
+            await transcription_model.queue_audio_chunk(audio_chunk)
+
+    reader = asyncio.create_task(read_audio())
+    consumer = asyncio.create_task(consume_audio())
+    try:
+        await asyncio.wait([reader, consumer], return_when=asyncio.FIRST_COMPLETED)
+
+        if consumer.done():
+            # Transcription failed, stop reading audio and raise error
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            consumer.result()
+            return
+
+        # Finish transcribing audio received before websocket closed
+        ingest_queue.close()
+        try:
+            await consumer
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.info('Could not finish transcribing audio received before websocket closed')
+        reader.result()
+    finally:
+        reader.cancel()
+        consumer.cancel()
@@ -0,0 +1,133 @@
+'''
+Unit tests for AudioIngestQueue
+'''
+import asyncio
+import io
+import numpy as np
+import pytest
+from custom_types.config_types import IngestOverflowPolicy
+from server.helpers.ingest_audio import AudioIngestQueue
+from utils.decode_wav import decode_pcm16
+
+# Backlog limit that is never reached by tests of chunk count limit
+MAX_SAMPLES = 160_000
+
+
+def make_chunk(value: int, num_samples: int = 1_600) -> io.BytesIO:
+    '''
+    Creates a headerless pcm chunk where every sample is value.
+    '''
+    return io.BytesIO(np.full(num_samples, value, dtype='<i2').tobytes())
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest():
+    '''
+    Test that oldest chunks are dropped when queue is full
+    '''
+    queue = AudioIngestQueue(2, MAX_SAMPLES, IngestOverflowPolicy.DROP_OLDEST)
+
+    for value in range(4):
+        await queue.put(make_chunk(value))
+
+    assert queue.dropped_samples == 3_200
+    assert queue.backlog_sec() == pytest.approx(0.2)
+    assert decode_pcm16(await queue.get())[0] == 2
+    assert decode_pcm16(await queue.get())[0] == 3
+
+
+@pytest.mark.asyncio
+async def test_coalesce():
+    '''
+    Test that queued chunks and the new chunk are merged in order when queue is full,
+    extending the merged chunk when queue is full again
+    '''
+    queue = AudioIngestQueue(2, MAX_SAMPLES, IngestOverflowPolicy.COALESCE)
+
+    for value in range(3):
+        await queue.put(make_chunk(value))
+    assert len(queue.chunks) == 1, 'New chunk merged'
+
+    await queue.put(make_chunk(3))
+    await queue.put(make_chunk(4))
+
+    assert queue.dropped_samples == 0
+    assert queue.backlog_sec() == pytest.approx(0.5)
+    np.testing.assert_array_equal(
+        decode_pcm16(await queue.get()), np.repeat(np.arange(5, dtype='<i2'), 1_600))
+    assert queue.backlog_samples == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesce_single_chunk_queue():
+    '''
+    Test that coalescing does not wait for room when queue only holds one chunk
+    '''
+    queue = AudioIngestQueue(1, MAX_SAMPLES, IngestOverflowPolicy.COALESCE)
+
+    for value in range(3):
+        await asyncio.wait_for(queue.put(make_chunk(value)), timeout=1)
+
+    np.testing.assert_array_equal(
+        decode_pcm16(await queue.get()), np.repeat(np.arange(3, dtype='<i2'), 1_600))
+
+
+@pytest.mark.parametrize('policy', [IngestOverflowPolicy.DROP_OLDEST,
+                                    IngestOverflowPolicy.COALESCE])
+@pytest.mark.asyncio
+async def test_max_samples(policy):
+    '''
+    Test that oldest samples are dropped once queue holds max_samples samples
+    '''
+    queue = AudioIngestQueue(16, 4_000, policy)
+
+    for value in range(3):
+        await queue.put(make_chunk(value))
+
+    assert queue.dropped_samples == 800
+    assert queue.backlog_samples == 4_000
+    remaining = decode_pcm16(await queue.get())
+    assert len(remaining) == 800 and remaining[0] == 0, 'Oldest chunk partially dropped'
+
+
+@pytest.mark.asyncio
+async def test_skip_in_progress():
+    '''
+    Test that put waits for room and skip_in_progress is set until queue drains
+    '''
+    queue = AudioIngestQueue(1, MAX_SAMPLES, IngestOverflowPolicy.SKIP_IN_PROGRESS)
+    await queue.put(make_chunk(0))
+
+    blocked_put = asyncio.create_task(queue.put(make_chunk(1)))
+    await asyncio.sleep(0)
+    assert not blocked_put.done()
+    assert queue.skip_in_progress
+
+    assert decode_pcm16(await queue.get())[0] == 0
+    await blocked_put
+    assert queue.skip_in_progress
+
+    assert decode_pcm16(await queue.get())[0] == 1
+    assert queue.skip_in_progress
+
+    queue.close()
+    assert await queue.get() is None
+    assert not queue.skip_in_progress
+
+
+@pytest.mark.asyncio
+async def test_close():
+    '''
+    Test that queued chunks can be retrieved after close, then get returns None
+    '''
+    queue = AudioIngestQueue(2, MAX_SAMPLES, IngestOverflowPolicy.COALESCE)
+    waiting_get = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+
+    await queue.put(make_chunk(0))
+    await queue.put(make_chunk(1))
+    queue.close()
+
+    assert decode_pcm16(await waiting_get)[0] == 0
+    assert decode_pcm16(await queue.get())[0] == 1
+    assert await queue.get() is None
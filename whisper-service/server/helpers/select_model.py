@@ -10,11 +10,12 @@ import logging
 from typing import Literal
 from fastapi import WebSocket, WebSocketDisconnect
 from custom_types.config_types import DeviceConfig
-from custom_types.model_selection_types import SelectionOptions, SelectedOption
+from custom_types.model_selection_types import \
+    AudioFormat, SelectionOptions, SelectedOption, TranscriptFormat
 from server.helpers.receive_json_timeout import receive_json_timeout
 
 
-async def select_model(
+async def select_model(  # pylint: disable=too-many-return-statements
     websocket: WebSocket,
     device_config: DeviceConfig,
     selection_options: SelectionOptions
@@ -28,7 +29,9 @@ async def select_model(
     selection_options (SelectionOptions): Available selection options to send to frontend
 
     Returns:
-    SelectOption is successfully parsed selection, False otherwise
+    SelectOption is successfully parsed selection, False otherwise.
+    audio_format defaults to wav, transcript_format defaults to json, and in_progress_deltas
+    defaults to False if not selected.
     '''
     logger = logging.getLogger('uvicorn.error')
 
@@ -72,4 +75,31 @@ async def select_model(
         })
         return False
 
+    model_selection.setdefault('audio_format', AudioFormat.WAV)
+    if model_selection['audio_format'] not in list(AudioFormat):
+        logger.info('Model Selection Failed: Invalid audio_format provided')
+        await websocket.send_json({
+            'error': True,
+            'msg': 'Model Selection Failed: Invalid audio_format provided'
+        })
+        return False
+
+    model_selection.setdefault('transcript_format', TranscriptFormat.JSON)
+    if model_selection['transcript_format'] not in list(TranscriptFormat):
+        logger.info('Model Selection Failed: Invalid transcript_format provided')
+        await websocket.send_json({
+            'error': True,
+            'msg': 'Model Selection Failed: Invalid transcript_format provided'
+        })
+        return False
+
+    model_selection.setdefault('in_progress_deltas', False)
+    if not isinstance(model_selection['in_progress_deltas'], bool):
+        logger.info('Model Selection Failed: Invalid in_progress_deltas provided')
+        await websocket.send_json({
+            'error': True,
+            'msg': 'Model Selection Failed: Invalid in_progress_deltas provided'
+        })
+        return False
+
     return model_selection
@@ -0,0 +1,103 @@
+'''
+Transcription history used to find the prefix that recent transcriptions agree on
+
+Classes:
+    AgreementHistory
+'''
+from collections import deque
+import numpy as np
+import numpy.typing as npt
+
+
+class AgreementHistory:
+    '''
+    Holds the last size transcriptions as arrays of integer token ids, so the prefix a new
+    transcription shares with all of them is found with one vectorized comparison instead of
+    comparing strings segment by segment.
+
+    Segment texts are interned into token ids per session by encode(). Ids are only compared
+    for equality, so any text can be encoded, e.g. words returned by a model.
+    '''
+    __slots__ = ['vocabulary', 'transcriptions']
+
+    def __init__(self, size: int):
+        '''
+        Parameters:
+        size    (int): Number of previous transcriptions a new transcription must agree with
+        '''
+        self.vocabulary: dict[str, int] = {}
+        self.transcriptions: deque[npt.NDArray[np.int32]] = deque(maxlen=size)
+
+    def encode(self, texts: list[str]) -> npt.NDArray[np.int32]:
+        '''
+        Parameters:
+        texts   (list[str]): Text of each segment of a transcription
+
+        Returns:
+        Token id of each segment, equal texts have equal ids
+        '''
+        vocabulary = self.vocabulary
+        return np.fromiter(
+            (vocabulary.setdefault(text, len(vocabulary)) for text in texts),
+            dtype=np.int32,
+            count=len(texts)
+        )
+
+    def agreed_prefix_length(self, token_ids: npt.NDArray[np.int32]) -> int:
+        '''
+        Parameters:
+        token_ids   (numpy array): Token ids of new transcription
+
+        Returns:
+        Number of leading tokens that match every previous transcription.
+        0 if there are not enough previous transcriptions to form agreement yet.
+        '''
+        if not self.is_full():
+            return 0
+        if not self.transcriptions:
+            return len(token_ids)
+
+        length = min(len(token_ids), *(len(ids) for ids in self.transcriptions))
+        if length == 0:
+            return 0
+        if len(self.transcriptions) == 1:
+            mismatched = self.transcriptions[0][:length] != token_ids[:length]
+        else:
+            history = np.stack([ids[:length] for ids in self.transcriptions])
+            mismatched = (history != token_ids[:length]).any(axis=0)
+        # argmax finds first mismatch, or 0 if every token matches
+        first_mismatch = int(mismatched.argmax())
+        return first_mismatch if mismatched[first_mismatch] else length
+
+    def is_full(self) -> bool:
+        '''
+        Returns:
+        True if history holds enough transcriptions to form agreement
+        '''
+        return len(self.transcriptions) == self.transcriptions.maxlen
+
+    def append(self, token_ids: npt.NDArray[np.int32]) -> None:
+        '''
+        Adds a transcription to history, dropping the oldest one if history is full.
+
+        Parameters:
+        token_ids   (numpy array): Token ids of transcription
+        '''
+        self.transcriptions.append(token_ids)
+
+    def drop_prefix(self, num_tokens: int) -> None:
+        '''
+        Drops leading tokens from every transcription, e.g. once their audio has been purged.
+
+        Parameters:
+        num_tokens  (int): Number of tokens to drop
+        '''
+        for i, ids in enumerate(self.transcriptions):
+            self.transcriptions[i] = ids[num_tokens:]
+
+    def __len__(self) -> int:
+        '''
+        Returns:
+        Number of transcriptions in history
+        '''
+        return len(self.transcriptions)
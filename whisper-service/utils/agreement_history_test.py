@@ -0,0 +1,74 @@
+'''
+Unit tests for AgreementHistory class
+'''
+import numpy as np
+from utils.agreement_history import AgreementHistory
+
+
+def test_encode_interns_texts():
+    '''
+    Test that equal texts are encoded as equal token ids
+    '''
+    history = AgreementHistory(1)
+
+    first = history.encode([' hello', ' world'])
+    second = history.encode([' world', ' hello', ' again'])
+
+    assert first.dtype == np.int32
+    assert list(first) == [0, 1]
+    assert list(second) == [1, 0, 2]
+    assert len(history.encode([])) == 0
+
+
+def test_requires_full_history():
+    '''
+    Test that nothing agrees until size previous transcriptions are in history
+    '''
+    history = AgreementHistory(2)
+    token_ids = history.encode(['a', 'b'])
+
+    history.append(token_ids)
+    assert history.agreed_prefix_length(token_ids) == 0, 'Not enough history'
+
+    history.append(token_ids)
+    assert history.agreed_prefix_length(token_ids) == 2, 'Agrees with full history'
+
+
+def test_agreed_prefix_length():
+    '''
+    Test that agreed prefix stops at first token not matching every previous transcription
+    '''
+    history = AgreementHistory(2)
+    history.append(history.encode(['a', 'b', 'c', 'd']))
+    history.append(history.encode(['a', 'b', 'x', 'd']))
+
+    assert history.agreed_prefix_length(history.encode(['a', 'b', 'c', 'd'])) == 2
+    assert history.agreed_prefix_length(history.encode(['a'])) == 1, 'Limited by new length'
+    assert history.agreed_prefix_length(history.encode(['b', 'b'])) == 0
+
+    history.append(history.encode(['a']))
+    assert history.agreed_prefix_length(history.encode(['a', 'b'])) == 1, \
+        'Limited by shortest previous transcription'
+    assert len(history) == 2, 'Oldest transcription dropped'
+
+
+def test_size_zero_agrees():
+    '''
+    Test that everything agrees if no previous transcriptions are required
+    '''
+    history = AgreementHistory(0)
+    history.append(history.encode(['a']))
+
+    assert history.agreed_prefix_length(history.encode(['a', 'b'])) == 2
+    assert len(history) == 0
+
+
+def test_drop_prefix():
+    '''
+    Test that dropping a prefix keeps history aligned with the following tokens
+    '''
+    history = AgreementHistory(1)
+    history.append(history.encode(['a', 'b', 'c']))
+    history.drop_prefix(2)
+
+    assert history.agreed_prefix_length(history.encode(['c', 'd'])) == 1
@@ -0,0 +1,109 @@
+'''
+Streaming decoders for audio frames received from websockets
+
+Classes:
+    AudioDecoder
+    PassthroughDecoder
+    OpusDecoder
+
+Functions:
+    create_audio_decoder
+'''
+# pylint: disable=import-outside-toplevel,too-few-public-methods
+#   Only import PyAV if a websocket streams compressed audio
+import io
+from abc import ABC, abstractmethod
+from custom_types.model_selection_types import AudioFormat
+
+
+class AudioDecoder(ABC):
+    '''
+    Converts audio frames received from a websocket into buffers passed to queue_audio_chunk().
+    Decoders are created per websocket and may keep state between frames.
+    '''
+    __slots__ = []
+
+    @abstractmethod
+    def decode(self, frame: bytes) -> io.BytesIO | None:
+        '''
+        Decodes an audio frame.
+
+        Parameters:
+        frame   (bytes): Audio frame received from websocket
+
+        Returns:
+        Buffer containing wav or headerless 16khz mono 16 bit pcm audio,
+        None if frame did not produce any audio yet
+        '''
+        raise NotImplementedError('Must implement per format')
+
+
+class PassthroughDecoder(AudioDecoder):
+    '''
+    Decoder for wav and pcm_s16le frames, which can be buffered as is.
+    '''
+    __slots__ = []
+
+    def decode(self, frame):
+        '''
+        Parameters:
+        frame   (bytes): Wav or headerless pcm audio frame
+
+        Returns:
+        Buffer containing frame
+        '''
+        return io.BytesIO(frame)
+
+
+class OpusDecoder(AudioDecoder):
+    '''
+    Decoder for a stream of raw opus packets, one packet per frame.
+    Decoded audio is resampled to 16khz mono 16 bit pcm.
+    '''
+    __slots__ = ['av', 'codec', 'resampler']
+    OPUS_SAMPLE_RATE = 48_000
+
+    def __init__(self):
+        import av
+
+        self.av = av
+        self.codec = av.CodecContext.create('libopus', 'r')
+        self.codec.sample_rate = self.OPUS_SAMPLE_RATE
+        self.codec.layout = 'mono'
+        self.resampler = av.AudioResampler(format='s16', layout='mono', rate=16_000)
+
+    def decode(self, frame):
+        '''
+        Parameters:
+        frame   (bytes): Raw opus packet
+
+        Returns:
+        Buffer containing headerless pcm audio, None if packet did not produce any audio yet
+        '''
+        pcm = [
+            resampled_frame.to_ndarray().tobytes()
+            for audio_frame in self.codec.decode(self.av.Packet(frame))
+            for resampled_frame in self.resampler.resample(audio_frame)
+        ]
+        if not pcm:
+            return None
+        return io.BytesIO(b''.join(pcm))
+
+
+def create_audio_decoder(audio_format: AudioFormat) -> AudioDecoder:
+    '''
+    Creates decoder for a websocket's negotiated audio format.
+
+    Parameters:
+    audio_format    (AudioFormat): Format of audio frames sent by websocket
+
+    Returns:
+    A new AudioDecoder
+    '''
+    match(audio_format):
+        case AudioFormat.WAV | AudioFormat.PCM_S16LE:
+            return PassthroughDecoder()
+        case AudioFormat.OPUS:
+            return OpusDecoder()
+        case _:
+            raise KeyError(f'No audio decoder matching {audio_format}')
@@ -0,0 +1,67 @@
+'''
+Unit tests for audio decoders
+'''
+import av
+import numpy as np
+import pytest
+from custom_types.model_selection_types import AudioFormat
+from utils.audio_decoder import OpusDecoder, PassthroughDecoder, create_audio_decoder
+from utils.decode_wav import decode_pcm16
+
+
+def encode_opus(pcm: np.ndarray, sample_rate: int = 48_000) -> list[bytes]:
+    '''
+    Encode 16 bit mono pcm into raw opus packets
+    '''
+    encoder = av.CodecContext.create('libopus', 'w')
+    encoder.sample_rate = sample_rate
+    encoder.layout = 'mono'
+    encoder.format = 's16'
+    encoder.bit_rate = 24_000
+
+    # Encode 20ms frames
+    frame_size = sample_rate // 50
+    packets = []
+    for start in range(0, len(pcm), frame_size):
+        frame = av.AudioFrame.from_ndarray(
+            pcm[None, start:start + frame_size], format='s16', layout='mono')
+        frame.sample_rate = sample_rate
+        frame.pts = start
+        packets.extend(bytes(packet) for packet in encoder.encode(frame))
+    packets.extend(bytes(packet) for packet in encoder.encode(None))
+    return packets
+
+
+def test_create_audio_decoder():
+    '''
+    Test that the decoder matching each audio format is created
+    '''
+    assert isinstance(create_audio_decoder(AudioFormat.WAV), PassthroughDecoder)
+    assert isinstance(create_audio_decoder(AudioFormat.PCM_S16LE), PassthroughDecoder)
+    assert isinstance(create_audio_decoder(AudioFormat.OPUS), OpusDecoder)
+    with pytest.raises(KeyError):
+        create_audio_decoder('mp3')
+
+
+def test_passthrough_decoder():
+    '''
+    Test that passthrough decoder returns frame unchanged
+    '''
+    assert create_audio_decoder(AudioFormat.PCM_S16LE).decode(b'\x01\x02').getvalue() == \
+        b'\x01\x02'
+
+
+def test_opus_decoder():
+    '''
+    Test that a stream of opus packets is decoded to 16khz pcm
+    '''
+    # One second 440hz tone at 48khz
+    tone = (8000 * np.sin(np.arange(48_000) * 2 * np.pi * 440 / 48_000)).astype(np.int16)
+    decoder = create_audio_decoder(AudioFormat.OPUS)
+
+    chunks = [decoder.decode(packet) for packet in encode_opus(tone)]
+    pcm = np.concatenate([decode_pcm16(chunk) for chunk in chunks if chunk is not None])
+
+    assert abs(len(pcm) - 16_000) < 1_000, 'Decoded about one second of 16khz audio'
+    spectrum = np.abs(np.fft.rfft(pcm[4_000:12_000]))
+    assert np.argmax(spectrum) * 16_000 / 8_000 == pytest.approx(440, abs=4), 'Tone preserved'
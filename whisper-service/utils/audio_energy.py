@@ -0,0 +1,50 @@
+'''
+Utility functions to measure the energy of audio for silence detection
+
+Functions:
+    rms
+    leading_silence_samples
+'''
+import numpy as np
+import numpy.typing as npt
+
+
+def rms(audio: npt.NDArray) -> float:
+    '''
+    Computes root mean square amplitude of audio.
+
+    Parameters:
+    audio   (1D numpy array): Audio normalized to [-1, 1]
+
+    Returns:
+    RMS amplitude of audio, or 0 if audio is empty
+    '''
+    if len(audio) == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(np.square(audio, dtype=np.float32))))
+
+
+def leading_silence_samples(audio: npt.NDArray, threshold: float, frame_samples: int) -> int:
+    '''
+    Finds the number of silent samples at the start of audio.
+    Audio is split into frames and silence ends at the first frame with RMS of at least threshold.
+
+    Parameters:
+    audio           (1D numpy array): Audio normalized to [-1, 1]
+    threshold       (float)         : RMS amplitude below which a frame is silent
+    frame_samples   (int)           : Number of samples in each frame
+
+    Returns:
+    Number of samples before first non silent frame. Equal to len(audio) if all audio is silent.
+    '''
+    if len(audio) == 0:
+        return 0
+
+    frame_starts = np.arange(0, len(audio), frame_samples)
+    frame_energies = np.add.reduceat(np.square(audio, dtype=np.float32), frame_starts)
+    frame_lengths = np.diff(frame_starts, append=len(audio))
+
+    voiced_frames = np.flatnonzero(frame_energies >= threshold ** 2 * frame_lengths)
+    if len(voiced_frames) == 0:
+        return len(audio)
+    return int(frame_starts[voiced_frames[0]])
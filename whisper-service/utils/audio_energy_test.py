@@ -0,0 +1,39 @@
+'''
+Unit tests for audio energy functions
+'''
+import numpy as np
+from utils.audio_energy import rms, leading_silence_samples
+
+
+def test_rms():
+    '''
+    Test that rms computes root mean square amplitude
+    '''
+    assert rms(np.array([], dtype=np.float32)) == 0, "Empty audio has no energy"
+    assert rms(np.zeros(100, dtype=np.float32)) == 0
+    assert np.isclose(rms(np.full(100, -0.5, dtype=np.float32)), 0.5)
+    assert np.isclose(rms(np.array([0.3, -0.4], dtype=np.float32)), np.sqrt(0.125))
+
+
+def test_leading_silence_samples():
+    '''
+    Test that leading silence ends at first frame above threshold
+    '''
+    audio = np.zeros(1000, dtype=np.float32)
+    audio[550:560] = 1
+
+    assert leading_silence_samples(audio, 0.01, 100) == 500, "Silence ends at frame start"
+    assert leading_silence_samples(audio, 0.5, 100) == 1000, "Quiet frame counted as silent"
+    assert leading_silence_samples(audio[:0], 0.01, 100) == 0
+
+
+def test_leading_silence_partial_frame():
+    '''
+    Test that a trailing partial frame is checked for energy
+    '''
+    audio = np.zeros(250, dtype=np.float32)
+
+    assert leading_silence_samples(audio, 0.01, 100) == 250, "All audio is silent"
+
+    audio[240:] = 1
+    assert leading_silence_samples(audio, 0.01, 100) == 200, "Partial frame is not silent"
@@ -0,0 +1,149 @@
+'''
+Utilities for batching inference requests from sessions that share a model
+
+Classes:
+    BatchScheduler
+
+Functions:
+    get_batch_scheduler
+'''
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+# Type hint for function that runs a batch of items with a shared context
+type RunBatchFun = Callable[[Any, list[Any]], Awaitable[list[Any]]]
+
+
+class BatchScheduler:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    '''
+    Collects items submitted by different sessions and runs them together as one batch.
+
+    A batch is started once max_batch_size items are pending or the oldest pending item has
+    waited max_batch_wait_ms. While max_in_flight batches are running, items keep accumulating
+    and are started as soon as a running batch finishes.
+    '''
+    __slots__ = ['run_batch', 'max_batch_size', 'max_batch_wait',
+                 'max_in_flight', 'in_flight', 'pending', 'flush_handle', 'tasks']
+
+    def __init__(
+        self,
+        run_batch: RunBatchFun,
+        max_batch_size: int,
+        max_batch_wait_ms: float,
+        max_in_flight: int = 1
+    ):
+        '''
+        Parameters:
+        run_batch         (function): Async function called with (context, items) that returns
+                                      a list of results in the same order as items
+        max_batch_size    (int)     : Maximum number of items to run in a single batch
+        max_batch_wait_ms (float)   : Maximum time to wait for a batch to fill up
+        max_in_flight     (int)     : Maximum number of batches running at once
+        '''
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+
+        self.in_flight = 0
+        self.pending: list[tuple[Any, Any, asyncio.Future]] = []
+        self.flush_handle: asyncio.TimerHandle | None = None
+        self.tasks: set[asyncio.Task] = set()
+
+    async def submit(self, context: Any, item: Any) -> Any:
+        '''
+        Queues an item to be run in the next batch.
+
+        Parameters:
+        context (Any): Context passed to run_batch, e.g. the loaded model.
+                       A batch uses the context of its first item
+        item    (Any): Item to add to batch
+
+        Returns:
+        Result corresponding to item
+        '''
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((context, item, future))
+
+        if len(self.pending) >= self.max_batch_size:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.max_batch_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        '''
+        Starts batches from pending items while fewer than max_in_flight batches are running.
+        '''
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        while self.pending and self.in_flight < self.max_in_flight:
+            batch = self.pending[:self.max_batch_size]
+            del self.pending[:self.max_batch_size]
+
+            self.in_flight += 1
+            task = asyncio.ensure_future(self._run(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, batch: list[tuple[Any, Any, asyncio.Future]]) -> None:
+        '''
+        Runs a batch and routes results back to each item's future.
+
+        Parameters:
+        batch (list): Pending (context, item, future) tuples to run
+        '''
+        try:
+            results = await self.run_batch(batch[0][0], [item for _, item, _ in batch])
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.in_flight -= 1
+            # Items that accumulated while batch was running have already waited
+            if self.pending:
+                self._flush()
+
+
+_schedulers: dict[tuple[str, int, float, int], BatchScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_batch_scheduler(
+    key: str,
+    run_batch: RunBatchFun,
+    max_batch_size: int,
+    max_batch_wait_ms: float,
+    max_in_flight: int = 1
+) -> BatchScheduler:
+    '''
+    Gets the process wide batch scheduler for a model, creating it if needed.
+
+    Parameters:
+    key               (str)     : Key identifying shared model
+    run_batch         (function): Async function called with (context, items) to run a batch
+    max_batch_size    (int)     : Maximum number of items to run in a single batch
+    max_batch_wait_ms (float)   : Maximum time to wait for a batch to fill up
+    max_in_flight     (int)     : Maximum number of batches running at once
+
+    Returns:
+    BatchScheduler for model
+    '''
+    scheduler_key = (key, max_batch_size, max_batch_wait_ms, max_in_flight)
+    with _schedulers_lock:
+        if scheduler_key not in _schedulers:
+            _schedulers[scheduler_key] = BatchScheduler(
+                run_batch, max_batch_size, max_batch_wait_ms, max_in_flight
+            )
+        return _schedulers[scheduler_key]
@@ -0,0 +1,104 @@
+'''
+Unit tests for BatchScheduler class
+'''
+# pylint: disable=too-few-public-methods
+import asyncio
+import pytest
+from utils.batch_scheduler import BatchScheduler
+
+
+class FakeBatchRunner:
+    '''
+    Fake batch inference that records the batches it was called with.
+    '''
+
+    def __init__(self, duration=0.0):
+        self.duration = duration
+        self.batches = []
+
+    async def __call__(self, context, items):
+        self.batches.append((context, items))
+        await asyncio.sleep(self.duration)
+        return [item * 2 for item in items]
+
+
+@pytest.mark.asyncio
+async def test_batches_concurrent_items():
+    '''
+    Test that items submitted together are run as a single batch
+    '''
+    runner = FakeBatchRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=4, max_batch_wait_ms=50)
+
+    results = await asyncio.gather(*(scheduler.submit('model', i) for i in range(3)))
+
+    assert results == [0, 2, 4], 'Results routed back to each item'
+    assert runner.batches == [('model', [0, 1, 2])], 'Ran one batch'
+
+
+@pytest.mark.asyncio
+async def test_starts_full_batch_immediately():
+    '''
+    Test that a batch starts as soon as max_batch_size items are pending
+    '''
+    runner = FakeBatchRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=2, max_batch_wait_ms=10_000)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(scheduler.submit('model', i) for i in range(2))),
+        timeout=1
+    )
+
+    assert results == [0, 2]
+    assert len(runner.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_splits_items_into_max_batch_size():
+    '''
+    Test that batches never exceed max_batch_size
+    '''
+    runner = FakeBatchRunner()
+    scheduler = BatchScheduler(
+        runner, max_batch_size=2, max_batch_wait_ms=10, max_in_flight=3
+    )
+
+    results = await asyncio.gather(*(scheduler.submit('model', i) for i in range(5)))
+
+    assert results == [0, 2, 4, 6, 8]
+    assert [items for _, items in runner.batches] == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_accumulates_while_batch_in_flight():
+    '''
+    Test that items submitted while a batch is running are grouped into the next batch
+    '''
+    runner = FakeBatchRunner(duration=0.1)
+    scheduler = BatchScheduler(runner, max_batch_size=8, max_batch_wait_ms=0)
+
+    first = asyncio.ensure_future(scheduler.submit('model', 0))
+    await asyncio.sleep(0.01)
+    rest = [asyncio.ensure_future(scheduler.submit('model', i)) for i in range(1, 4)]
+    await asyncio.gather(first, *rest)
+
+    assert [items for _, items in runner.batches] == [[0], [1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_propagates_errors():
+    '''
+    Test that an error running a batch is raised for every item in the batch
+    '''
+    async def failing_runner(context, items):
+        raise RuntimeError('Inference failed')
+
+    scheduler = BatchScheduler(failing_runner, max_batch_size=2, max_batch_wait_ms=10)
+
+    results = await asyncio.gather(
+        scheduler.submit('model', 0),
+        scheduler.submit('model', 1),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -1,16 +1,86 @@
 '''
-A utility function to help convert wav audio bytes to numpy array
+Utility functions to help convert wav audio bytes to numpy array
 
 Functions:
+    decode_pcm16
     decode_wav
+
+Variables:
+    PCM16_SCALE
 '''
 import io
-import wave
+import struct
 import numpy as np
 import numpy.typing as npt
 
+# Factor to multiply 16 bit pcm samples by to normalize them to [-1, 1]
+PCM16_SCALE = np.float32(1 / abs(np.iinfo(np.int16).min))
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def find_wav_data(data: memoryview) -> memoryview:
+    '''
+    Finds pcm data in a RIFF wav file by walking its chunks, checking the fmt chunk on the way.
+    For the canonical 44 byte header this only reads the fmt and data chunk headers.
+
+    Parameters:
+    data    (memoryview): Bytes of wav file
+
+    Returns:
+    View of the bytes in the data chunk
+    '''
+    offset = 12
+    has_fmt = False
+    while offset + 8 <= len(data):
+        chunk_id = bytes(data[offset:offset + 4])
+        (chunk_size,) = struct.unpack_from('<I', data, offset + 4)
+        chunk_start = offset + 8
+
+        if chunk_id == b'fmt ':
+            audio_format, num_channels, frame_rate, _, _, sample_bits = struct.unpack_from(
+                '<HHIIHH', data, chunk_start)
+            assert audio_format in (WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE)
+            assert sample_bits == 16
+            assert frame_rate == 16_000
+            assert num_channels == 1
+            has_fmt = True
+        elif chunk_id == b'data':
+            assert has_fmt, 'Wav fmt chunk must come before data chunk'
+            # Streaming writers may not know the data size, so clamp it to the bytes received
+            return data[chunk_start:min(len(data), chunk_start + chunk_size)]
+
+        # Chunks are padded to an even number of bytes
+        offset = chunk_start + chunk_size + (chunk_size & 1)
+
+    raise ValueError('Wav data chunk not found')
 
-def decode_wav(wav_buffer: io.BytesIO) -> npt.NDArray:
+
+def decode_pcm16(audio_buffer: io.BytesIO) -> npt.NDArray[np.int16]:
+    '''
+    Decode a buffer containing wav or headerless pcm data into a numpy array without copying.
+    Buffers not starting with a RIFF header are treated as headerless pcm.
+
+    Parameters:
+    audio_buffer    (io.BytesIO): Wav or headerless pcm audio buffer in the following format:
+        sample width : 2 bytes (little endian)
+        sample rate  : 16 khz
+        num channels : 1
+
+    Returns:
+    1D numpy array of int16 samples viewing audio_buffer.
+    Multiply by PCM16_SCALE to normalize to [-1, 1].
+    '''
+    data = audio_buffer.getbuffer()
+    if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+        data = find_wav_data(data)
+
+    # Drop trailing partial sample
+    return np.frombuffer(data[:len(data) - len(data) % 2], dtype='<i2')
+
+
+def decode_wav(wav_buffer: io.BytesIO) -> npt.NDArray[np.float32]:
     '''
     Decode a buffer containing wav data into numpy array for use with whisper.
     Note: This function doesn't do any reencoding.
@@ -20,21 +90,9 @@ def decode_wav(wav_buffer: io.BytesIO) -> npt.NDArray:
         sample width : 2 bytes
         sample rate  : 16 khz
         num channels : 1
-    
+
     Returns:
-    1D numpy array containing float16 data normalized to [-1, 1].
+    1D numpy array containing float32 data normalized to [-1, 1].
     Array represents audio in single channel with 16_000 samples per second.
     '''
-    with wave.open(wav_buffer, 'rb') as wav_audio:
-        assert wav_audio.getsampwidth() == 2
-        assert wav_audio.getframerate() == 16_000
-        assert wav_audio.getnchannels() == 1
-
-        # Extract pcm audio data from wav
-        nframes = wav_audio.getnframes()
-        frames = wav_audio.readframes(nframes)
-        audio = np.frombuffer(frames, dtype=np.int16)
-
-        # Normalize audio to between -1 and 1
-        audio = audio.astype(np.float16) / abs(np.iinfo(np.int16).min)
-    return audio
+    return np.multiply(decode_pcm16(wav_buffer), PCM16_SCALE, dtype=np.float32)
@@ -0,0 +1,64 @@
+'''
+Unit tests for wav decoding functions
+'''
+import io
+import struct
+import wave
+import numpy as np
+import pytest
+from utils.decode_wav import PCM16_SCALE, decode_pcm16, decode_wav
+
+samples = np.array([0, 1, -1, 16384, -32768, 32767], dtype=np.int16)
+
+
+def make_wav(pcm: np.ndarray, frame_rate: int = 16_000) -> bytes:
+    '''
+    Create wav file bytes containing given pcm samples
+    '''
+    wav_buffer = io.BytesIO()
+    with wave.Wave_write(wav_buffer) as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(frame_rate)
+        wav_file.writeframes(pcm.tobytes())
+    return wav_buffer.getvalue()
+
+
+def test_decode_wav():
+    '''
+    Test that wav is decoded to float32 normalized to [-1, 1]
+    '''
+    audio = decode_wav(io.BytesIO(make_wav(samples)))
+
+    assert audio.dtype == np.float32
+    assert np.array_equal(audio, samples.astype(np.float32) / 32768)
+
+
+def test_decode_headerless_pcm():
+    '''
+    Test that buffers without a RIFF header are decoded as pcm
+    '''
+    pcm = decode_pcm16(io.BytesIO(samples.tobytes()))
+
+    assert np.array_equal(pcm, samples)
+    assert np.array_equal(pcm * PCM16_SCALE, decode_wav(io.BytesIO(make_wav(samples))))
+
+
+def test_decode_wav_extra_chunks():
+    '''
+    Test that chunks between fmt and data chunks are skipped
+    '''
+    wav = make_wav(samples)
+    # Insert an odd sized LIST chunk after the 36 byte RIFF and fmt headers
+    extra_chunk = b'LIST' + struct.pack('<I', 3) + b'abc\x00'
+    wav = wav[:36] + extra_chunk + wav[36:]
+
+    assert np.array_equal(decode_pcm16(io.BytesIO(wav)), samples)
+
+
+def test_decode_wav_rejects_format():
+    '''
+    Test that wav with unsupported format is rejected
+    '''
+    with pytest.raises(AssertionError):
+        decode_pcm16(io.BytesIO(make_wav(samples, frame_rate=8_000)))
@@ -0,0 +1,105 @@
+'''
+Measures how long modules take to import, similar to python -X importtime
+
+Classes:
+    ImportTimer
+
+Variables:
+    IMPORT_TIMER
+'''
+import builtins
+import sys
+import threading
+import time
+
+
+class ImportTimer:
+    '''
+    Times the first import of each module by wrapping builtins.__import__.
+
+    Self time excludes time spent importing other timed modules, cumulative time includes it.
+    Relative imports and modules imported with importlib are not timed separately, so their
+    time is counted towards the module importing them.
+    '''
+    __slots__ = ['original_import', 'timings', 'local', 'lock', 'start_time']
+
+    def __init__(self):
+        self.original_import = builtins.__import__
+        # (module name, self seconds, cumulative seconds, import depth) in order of completion
+        self.timings: list[tuple[str, float, float, int]] = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.start_time = time.perf_counter()
+
+    def install(self) -> None:
+        '''
+        Starts timing imports. Does nothing if already installed, e.g. when the module
+        installing the timer is imported again under another name.
+        '''
+        # Bound methods are recreated on each access, so compare the instance they are bound to
+        if getattr(builtins.__import__, '__self__', None) is self:
+            return
+        self.original_import = builtins.__import__
+        self.start_time = time.perf_counter()
+        builtins.__import__ = self.timed_import
+
+    def uninstall(self) -> None:
+        '''
+        Stops timing imports.
+        '''
+        builtins.__import__ = self.original_import
+
+    def timed_import(self, name, *args, **kwargs):
+        '''
+        Replacement for builtins.__import__ that times imports of modules not imported yet.
+        Takes the same arguments as builtins.__import__.
+
+        Returns:
+        Imported module
+        '''
+        level = args[3] if len(args) > 3 else kwargs.get('level', 0)
+        if level > 0 or name in sys.modules:
+            return self.original_import(name, *args, **kwargs)
+
+        # Time spent importing nested modules, for each import in progress on this thread
+        stack: list[float] = self.local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self.original_import(name, *args, **kwargs)
+        finally:
+            cumulative = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            with self.lock:
+                self.timings.append((name, cumulative - nested, cumulative, len(stack)))
+
+    def report(self, limit: int = 25) -> str:
+        '''
+        Formats the slowest top level imports.
+
+        Parameters:
+        limit   (int): Maximum number of modules to include
+
+        Returns:
+        Report listing self and cumulative import time in microseconds of the slowest modules
+        '''
+        with self.lock:
+            timings = list(self.timings)
+
+        total = sum(cumulative for _, _, cumulative, depth in timings if depth == 0)
+        lines = [
+            f'import time: {total:.3f}s in imports, '
+            f'{time.perf_counter() - self.start_time:.3f}s since timing started',
+            'import time: self [us] | cumulative | imported package'
+        ]
+        slowest = sorted(timings, key=lambda timing: timing[2], reverse=True)[:limit]
+        for name, self_sec, cumulative, _ in slowest:
+            lines.append(
+                f'import time: {self_sec * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {name}')
+        return '\n'.join(lines)
+
+
+# Timer used by index.py when started with --importtime
+IMPORT_TIMER = ImportTimer()
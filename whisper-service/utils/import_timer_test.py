@@ -0,0 +1,44 @@
+'''
+Unit tests for ImportTimer class
+'''
+import builtins
+import sys
+from utils.import_timer import ImportTimer
+
+
+def test_times_new_imports():
+    '''
+    Test that only modules that were not imported yet are timed
+    '''
+    sys.modules.pop('colorsys', None)
+    timer = ImportTimer()
+
+    timer.install()
+    try:
+        import colorsys  # pylint: disable=import-outside-toplevel,unused-import
+        import os  # pylint: disable=import-outside-toplevel,unused-import,reimported
+    finally:
+        timer.uninstall()
+
+    assert [timing[0] for timing in timer.timings] == ['colorsys']
+    assert timer.timings[0][1] <= timer.timings[0][2], 'Self time within cumulative time'
+    assert 'colorsys' in timer.report()
+
+
+def test_install_twice():
+    '''
+    Test that installing an installed timer does not wrap its own import function
+    '''
+    sys.modules.pop('colorsys', None)
+    timer = ImportTimer()
+    original_import = builtins.__import__
+
+    timer.install()
+    try:
+        timer.install()
+        import colorsys  # pylint: disable=import-outside-toplevel,unused-import
+    finally:
+        timer.uninstall()
+
+    assert [timing[0] for timing in timer.timings] == ['colorsys']
+    assert builtins.__import__ is original_import, 'Uninstall restores original import'
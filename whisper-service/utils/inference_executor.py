@@ -0,0 +1,107 @@
+'''
+Utilities for running blocking model inference outside of the asyncio event loop
+
+Classes:
+    InferenceExecutor
+
+Functions:
+    get_inference_executor
+'''
+import asyncio
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+from custom_types.config_types import InferenceExecutorKind
+from utils.model_host import MODEL_HOST_CLIENT
+
+
+class InferenceExecutor:
+    '''
+    Runs blocking inference functions on a thread or process pool, or on the model host
+    process shared by all websocket worker processes.
+    The size of the pool limits how many inferences can run concurrently.
+    '''
+    __slots__ = ['key', 'kind', 'max_workers', 'executor']
+
+    def __init__(self, kind: InferenceExecutorKind, max_workers: int, key: str = ''):
+        '''
+        Parameters:
+        kind        (InferenceExecutorKind): Whether to run inference on threads, processes,
+                                             or the model host
+        max_workers (int)                  : Maximum number of concurrent inferences
+        key         (str)                  : Key identifying shared model on model host
+        '''
+        self.key = key
+        self.kind = kind
+        self.max_workers = max_workers
+
+        self.executor: Executor | None
+        match kind:
+            case InferenceExecutorKind.THREAD:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix='inference'
+                )
+            case InferenceExecutorKind.PROCESS:
+                self.executor = ProcessPoolExecutor(max_workers=max_workers)
+            case InferenceExecutorKind.MODEL_HOST:
+                # Model host limits concurrency per key across all worker processes
+                self.executor = None
+            case _:
+                raise KeyError(f'No inference executor matching {kind}')
+
+    async def run(self, fun: Callable[..., Any], *args: Any) -> Any:
+        '''
+        Runs fun(*args) on executor without blocking the event loop.
+        When using a process executor or model host, fun and args must be picklable.
+
+        Parameters:
+        fun     (function): Function to run
+        *args             : Arguments passed to fun
+
+        Returns:
+        Return value of fun
+        '''
+        if self.executor is None:
+            return await MODEL_HOST_CLIENT.run(self.key, self.max_workers, fun, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fun, *args))
+
+    def shutdown(self) -> None:
+        '''
+        Shuts down executor, cancelling any inference that has not started yet.
+        '''
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executors: dict[tuple[str, InferenceExecutorKind, int], InferenceExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_inference_executor(
+    key: str,
+    kind: InferenceExecutorKind,
+    max_workers: int
+) -> InferenceExecutor:
+    '''
+    Gets the process wide executor for a model, creating it if needed.
+    Sessions sharing a model share its executor, so max_workers limits
+    concurrent inferences per model.
+
+    Parameters:
+    key         (str)                  : Key identifying shared model
+    kind        (InferenceExecutorKind): Whether to run inference on threads, processes,
+                                         or the model host
+    max_workers (int)                  : Maximum number of concurrent inferences for model
+
+    Returns:
+    InferenceExecutor for model
+    '''
+    executor_key = (key, kind, max_workers)
+    with _executors_lock:
+        if executor_key not in _executors:
+            _executors[executor_key] = InferenceExecutor(kind, max_workers, key)
+        return _executors[executor_key]
@@ -0,0 +1,75 @@
+'''
+Unit tests for InferenceExecutor class
+'''
+import asyncio
+import threading
+import time
+import pytest
+from custom_types.config_types import InferenceExecutorKind
+from utils.inference_executor import InferenceExecutor, get_inference_executor
+
+
+def blocking_inference(duration: float) -> str:
+    '''
+    Fake inference that blocks the calling thread
+    '''
+    time.sleep(duration)
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_runs_off_event_loop():
+    '''
+    Test that inference does not block the event loop while running
+    '''
+    executor = InferenceExecutor(InferenceExecutorKind.THREAD, 1)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    thread_name = await executor.run(blocking_inference, 0.2)
+    ticker.cancel()
+    executor.shutdown()
+
+    assert thread_name.startswith('inference'), 'Ran on executor thread'
+    assert ticks > 5, 'Event loop kept running during inference'
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency():
+    '''
+    Test that max_workers limits the number of concurrent inferences
+    '''
+    executor = InferenceExecutor(InferenceExecutorKind.THREAD, 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(executor.run(blocking_inference, 0.1) for _ in range(4)))
+    duration = time.perf_counter() - start
+    executor.shutdown()
+
+    assert 0.2 <= duration < 0.4, 'Ran two inferences at a time'
+
+
+@pytest.mark.asyncio
+async def test_process_executor():
+    '''
+    Test that inference can be dispatched to a process pool
+    '''
+    executor = InferenceExecutor(InferenceExecutorKind.PROCESS, 1)
+    assert await executor.run(abs, -2) == 2
+    executor.shutdown()
+
+
+def test_executor_shared_per_model():
+    '''
+    Test that sessions using the same model share an executor
+    '''
+    executor = get_inference_executor('model_a', InferenceExecutorKind.THREAD, 1)
+
+    assert get_inference_executor('model_a', InferenceExecutorKind.THREAD, 1) is executor
+    assert get_inference_executor('model_b', InferenceExecutorKind.THREAD, 1) is not executor
@@ -0,0 +1,116 @@
+'''
+Utilities for tracking how much of a shared model's inference capacity sessions use
+
+Classes:
+    LoadMonitor
+
+Functions:
+    get_load_monitor
+'''
+import threading
+import time
+
+
+class LoadMonitor:
+    '''
+    Tracks the real time factor of each session using a shared model.
+
+    A session's real time factor is the seconds spent processing per second of audio received,
+    which is the fraction of one inference worker the session needs to keep up with real time.
+    The load of the model is the sum of active sessions' real time factors divided by the number
+    of inference workers, so a load above 1 means sessions are falling behind.
+    '''
+    __slots__ = ['capacity', 'session_rtfs']
+    # Weight of newest measurement in exponential moving average of real time factor
+    SMOOTHING = 0.3
+    # Sessions without a measurement for this long are not counted towards load
+    SESSION_TIMEOUT_SEC = 30
+
+    def __init__(self, capacity: int):
+        '''
+        Parameters:
+        capacity    (int): Number of inferences the shared model can run concurrently
+        '''
+        self.capacity = capacity
+        # Maps session id to (real time factor, time of last measurement)
+        self.session_rtfs: dict[int, tuple[float, float]] = {}
+
+    def update(self, session_id: int, processing_sec: float, audio_sec: float) -> float:
+        '''
+        Records a measurement for a session.
+
+        Parameters:
+        session_id      (int)  : Id of session
+        processing_sec  (float): Seconds spent processing audio
+        audio_sec       (float): Seconds of new audio that was processed
+
+        Returns:
+        Load of model after measurement
+        '''
+        now = time.monotonic()
+        rtf = processing_sec / audio_sec
+        if session_id in self.session_rtfs:
+            prev_rtf, _ = self.session_rtfs[session_id]
+            rtf = self.SMOOTHING * rtf + (1 - self.SMOOTHING) * prev_rtf
+        self.session_rtfs[session_id] = (rtf, now)
+        return self.load(now)
+
+    def remove(self, session_id: int) -> None:
+        '''
+        Stops counting a session towards load.
+
+        Parameters:
+        session_id  (int): Id of session
+        '''
+        self.session_rtfs.pop(session_id, None)
+
+    def session_rtf(self, session_id: int) -> float:
+        '''
+        Parameters:
+        session_id  (int): Id of session
+
+        Returns:
+        Smoothed real time factor of session, 0 if session has no measurements
+        '''
+        rtf, _ = self.session_rtfs.get(session_id, (0.0, 0.0))
+        return rtf
+
+    def load(self, now: float | None = None) -> float:
+        '''
+        Drops sessions that timed out and computes load of model.
+
+        Parameters:
+        now (float): Current time.monotonic() value, defaults to now
+
+        Returns:
+        Sum of active sessions' real time factors divided by capacity
+        '''
+        if now is None:
+            now = time.monotonic()
+        for session_id, (_, last_update) in list(self.session_rtfs.items()):
+            if now - last_update > self.SESSION_TIMEOUT_SEC:
+                # Session may be removed concurrently by a thread unloading it
+                self.session_rtfs.pop(session_id, None)
+        return sum(rtf for rtf, _ in self.session_rtfs.values()) / self.capacity
+
+
+_monitors: dict[tuple[str, int], LoadMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_load_monitor(key: str, capacity: int) -> LoadMonitor:
+    '''
+    Gets the process wide load monitor for a model, creating it if needed.
+
+    Parameters:
+    key         (str): Key identifying shared model and its inference executor
+    capacity    (int): Number of inferences the shared model can run concurrently
+
+    Returns:
+    LoadMonitor for model
+    '''
+    monitor_key = (key, capacity)
+    with _monitors_lock:
+        if monitor_key not in _monitors:
+            _monitors[monitor_key] = LoadMonitor(capacity)
+        return _monitors[monitor_key]
@@ -0,0 +1,55 @@
+'''
+Unit tests for LoadMonitor class
+'''
+import pytest
+from utils.load_monitor import LoadMonitor, get_load_monitor
+
+
+def test_load_sums_sessions():
+    '''
+    Test that load is the sum of session real time factors divided by capacity
+    '''
+    monitor = LoadMonitor(2)
+
+    monitor.update(1, 0.5, 1.0)
+    load = monitor.update(2, 3.0, 2.0)
+
+    assert monitor.session_rtf(1) == 0.5
+    assert monitor.session_rtf(2) == 1.5
+    assert load == pytest.approx(1.0)
+
+    monitor.remove(2)
+    assert monitor.load() == pytest.approx(0.25)
+
+
+def test_smooths_measurements():
+    '''
+    Test that repeated measurements of a session are smoothed
+    '''
+    monitor = LoadMonitor(1)
+
+    monitor.update(1, 1.0, 1.0)
+    monitor.update(1, 0.0, 1.0)
+
+    assert monitor.session_rtf(1) == pytest.approx(1 - LoadMonitor.SMOOTHING)
+
+
+def test_drops_inactive_sessions(mocker):
+    '''
+    Test that sessions without recent measurements are not counted
+    '''
+    monotonic = mocker.patch('utils.load_monitor.time.monotonic', return_value=100.0)
+    monitor = LoadMonitor(1)
+    monitor.update(1, 1.0, 1.0)
+
+    monotonic.return_value = 100.0 + LoadMonitor.SESSION_TIMEOUT_SEC + 1
+    assert monitor.load() == 0
+    assert monitor.session_rtf(1) == 0
+
+
+def test_get_load_monitor_shared():
+    '''
+    Test that the same monitor is returned for the same model
+    '''
+    assert get_load_monitor('model_a', 1) is get_load_monitor('model_a', 1)
+    assert get_load_monitor('model_a', 1) is not get_load_monitor('model_b', 1)
@@ -0,0 +1,169 @@
+'''
+Incremental log-mel spectrogram computation for buffered audio
+
+Classes:
+    MelFeatureCache
+
+Functions:
+    normalize_log_mel
+'''
+import numpy as np
+import numpy.typing as npt
+from utils.np_circular_buffer import NPCircularBuffer
+
+
+def normalize_log_mel(frames: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+    '''
+    Applies Whisper's dynamic range compression and scaling to log10 mel frames, matching
+    the output of faster whisper's FeatureExtractor for the same frames.
+
+    Parameters:
+    frames  (2D numpy array): log10 mel frames of shape (n_frames, n_mels)
+
+    Returns:
+    Features of shape (n_mels, n_frames)
+    '''
+    features = np.maximum(frames.T, frames.max() - 8.0)
+    features += 4.0
+    features /= 4.0
+    return features
+
+
+class MelFeatureCache:  # pylint: disable=too-many-instance-attributes
+    '''
+    Keeps log10 mel frames of a session's buffered audio, so that each appended sample is only
+    transformed once instead of every time a decode window containing it is featurized.
+
+    Frame k covers samples [k * hop_length - n_fft // 2, k * hop_length + n_fft // 2) counted
+    from the first appended sample, like centered STFT frames of Whisper's feature extractor.
+    Frames are computed once all of their samples are appended. Frames at the end of the
+    received audio are computed with zero padding when requested, without being stored.
+    Audio before the first appended sample is treated as silence.
+
+    Frame k is kept until samples before k * hop_length are dropped.
+    '''
+    __slots__ = ['mel_filters', 'n_fft', 'hop_length', 'window', 'frames', 'first_frame',
+                 'pending_samples', 'num_samples']
+
+    def __init__(
+        self,
+        mel_filters: npt.NDArray[np.float32],
+        max_samples: int,
+        n_fft: int = 400,
+        hop_length: int = 160
+    ):
+        '''
+        Parameters:
+        mel_filters (2D numpy array): Mel filterbank of shape (n_mels, n_fft // 2 + 1)
+        max_samples (int)           : Maximum number of samples kept at once, e.g. size of
+                                      the audio buffer
+        n_fft       (int)           : Samples in each STFT frame
+        hop_length  (int)           : Samples between starts of consecutive STFT frames
+        '''
+        self.mel_filters = np.ascontiguousarray(mel_filters.T, dtype=np.float32)
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+        self.frames = NPCircularBuffer(
+            max_samples // hop_length + 2,
+            dtype=np.dtype((np.float32, mel_filters.shape[0])),
+            ring=True
+        )
+        # Absolute index of first frame in frames
+        self.first_frame = 0
+        # Samples not yet covered by a computed frame, starting at left edge of next frame
+        self.pending_samples = np.zeros(n_fft // 2, dtype=np.float32)
+        self.num_samples = 0
+
+    def log_mel(self, samples: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+        '''
+        Parameters:
+        samples (1D numpy array): Samples covering frames, at least n_fft samples long
+
+        Returns:
+        log10 mel frames of shape (n_frames, n_mels) for every full frame in samples
+        '''
+        num_frames = 1 + (len(samples) - self.n_fft) // self.hop_length
+        windows = np.lib.stride_tricks.as_strided(
+            samples,
+            shape=(num_frames, self.n_fft),
+            strides=(samples.strides[0] * self.hop_length, samples.strides[0]),
+            writeable=False
+        )
+        spectrum = np.fft.rfft(windows * self.window, axis=-1).astype(np.complex64)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        mel = power @ self.mel_filters
+        return np.log10(np.maximum(mel, 1e-10, out=mel), out=mel)
+
+    def append(self, samples: npt.NDArray[np.float32]) -> None:
+        '''
+        Computes frames that are complete once samples are appended.
+
+        Parameters:
+        samples (1D numpy array): Newly received audio normalized to [-1, 1]
+        '''
+        self.num_samples += len(samples)
+        self.pending_samples = np.concatenate((self.pending_samples, samples))
+        if len(self.pending_samples) < self.n_fft:
+            return
+
+        frames = self.log_mel(self.pending_samples)
+        extra_frames = self.frames.append_sequence(frames)
+        assert len(extra_frames) == 0, 'Samples must be dropped before cache is full'
+        self.pending_samples = self.pending_samples[len(frames) * self.hop_length:]
+
+    def drop(self, num_samples: int) -> None:
+        '''
+        Drops frames centered before a sample, e.g. once it is purged from the audio buffer.
+
+        Parameters:
+        num_samples (int): Number of samples since first appended sample to drop frames before
+        '''
+        first_frame = -(-num_samples // self.hop_length)
+        shift = first_frame - self.first_frame
+        if shift <= 0:
+            return
+        computed_end = self.first_frame + len(self.frames)
+        self.frames.shift_buffer(min(shift, len(self.frames)))
+        self.first_frame = first_frame
+        # Frames that were not computed yet are skipped along with their samples
+        if first_frame > computed_end:
+            self.pending_samples = \
+                self.pending_samples[(first_frame - computed_end) * self.hop_length:]
+
+    def get_frames(self, start_sample: int, end_sample: int) -> npt.NDArray[np.float32]:
+        '''
+        Parameters:
+        start_sample    (int): Number of samples since first appended sample at start of audio
+        end_sample      (int): Number of samples since first appended sample at end of audio,
+                               at most the number of appended samples
+
+        Returns:
+        log10 mel frames of shape (n_frames, n_mels) centered on samples in
+        [start_sample, end_sample), starting at the first multiple of hop_length
+        '''
+        start_frame = -(-start_sample // self.hop_length)
+        assert start_frame >= self.first_frame, 'Frames were dropped'
+        assert end_sample <= self.num_samples, 'Samples were not appended'
+        end_frame = max(start_frame, -(-end_sample // self.hop_length))
+        computed_end = self.first_frame + len(self.frames)
+
+        frames = self.frames.get_curr_buffer()[
+            start_frame - self.first_frame:min(end_frame, computed_end) - self.first_frame
+        ]
+        if end_frame <= computed_end:
+            return frames
+
+        # Remaining frames extend past received audio, which is padded with silence
+        num_pending = end_frame - computed_end
+        pending_samples = np.zeros((num_pending - 1) * self.hop_length + self.n_fft, np.float32)
+        pending_samples[:len(self.pending_samples)] = self.pending_samples
+        pending_frames = self.log_mel(pending_samples)[max(0, start_frame - computed_end):]
+        return np.concatenate((frames, pending_frames))
+
+    def __len__(self) -> int:
+        '''
+        Returns:
+        Number of computed frames kept
+        '''
+        return len(self.frames)
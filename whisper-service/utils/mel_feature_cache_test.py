@@ -0,0 +1,82 @@
+'''
+Unit tests for MelFeatureCache class
+'''
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+from utils.mel_feature_cache import MelFeatureCache, normalize_log_mel
+
+feature_extractor = FeatureExtractor()
+
+
+def make_audio(num_samples: int) -> np.ndarray:
+    '''
+    Create noisy audio normalized to [-1, 1]
+    '''
+    return (0.1 * np.random.default_rng(0).standard_normal(num_samples)).astype(np.float32)
+
+
+def extract_features(audio: np.ndarray) -> np.ndarray:
+    '''
+    Compute features of audio the same way prepare_speech_features() does
+    '''
+    features = feature_extractor(audio)
+    return features[:, :features.shape[-1] - 1]
+
+
+def test_matches_feature_extractor():
+    '''
+    Test that features of cached frames match features computed from the whole window,
+    apart from frames within n_fft // 2 of the window start, which see real audio
+    instead of reflection padding
+    '''
+    audio = make_audio(48_000)
+    cache = MelFeatureCache(feature_extractor.mel_filters, 48_000)
+    for start in range(0, len(audio), 1_000):
+        cache.append(audio[start:start + 1_000])
+
+    for window_start in (0, 3_200):
+        expected = extract_features(audio[window_start:])
+        features = normalize_log_mel(cache.get_frames(window_start, len(audio)))
+
+        assert features.shape == expected.shape, 'One frame per hop_length samples'
+        assert np.allclose(features[:, 2:], expected[:, 2:], atol=1e-4), \
+            'Features match feature extractor'
+
+
+def test_only_transforms_new_audio():
+    '''
+    Test that appending audio only computes frames that were not computed before
+    '''
+    cache = MelFeatureCache(feature_extractor.mel_filters, 16_000)
+
+    cache.append(make_audio(1_000))
+    assert len(cache) == (1_000 - 200) // 160 + 1, 'Frames with all samples computed'
+    assert len(cache.get_frames(0, 1_000)) == 7, 'Trailing frames computed on request'
+    assert len(cache) == 6, 'Trailing frames not stored'
+
+    cache.append(make_audio(1_000))
+    assert len(cache) == (2_000 - 200) // 160 + 1, 'Only new frames computed'
+
+
+def test_drop():
+    '''
+    Test that frames centered on dropped samples are dropped, and that frames after dropping
+    all received audio stay aligned with received samples
+    '''
+    audio = make_audio(20_000)
+    cache = MelFeatureCache(feature_extractor.mel_filters, 16_000)
+    cache.append(audio[:16_000])
+
+    cache.drop(1_000)
+    assert cache.first_frame == 7, 'Frames centered before sample 1000 dropped'
+    assert len(cache.get_frames(1_000, 16_000)) == 93
+
+    cache.drop(16_000)
+    cache.append(audio[16_000:])
+    assert len(cache) == (20_000 - 200) // 160 + 1 - 100, \
+        'Cache only holds frames after dropped samples'
+
+    expected = MelFeatureCache(feature_extractor.mel_filters, 20_000)
+    expected.append(audio)
+    assert np.allclose(cache.get_frames(16_000, 20_000), expected.get_frames(16_000, 20_000)), \
+        'Frames computed from same samples'
@@ -0,0 +1,295 @@
+'''
+Minimal Prometheus style metrics that can be rendered in the text exposition format
+
+Classes:
+    Counter
+    Gauge
+    Histogram
+    MetricsRegistry
+
+Variables:
+    METRICS
+    ACTIVE_SESSIONS
+    DECODE_WAV_SECONDS
+    TRANSCRIBE_AUDIO_SECONDS
+    AUDIO_TRANSCRIBED_SECONDS
+    INFERENCE_SECONDS
+    AUDIO_PROCESSED_SECONDS
+    AUDIO_PURGED_SECONDS
+    BUFFER_FILL_RATIO
+    FINALIZE_LAG_SECONDS
+    WEBSOCKET_SEND_SECONDS
+    DEFERRED_DECODES
+    SUPPRESSED_IN_PROGRESS_BLOCKS
+'''
+import bisect
+import math
+
+# Type hint for tuple of label values identifying a child of a metric
+type LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def format_labels(label_names: tuple[str, ...], label_values: LabelValues, **extra: str) -> str:
+    '''
+    Formats labels for exposition.
+
+    Parameters:
+    label_names     (tuple[str]): Names of labels
+    label_values    (tuple[str]): Values of labels, in the same order as label_names
+    **extra                     : Additional labels to append
+
+    Returns:
+    Formatted labels including braces, or empty string if there are no labels
+    '''
+    pairs = list(zip(label_names, label_values)) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_value(value: float) -> str:
+    '''
+    Formats a sample value for exposition.
+
+    Parameters:
+    value   (float): Value to format
+
+    Returns:
+    Formatted value
+    '''
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class Counter:
+    '''
+    A monotonically increasing value, optionally split by labels.
+    Updates are a single dict update so they are cheap when metrics are not being scraped.
+    '''
+    __slots__ = ['name', 'description', 'label_names', 'values']
+    TYPE = 'counter'
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()):
+        '''
+        Parameters:
+        name        (str)       : Metric name
+        description (str)       : Help text for metric
+        label_names (tuple[str]): Names of labels metric is split by
+        '''
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, labels: LabelValues = ()) -> None:
+        '''
+        Increments value.
+
+        Parameters:
+        amount  (float)     : Amount to increment by
+        labels  (tuple[str]): Label values, in the same order as label_names
+        '''
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        '''
+        Returns:
+        Sample lines in exposition format
+        '''
+        return [
+            f'{self.name}{format_labels(self.label_names, labels)} {format_value(value)}'
+            for labels, value in list(self.values.items())
+        ]
+
+
+class Gauge(Counter):
+    '''
+    A value that can go up and down, optionally split by labels.
+    '''
+    __slots__ = []
+    TYPE = 'gauge'
+
+    def dec(self, amount: float = 1, labels: LabelValues = ()) -> None:
+        '''
+        Decrements value.
+
+        Parameters:
+        amount  (float)     : Amount to decrement by
+        labels  (tuple[str]): Label values, in the same order as label_names
+        '''
+        self.inc(-amount, labels)
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        '''
+        Sets value.
+
+        Parameters:
+        value   (float)     : New value
+        labels  (tuple[str]): Label values, in the same order as label_names
+        '''
+        self.values[labels] = value
+
+
+class Histogram:
+    '''
+    Counts observations into buckets, optionally split by labels.
+    Observations only increment a single bucket; cumulative counts are computed when rendered.
+    '''
+    __slots__ = ['name', 'description', 'label_names', 'buckets', 'values']
+    TYPE = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        '''
+        Parameters:
+        name        (str)         : Metric name
+        description (str)         : Help text for metric
+        label_names (tuple[str])  : Names of labels metric is split by
+        buckets     (tuple[float]): Sorted upper bounds of buckets, excluding +Inf
+        '''
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        # Per label values: [count in each bucket (last is +Inf), sum of observations]
+        self.values: dict[LabelValues, list] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        '''
+        Records an observation.
+
+        Parameters:
+        value   (float)     : Observed value
+        labels  (tuple[str]): Label values, in the same order as label_names
+        '''
+        child = self.values.get(labels)
+        if child is None:
+            child = self.values.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0])
+        child[0][bisect.bisect_left(self.buckets, value)] += 1
+        child[1] += value
+
+    def render(self) -> list[str]:
+        '''
+        Returns:
+        Sample lines in exposition format
+        '''
+        lines = []
+        for labels, (bucket_counts, total) in list(self.values.items()):
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets + (math.inf,), list(bucket_counts)):
+                cumulative += bucket_count
+                bucket_labels = format_labels(
+                    self.label_names, labels, le=format_value(upper_bound))
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            formatted_labels = format_labels(self.label_names, labels)
+            lines.append(f'{self.name}_sum{formatted_labels} {format_value(total)}')
+            lines.append(f'{self.name}_count{formatted_labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    '''
+    Collection of metrics rendered together.
+    '''
+    __slots__ = ['metrics']
+
+    def __init__(self):
+        self.metrics: list[Counter | Histogram] = []
+
+    def register[T: (Counter, Gauge, Histogram)](self, metric: T) -> T:
+        '''
+        Adds a metric to the registry.
+
+        Parameters:
+        metric  (Counter | Gauge | Histogram): Metric to add
+
+        Returns:
+        Added metric
+        '''
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        '''
+        Returns:
+        All metrics in the Prometheus text exposition format
+        '''
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+
+ACTIVE_SESSIONS = METRICS.register(Gauge(
+    'whisper_active_sessions',
+    'Number of connected transcription sessions',
+    ('model_key',)
+))
+DECODE_WAV_SECONDS = METRICS.register(Histogram(
+    'whisper_decode_wav_seconds',
+    'Time spent decoding audio chunks into the audio buffer',
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01)
+))
+TRANSCRIBE_AUDIO_SECONDS = METRICS.register(Histogram(
+    'whisper_transcribe_audio_seconds',
+    'Latency of transcribe_audio calls, including time waiting for the inference executor'
+))
+AUDIO_TRANSCRIBED_SECONDS = METRICS.register(Counter(
+    'whisper_audio_transcribed_seconds_total',
+    'Seconds of audio passed to transcribe_audio. '
+    'Divide rate of whisper_inference_seconds_total by rate of this for the real time factor'
+))
+INFERENCE_SECONDS = METRICS.register(Counter(
+    'whisper_inference_seconds_total',
+    'Wall time spent in transcribe_audio calls'
+))
+AUDIO_PROCESSED_SECONDS = METRICS.register(Counter(
+    'whisper_audio_processed_seconds_total',
+    'Seconds of audio in buffers passed to process_segment, counting audio processed again. '
+    'Divide rate of this by rate of whisper_audio_purged_seconds_total for the times each '
+    'emitted second of audio was processed'
+))
+AUDIO_PURGED_SECONDS = METRICS.register(Counter(
+    'whisper_audio_purged_seconds_total',
+    'Seconds of audio purged from buffers by process_segment once transcribed'
+))
+BUFFER_FILL_RATIO = METRICS.register(Histogram(
+    'whisper_buffer_fill_ratio',
+    'Fraction of the audio buffer in use when a segment is processed',
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1)
+))
+FINALIZE_LAG_SECONDS = METRICS.register(Histogram(
+    'whisper_finalize_lag_seconds',
+    'Seconds of audio received after the end of a block when the block is finalized',
+    buckets=(0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30)
+))
+WEBSOCKET_SEND_SECONDS = METRICS.register(Histogram(
+    'whisper_websocket_send_seconds',
+    'Time spent sending transcription blocks over websockets',
+    ('type',)
+))
+DEFERRED_DECODES = METRICS.register(Counter(
+    'whisper_deferred_decodes_total',
+    'Audio chunks where processing was deferred because the shared model was over target load'
+))
+SUPPRESSED_IN_PROGRESS_BLOCKS = METRICS.register(Counter(
+    'whisper_suppressed_in_progress_blocks_total',
+    'In progress blocks not sent because they repeated the previous block or were rate limited',
+    ('reason',)
+))
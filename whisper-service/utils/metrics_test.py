@@ -0,0 +1,73 @@
+'''
+Unit tests for metrics classes
+'''
+from utils.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_counter_render():
+    '''
+    Test that counters are rendered per label values
+    '''
+    counter = Counter('requests_total', 'Number of requests', ('path',))
+
+    counter.inc(labels=('/a',))
+    counter.inc(2, labels=('/a',))
+    counter.inc(labels=('/"b"',))
+
+    assert counter.render() == [
+        'requests_total{path="/a"} 3.0',
+        'requests_total{path="/\\"b\\""} 1.0',
+    ]
+
+
+def test_gauge_render():
+    '''
+    Test that gauges can be incremented, decremented, and set
+    '''
+    gauge = Gauge('sessions', 'Number of sessions')
+
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert gauge.render() == ['sessions 1.0']
+
+    gauge.set(5)
+    assert gauge.render() == ['sessions 5.0']
+
+
+def test_histogram_render():
+    '''
+    Test that histograms are rendered with cumulative buckets
+    '''
+    histogram = Histogram('latency', 'Latency', buckets=(0.1, 1))
+
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    assert histogram.render() == [
+        'latency_bucket{le="0.1"} 2',
+        'latency_bucket{le="1.0"} 3',
+        'latency_bucket{le="+Inf"} 4',
+        'latency_sum 5.65',
+        'latency_count 4',
+    ]
+
+
+def test_registry_render():
+    '''
+    Test that registry renders help and type for each metric
+    '''
+    registry = MetricsRegistry()
+    counter = registry.register(Counter('a_total', 'Help for a'))
+    registry.register(Histogram('b', 'Help for b'))
+    counter.inc()
+
+    assert registry.render().startswith(
+        '# HELP a_total Help for a\n'
+        '# TYPE a_total counter\n'
+        'a_total 1.0\n'
+        '# HELP b Help for b\n'
+        '# TYPE b histogram\n'
+    )
@@ -0,0 +1,259 @@
+'''
+A model hosting process that runs inference for all websocket worker processes over local IPC,
+so each model only needs to be loaded once no matter how many workers serve websockets.
+
+Classes:
+    ModelHostClient
+
+Functions:
+    serve_model_host
+    handle_model_host_connection
+    start_model_host
+
+Variables:
+    MODEL_HOST_CLIENT
+'''
+import asyncio
+import functools
+import multiprocessing
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any
+
+# Environment variables used to pass model host address to websocket worker processes
+MODEL_HOST_ADDRESS_ENV = 'WHISPER_MODEL_HOST_ADDRESS'
+MODEL_HOST_AUTHKEY_ENV = 'WHISPER_MODEL_HOST_AUTHKEY'
+
+# Thread pools of model host, shared by all connections, keyed by model key and max workers
+_host_executors: dict[tuple[str, int], ThreadPoolExecutor] = {}
+_host_executors_lock = threading.Lock()
+
+
+def handle_model_host_connection(connection: Connection) -> None:
+    '''
+    Runs requests received from a worker process until it disconnects.
+    Requests for the same model share a thread pool, limiting concurrent inferences per model
+    across all workers.
+
+    Parameters:
+    connection  (Connection): Connection to worker process
+    '''
+    send_lock = threading.Lock()
+
+    def respond(request_id: int, future: Future) -> None:
+        error = future.exception()
+        with send_lock:
+            try:
+                connection.send((request_id, error, None if error else future.result()))
+            except OSError:
+                # Worker disconnected
+                pass
+            except Exception as send_error:  # pylint: disable=broad-exception-caught
+                connection.send((request_id, RuntimeError(repr(send_error)), None))
+
+    while True:
+        try:
+            request_id, key, max_workers, fun, args = connection.recv()
+        except (EOFError, OSError):
+            connection.close()
+            return
+
+        with _host_executors_lock:
+            if (key, max_workers) not in _host_executors:
+                _host_executors[(key, max_workers)] = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix='inference')
+            executor = _host_executors[(key, max_workers)]
+        executor.submit(fun, *args).add_done_callback(
+            functools.partial(respond, request_id))
+
+
+def serve_model_host(address: str, authkey: bytes) -> None:
+    '''
+    Accepts connections from worker processes forever. Each connection is served on its
+    own thread.
+
+    Parameters:
+    address (str)  : Path of unix socket to listen on
+    authkey (bytes): Key worker processes must authenticate with
+    '''
+    with Listener(address, family='AF_UNIX', authkey=authkey) as listener:
+        while True:
+            connection = listener.accept()
+            threading.Thread(
+                target=handle_model_host_connection,
+                args=(connection,),
+                daemon=True
+            ).start()
+
+
+def start_model_host() -> multiprocessing.Process:
+    '''
+    Starts model host process and sets environment variables so processes started afterwards,
+    e.g. uvicorn workers, connect to it. The model host exits with the current process.
+
+    Returns:
+    Model host process
+    '''
+    address = os.path.join(tempfile.gettempdir(), f'whisper-model-host-{os.getpid()}.sock')
+    authkey = secrets.token_bytes(16)
+
+    process = multiprocessing.get_context('spawn').Process(
+        target=serve_model_host,
+        args=(address, authkey),
+        name='model-host',
+        daemon=True
+    )
+    process.start()
+
+    os.environ[MODEL_HOST_ADDRESS_ENV] = address
+    os.environ[MODEL_HOST_AUTHKEY_ENV] = authkey.hex()
+    return process
+
+
+class ModelHostClient:
+    '''
+    Sends inference requests from a worker process to the model host.
+    Connects on first use using the address set by start_model_host().
+    '''
+    __slots__ = ['connection', 'lock', 'connect_lock', 'send_lock', 'pending', 'next_request_id']
+    CONNECT_TIMEOUT_SEC = 30
+
+    def __init__(self):
+        self.connection: Connection | None = None
+        self.lock = threading.Lock()
+        # Held while connecting, which can take a while. Never taken from the event loop
+        self.connect_lock = threading.Lock()
+        self.send_lock = threading.Lock()
+        # Maps request id to event loop and future waiting for response
+        self.pending: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self.next_request_id = 0
+
+    def connect(self) -> Connection:
+        '''
+        Connects to model host if not connected, waiting for it to start listening.
+
+        Returns:
+        Connection to model host
+        '''
+        with self.connect_lock:
+            with self.lock:
+                if self.connection is not None:
+                    return self.connection
+
+            address = os.environ[MODEL_HOST_ADDRESS_ENV]
+            authkey = bytes.fromhex(os.environ[MODEL_HOST_AUTHKEY_ENV])
+            deadline = time.monotonic() + self.CONNECT_TIMEOUT_SEC
+            while True:
+                try:
+                    connection = Client(address, family='AF_UNIX', authkey=authkey)
+                    break
+                except (FileNotFoundError, ConnectionRefusedError):
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.1)
+
+            with self.lock:
+                self.connection = connection
+            threading.Thread(
+                target=self._read_responses,
+                args=(connection,),
+                name='model-host-client',
+                daemon=True
+            ).start()
+            return connection
+
+    async def run(self, key: str, max_workers: int, fun: Callable[..., Any], *args: Any) -> Any:
+        '''
+        Runs fun(*args) on model host without blocking the event loop.
+        fun and args must be picklable.
+
+        Parameters:
+        key         (str)     : Key identifying shared model
+        max_workers (int)     : Maximum number of concurrent inferences for model
+        fun         (function): Function to run
+        *args                 : Arguments passed to fun
+
+        Returns:
+        Return value of fun
+        '''
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.lock:
+            request_id = self.next_request_id
+            self.next_request_id += 1
+            self.pending[request_id] = (loop, future)
+
+        try:
+            # Pickling and sending audio can take a while, keep event loop free
+            await asyncio.to_thread(self._send, (request_id, key, max_workers, fun, args))
+        except BaseException:
+            with self.lock:
+                self.pending.pop(request_id, None)
+            raise
+        return await future
+
+    def _send(self, request: tuple) -> None:
+        '''
+        Sends a request to model host.
+
+        Parameters:
+        request (tuple): (request id, key, max workers, function, args) tuple
+        '''
+        connection = self.connect()
+        with self.send_lock:
+            connection.send(request)
+
+    def _read_responses(self, connection: Connection) -> None:
+        '''
+        Resolves pending futures with responses from model host until connection closes.
+
+        Parameters:
+        connection  (Connection): Connection to model host
+        '''
+        while True:
+            try:
+                request_id, error, result = connection.recv()
+            except (EOFError, OSError):
+                break
+            with self.lock:
+                waiting = self.pending.pop(request_id, None)
+            if waiting is not None:
+                loop, future = waiting
+                loop.call_soon_threadsafe(_resolve_future, future, error, result)
+
+        # Fail requests still waiting, next request reconnects
+        with self.lock:
+            if self.connection is connection:
+                self.connection = None
+            pending = list(self.pending.values())
+            self.pending.clear()
+        for loop, future in pending:
+            loop.call_soon_threadsafe(
+                _resolve_future, future, ConnectionError('Model host disconnected'), None)
+
+
+def _resolve_future(future: asyncio.Future, error: BaseException | None, result: Any) -> None:
+    '''
+    Sets result or exception of future unless it was cancelled.
+
+    Parameters:
+    future  (Future)       : Future to resolve
+    error   (BaseException): Exception raised by request, None if it succeeded
+    result  (Any)          : Result of request
+    '''
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+# Client used by model_host inference executors in this process
+MODEL_HOST_CLIENT = ModelHostClient()
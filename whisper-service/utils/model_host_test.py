@@ -0,0 +1,113 @@
+'''
+Unit tests for model host and ModelHostClient class
+'''
+import asyncio
+import os
+import threading
+import time
+import pytest
+from custom_types.config_types import InferenceExecutorKind
+from utils.inference_executor import InferenceExecutor
+from utils.model_host import \
+    MODEL_HOST_ADDRESS_ENV, MODEL_HOST_AUTHKEY_ENV, ModelHostClient, serve_model_host
+
+
+def host_inference(duration: float) -> tuple[int, str]:
+    '''
+    Fake inference that reports which process and thread ran it
+    '''
+    time.sleep(duration)
+    return os.getpid(), threading.current_thread().name
+
+
+def failing_inference() -> None:
+    '''
+    Fake inference that raises an error
+    '''
+    raise ValueError('inference failed')
+
+
+@pytest.fixture(name='model_host')
+def fixture_model_host(tmp_path, monkeypatch):
+    '''
+    Serves model host on a background thread and points clients at it
+    '''
+    address = str(tmp_path / 'host.sock')
+    authkey = b'test-authkey'
+    threading.Thread(target=serve_model_host, args=(address, authkey), daemon=True).start()
+
+    monkeypatch.setenv(MODEL_HOST_ADDRESS_ENV, address)
+    monkeypatch.setenv(MODEL_HOST_AUTHKEY_ENV, authkey.hex())
+    return address
+
+
+@pytest.mark.asyncio
+async def test_runs_on_model_host(model_host):  # pylint: disable=unused-argument
+    '''
+    Test that requests run on model host executor threads and return results
+    '''
+    client = ModelHostClient()
+
+    _, thread_name = await client.run('model', 1, host_inference, 0)
+
+    assert thread_name.startswith('inference'), 'Ran on model host executor thread'
+
+
+@pytest.mark.asyncio
+async def test_connect_does_not_block_loop(tmp_path, monkeypatch):
+    '''
+    Test that waiting for model host to start does not hold the lock taken on the event loop
+    '''
+    address = str(tmp_path / 'host.sock')
+    authkey = b'test-authkey'
+    monkeypatch.setenv(MODEL_HOST_ADDRESS_ENV, address)
+    monkeypatch.setenv(MODEL_HOST_AUTHKEY_ENV, authkey.hex())
+    client = ModelHostClient()
+
+    request = asyncio.create_task(client.run('model', 1, host_inference, 0))
+    await asyncio.sleep(0.3)
+    assert not client.lock.locked(), 'Lock is free while connecting'
+
+    threading.Thread(target=serve_model_host, args=(address, authkey), daemon=True).start()
+    _, thread_name = await request
+    assert thread_name.startswith('inference')
+
+
+@pytest.mark.asyncio
+async def test_propagates_errors(model_host):  # pylint: disable=unused-argument
+    '''
+    Test that errors raised on model host are raised by client
+    '''
+    client = ModelHostClient()
+
+    with pytest.raises(ValueError, match='inference failed'):
+        await client.run('model', 1, failing_inference)
+    assert await client.run('model', 1, host_inference, 0), 'Connection still usable'
+
+
+@pytest.mark.asyncio
+async def test_shares_concurrency_limit(model_host):  # pylint: disable=unused-argument
+    '''
+    Test that clients of different workers share the per model concurrency limit
+    '''
+    clients = [ModelHostClient(), ModelHostClient()]
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client.run('shared', 1, host_inference, 0.2) for client in clients])
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= 0.4, 'Requests from both clients ran one at a time'
+
+
+@pytest.mark.asyncio
+async def test_model_host_executor(model_host):  # pylint: disable=unused-argument
+    '''
+    Test that model_host inference executors run inference on model host
+    '''
+    executor = InferenceExecutor(InferenceExecutorKind.MODEL_HOST, 1, 'executor-model')
+
+    pid, thread_name = await executor.run(host_inference, 0)
+    executor.shutdown()
+
+    assert pid == os.getpid(), 'Model host served from this process in test'
+    assert thread_name.startswith('inference'), 'Ran on model host executor thread'
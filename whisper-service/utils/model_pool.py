@@ -0,0 +1,198 @@
+'''
+A process wide pool for sharing loaded models between websocket sessions
+
+Classes:
+    ModelPool
+
+Functions:
+    model_pool_key
+
+Variables:
+    MODEL_POOL
+'''
+import json
+import logging
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+def model_pool_key(implementation_id: str, config: dict) -> str:
+    '''
+    Builds a key identifying a model in the pool.
+    Sessions using the same implementation with an identical configuration share a key.
+
+    Parameters:
+    implementation_id (str) : Identifier of model implementation
+    config            (dict): Implementation configuration of model
+
+    Returns:
+    Hashable key for ModelPool
+    '''
+    return f'{implementation_id}:{json.dumps(config, sort_keys=True)}'
+
+
+class _PoolEntry:  # pylint: disable=too-few-public-methods
+    '''
+    Bookkeeping for a single model held by ModelPool.
+    '''
+    __slots__ = ['model', 'unload_fun', 'references', 'unload_timer', 'loaded']
+
+    def __init__(self, unload_fun: Callable[[Any], None] | None):
+        self.model = None
+        self.unload_fun = unload_fun
+        self.references = 0
+        self.unload_timer: threading.Timer | None = None
+        self.loaded = threading.Event()
+
+
+class ModelPool:
+    '''
+    Loads each model once and hands out references to it.
+    References are counted and models without references are unloaded
+    after being idle for idle_ttl seconds.
+    '''
+    __slots__ = ['idle_ttl', 'entries', 'lock', 'logger']
+
+    def __init__(self, idle_ttl: float = 0):
+        '''
+        Parameters:
+        idle_ttl (float): Seconds an unreferenced model is kept loaded before being unloaded
+        '''
+        self.idle_ttl = idle_ttl
+        self.entries: dict[Hashable, _PoolEntry] = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger('uvicorn.error')
+
+    def acquire(
+        self,
+        key: Hashable,
+        load_fun: Callable[[], Any],
+        unload_fun: Callable[[Any], None] | None = None
+    ) -> Any:
+        '''
+        Gets a reference to the model identified by key, loading it if needed.
+        Every call to acquire() must be matched by a call to release().
+
+        Parameters:
+        key         (Hashable): Key identifying model, see model_pool_key()
+        load_fun    (function): Function that loads and returns the model (must not be None)
+        unload_fun  (function): (Optional) Function called with the model to free its resources
+
+        Returns:
+        The loaded model
+        '''
+        with self.lock:
+            entry = self.entries.get(key)
+            should_load = entry is None
+            if should_load:
+                entry = _PoolEntry(unload_fun)
+                self.entries[key] = entry
+            entry.references += 1
+            if entry.unload_timer is not None:
+                entry.unload_timer.cancel()
+                entry.unload_timer = None
+
+        if should_load:
+            # Load outside of lock so other models can be acquired in the meantime
+            self.logger.info('Loading pooled model: %s', key)
+            try:
+                entry.model = load_fun()
+            finally:
+                if entry.model is None:
+                    with self.lock:
+                        del self.entries[key]
+                entry.loaded.set()
+        else:
+            entry.loaded.wait()
+            if entry.model is None:
+                raise RuntimeError(f'Pooled model failed to load: {key}')
+
+        return entry.model
+
+    def release(self, key: Hashable) -> None:
+        '''
+        Releases a reference obtained by acquire().
+        Model is unloaded once it has no references for idle_ttl seconds.
+
+        Parameters:
+        key (Hashable): Key identifying model
+        '''
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.references == 0:
+                raise KeyError(f'Model is not acquired: {key}')
+
+            entry.references -= 1
+            if entry.references > 0:
+                return
+
+            if self.idle_ttl > 0:
+                entry.unload_timer = threading.Timer(
+                    self.idle_ttl, self._unload_if_idle, args=(key, entry)
+                )
+                entry.unload_timer.daemon = True
+                entry.unload_timer.start()
+                return
+
+        self._unload_if_idle(key, entry)
+
+    def references(self, key: Hashable) -> int:
+        '''
+        Parameters:
+        key (Hashable): Key identifying model
+
+        Returns:
+        Number of references currently held to model
+        '''
+        with self.lock:
+            entry = self.entries.get(key)
+            return 0 if entry is None else entry.references
+
+    def is_loaded(self, key: Hashable) -> bool:
+        '''
+        Parameters:
+        key (Hashable): Key identifying model
+
+        Returns:
+        True if model is resident in pool, False otherwise
+        '''
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and entry.loaded.is_set()
+
+    def unload_idle(self) -> None:
+        '''
+        Immediately unloads all models without references.
+        '''
+        with self.lock:
+            idle = [
+                (key, entry) for key, entry in self.entries.items()
+                if entry.references == 0
+            ]
+        for key, entry in idle:
+            self._unload_if_idle(key, entry)
+
+    def _unload_if_idle(self, key: Hashable, entry: _PoolEntry) -> None:
+        '''
+        Unloads model if it has not been acquired again since being released.
+
+        Parameters:
+        key     (Hashable)  : Key identifying model
+        entry   (_PoolEntry): Entry that was idle when unload was scheduled
+        '''
+        with self.lock:
+            if self.entries.get(key) is not entry or entry.references > 0:
+                return
+            if entry.unload_timer is not None:
+                entry.unload_timer.cancel()
+                entry.unload_timer = None
+            del self.entries[key]
+
+        self.logger.info('Unloading idle pooled model: %s', key)
+        if entry.unload_fun is not None:
+            entry.unload_fun(entry.model)
+
+
+# Pool shared by all sessions in this process
+MODEL_POOL = ModelPool()
@@ -0,0 +1,110 @@
+'''
+Unit tests for ModelPool class
+'''
+import time
+import pytest
+from pytest_mock import MockerFixture
+from utils.model_pool import ModelPool, model_pool_key
+
+
+def test_loads_model_once(mocker: MockerFixture):
+    '''
+    Test that a model is loaded once and shared between references
+    '''
+    pool = ModelPool()
+    model = object()
+    load_fun = mocker.Mock(return_value=model)
+
+    assert pool.acquire('key', load_fun) is model
+    assert pool.acquire('key', load_fun) is model
+
+    load_fun.assert_called_once()
+    assert pool.references('key') == 2, 'Counts references'
+
+
+def test_unloads_model_after_last_release(mocker: MockerFixture):
+    '''
+    Test that model is only unloaded once all references are released
+    '''
+    pool = ModelPool(idle_ttl=0)
+    model = object()
+    unload_fun = mocker.Mock()
+
+    pool.acquire('key', lambda: model, unload_fun)
+    pool.acquire('key', lambda: model, unload_fun)
+
+    pool.release('key')
+    unload_fun.assert_not_called()
+    assert pool.is_loaded('key'), 'Model still loaded'
+
+    pool.release('key')
+    unload_fun.assert_called_once_with(model)
+    assert not pool.is_loaded('key'), 'Model unloaded'
+
+
+def test_unloads_idle_model_after_ttl(mocker: MockerFixture):
+    '''
+    Test that idle models are kept for idle_ttl seconds before being unloaded
+    '''
+    pool = ModelPool(idle_ttl=0.05)
+    unload_fun = mocker.Mock()
+
+    pool.acquire('key', object, unload_fun)
+    pool.release('key')
+    assert pool.is_loaded('key'), 'Model kept while within TTL'
+
+    time.sleep(0.2)
+    unload_fun.assert_called_once()
+    assert not pool.is_loaded('key'), 'Model unloaded after TTL'
+
+
+def test_reacquire_cancels_unload(mocker: MockerFixture):
+    '''
+    Test that acquiring an idle model keeps it loaded
+    '''
+    pool = ModelPool(idle_ttl=0.05)
+    load_fun = mocker.Mock(return_value=object())
+    unload_fun = mocker.Mock()
+
+    pool.acquire('key', load_fun, unload_fun)
+    pool.release('key')
+    pool.acquire('key', load_fun, unload_fun)
+
+    time.sleep(0.2)
+    unload_fun.assert_not_called()
+    load_fun.assert_called_once()
+
+
+def test_failed_load_is_not_pooled():
+    '''
+    Test that a model that fails to load can be loaded again
+    '''
+    pool = ModelPool()
+
+    def failing_load():
+        raise RuntimeError('Load failed')
+
+    with pytest.raises(RuntimeError):
+        pool.acquire('key', failing_load)
+    assert not pool.is_loaded('key')
+
+    model = object()
+    assert pool.acquire('key', lambda: model) is model
+
+
+def test_release_unacquired_model():
+    '''
+    Test that releasing a model that was not acquired raises
+    '''
+    pool = ModelPool()
+    with pytest.raises(KeyError):
+        pool.release('key')
+
+
+def test_model_pool_key():
+    '''
+    Test that keys only depend on implementation and configuration contents
+    '''
+    assert model_pool_key('impl', {'a': 1, 'b': 2}) == model_pool_key('impl', {'b': 2, 'a': 1})
+    assert model_pool_key('impl', {'a': 1}) != model_pool_key('impl', {'a': 2})
+    assert model_pool_key('impl', {'a': 1}) != model_pool_key('other', {'a': 1})
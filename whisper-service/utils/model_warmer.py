@@ -0,0 +1,148 @@
+'''
+Loads configured models in parallel at startup and keeps pinned models warm
+
+Classes:
+    ModelWarmer
+
+Variables:
+    MODEL_WARMER
+'''
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from custom_types.config_types import \
+    DeviceConfig, ModelConfig, ModelImplementationId, ModelReadiness
+from model_bases.transcription_model_base import TranscriptionModelBase
+
+
+class ModelWarmer:
+    '''
+    Loads every configured model on background threads so the server can accept connections
+    while models load. Models are loaded through the model pool, so sessions requesting a model
+    that is still loading wait for the same load instead of loading it again.
+
+    Pinned models keep their reference to the pooled model for the lifetime of the process.
+    Other models are released after loading, so they stay resident until the model pool's
+    idle TTL expires.
+    '''
+    __slots__ = ['states', 'pinned_keys', 'pinned_models', 'lock', 'logger']
+
+    def __init__(self):
+        self.states: dict[str, ModelReadiness] = {}
+        self.pinned_keys: list[str] = []
+        self.pinned_models: dict[str, TranscriptionModelBase] = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger('uvicorn.error')
+
+    def start(
+        self,
+        device_config: DeviceConfig,
+        pinned_keys: list[str],
+        import_implementation_fun: Callable[[ModelImplementationId], type[TranscriptionModelBase]],
+        max_workers: int,
+        warm_all: bool = True
+    ) -> list[Future]:
+        '''
+        Starts loading models in device_config in the background.
+
+        Parameters:
+        device_config             (DeviceConfig): Validated device config
+        pinned_keys               (list[str])   : Model keys to keep loaded
+        import_implementation_fun (function)    : Function to import model implementations
+        max_workers               (int)         : Maximum number of models loaded at once
+        warm_all                  (bool)        : Also load models that are not pinned. If False,
+                                                  they are deferred until first requested
+
+        Returns:
+        Futures that complete once each model has been warmed up
+        '''
+        for key in pinned_keys:
+            if key not in device_config:
+                raise KeyError(f'Pinned model key not in device config: {key}')
+
+        keys_to_warm = [key for key in device_config if warm_all or key in pinned_keys]
+        with self.lock:
+            self.pinned_keys = list(pinned_keys)
+            for key in device_config:
+                self.states[key] = ModelReadiness.DEFERRED
+            for key in keys_to_warm:
+                self.states[key] = ModelReadiness.WARMING
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warmup')
+        futures = [
+            executor.submit(
+                self.warm_model,
+                key,
+                device_config[key],
+                key in pinned_keys,
+                import_implementation_fun
+            )
+            for key in keys_to_warm
+        ]
+        executor.shutdown(wait=False)
+        return futures
+
+    def warm_model(
+        self,
+        key: str,
+        model_config: ModelConfig,
+        pinned: bool,
+        import_implementation_fun: Callable[[ModelImplementationId], type[TranscriptionModelBase]]
+    ) -> None:
+        '''
+        Loads a model, keeping it loaded if it is pinned. Errors are logged and mark the
+        model as failed.
+
+        Parameters:
+        key                       (str)        : Model key
+        model_config              (ModelConfig): Validated config of model
+        pinned                    (bool)       : Whether to keep model loaded
+        import_implementation_fun (function)   : Function to import model implementations
+        '''
+        self.logger.info('Warming up model_key: %s', key)
+        try:
+            implementation = import_implementation_fun(model_config['implementation_id'])
+            model = implementation({}, model_config['implementation_configuration'])
+            model.load_model()
+            if pinned:
+                with self.lock:
+                    self.pinned_models[key] = model
+            else:
+                model.unload_model()
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.logger.exception('Failed to warm up model_key: %s', key)
+            with self.lock:
+                self.states[key] = ModelReadiness.FAILED
+            return
+
+        self.logger.info('Model_key: %s is ready', key)
+        with self.lock:
+            self.states[key] = ModelReadiness.READY
+
+    def readiness(self) -> dict[str, ModelReadiness]:
+        '''
+        Returns:
+        Readiness of each configured model
+        '''
+        with self.lock:
+            return dict(self.states)
+
+    def status(self) -> ModelReadiness:
+        '''
+        Returns:
+        FAILED if any pinned model failed to load, WARMING if any pinned model is still loading,
+        READY otherwise
+        '''
+        with self.lock:
+            pinned_states = [self.states[key] for key in self.pinned_keys]
+        if ModelReadiness.FAILED in pinned_states:
+            return ModelReadiness.FAILED
+        if ModelReadiness.WARMING in pinned_states:
+            return ModelReadiness.WARMING
+        return ModelReadiness.READY
+
+
+# Warmer for models served by this process
+MODEL_WARMER = ModelWarmer()
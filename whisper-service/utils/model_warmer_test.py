@@ -0,0 +1,104 @@
+'''
+Unit tests for ModelWarmer class
+'''
+import threading
+import pytest
+from custom_types.config_types import ModelReadiness
+from model_bases.transcription_model_base import TranscriptionModelBase
+from utils.model_warmer import ModelWarmer
+
+load_started = threading.Barrier(2, timeout=5)
+loaded_models = []
+unloaded_models = []
+
+
+class FakeModel(TranscriptionModelBase):
+    '''
+    Fake model that waits for another model to start loading, so loads must run in parallel
+    '''
+    @staticmethod
+    def validate_config(config):
+        return config
+
+    def load_model(self):
+        if self.config.get('fail'):
+            raise RuntimeError('Failed to load')
+        load_started.wait()
+        loaded_models.append(self.config['name'])
+
+    def unload_model(self):
+        unloaded_models.append(self.config['name'])
+
+    async def queue_audio_chunk(self, audio_chunk):
+        return None
+
+
+def make_device_config(*configs):
+    '''
+    Create device config with a model for each implementation config
+    '''
+    return {
+        config['name']: {
+            'display_name': config['name'],
+            'description': config['name'],
+            'implementation_id': 'fake',
+            'implementation_configuration': config,
+            'available_features': {}
+        }
+        for config in configs
+    }
+
+
+def test_warms_models_in_parallel():
+    '''
+    Test that models load in parallel and only pinned models stay loaded
+    '''
+    warmer = ModelWarmer()
+    device_config = make_device_config({'name': 'a'}, {'name': 'b'})
+
+    futures = warmer.start(device_config, ['a'], lambda _: FakeModel, 2)
+    assert warmer.status() in (ModelReadiness.WARMING, ModelReadiness.READY)
+    for future in futures:
+        future.result()
+
+    assert sorted(loaded_models) == ['a', 'b']
+    assert unloaded_models == ['b'], 'Pinned model kept loaded'
+    assert warmer.readiness() == {'a': ModelReadiness.READY, 'b': ModelReadiness.READY}
+    assert warmer.status() == ModelReadiness.READY
+
+
+def test_reports_failed_pinned_model():
+    '''
+    Test that failed loads are reported without raising
+    '''
+    warmer = ModelWarmer()
+    device_config = make_device_config({'name': 'c', 'fail': True})
+
+    for future in warmer.start(device_config, ['c'], lambda _: FakeModel, 1):
+        future.result()
+
+    assert warmer.readiness() == {'c': ModelReadiness.FAILED}
+    assert warmer.status() == ModelReadiness.FAILED
+
+
+def test_rejects_unknown_pinned_key():
+    '''
+    Test that pinned keys must be in device config
+    '''
+    with pytest.raises(KeyError):
+        ModelWarmer().start({}, ['missing'], lambda _: FakeModel, 1)
+
+
+def test_defers_unpinned_models():
+    '''
+    Test that only pinned models are loaded if warm_all is False
+    '''
+    warmer = ModelWarmer()
+    device_config = make_device_config({'name': 'd', 'fail': True}, {'name': 'e', 'fail': True})
+
+    futures = warmer.start(device_config, ['d'], lambda _: FakeModel, 1, warm_all=False)
+    for future in futures:
+        future.result()
+
+    assert len(futures) == 1
+    assert warmer.readiness() == {'d': ModelReadiness.FAILED, 'e': ModelReadiness.DEFERRED}
@@ -6,39 +6,75 @@ Classes:
 '''
 import numpy as np
 import numpy.typing as npt
+from utils.shared_array import SharedArrayRef, create_shared_array
 
 
 class NPCircularBuffer:
     '''
     An implementation of a fixed length circular buffer numpy array.
+
+    By default, shifting the buffer rolls the whole backing array. In ring mode, the backing
+    array is twice max_size so that shifting only moves the start index. Elements are moved back
+    to the front of the backing array only once appending reaches its end, which costs at most
+    max_size copies for every max_size appended elements. In both modes, get_curr_buffer()
+    returns a contiguous view without copying.
+
+    In shared mode, the backing array is a memory mapped file, so views of the buffer can be
+    passed to other processes as SharedArrayRefs. Shared mode requires ring mode, since rolling
+    replaces the backing array.
     '''
-    __slots__ = ['dtype', 'max_size', 'array', 'end']
+    __slots__ = ['dtype', 'max_size', 'ring', 'array', 'start', 'end', 'shared_path']
 
-    def __init__(self, max_size: int, dtype: npt.DTypeLike = 'int'):
+    def __init__(
+        self,
+        max_size: int,
+        dtype: npt.DTypeLike = 'int',
+        ring: bool = False,
+        shared: bool = False
+    ):
         '''
         Parameters:
         max_size    (int)        : Maximum number of elements circular buffer should hold
         dtype       (numpy dtype): Data type of elements to place in buffer
+        ring        (bool)       : Shift buffer by moving indices instead of rolling array
+        shared      (bool)       : Place backing array in shared memory
         '''
+        assert ring or not shared, "Shared buffer must be a ring buffer"
         self.dtype = dtype
         self.max_size = max_size
+        self.ring = ring
 
-        self.array = np.empty((max_size), dtype=self.dtype)
+        size = 2 * max_size if ring else max_size
+        self.shared_path: str | None = None
+        if shared:
+            self.array, self.shared_path = create_shared_array(size, self.dtype)
+        else:
+            self.array = np.empty(size, dtype=self.dtype)
+        self.start = 0
         self.end = 0
 
-    def append_sequence(self, sequence: npt.NDArray) -> npt.NDArray:
+    def append_sequence(self, sequence: npt.NDArray, scale: float | None = None) -> npt.NDArray:
         '''
         Append a sequence to the end of the circular buffer.
         Attempts to append as many elements as possible, returns elements that were not appended.
 
         Parameters:
         sequence    (numpy array): Numpy array to append to buffer
+        scale       (float)      : If provided, elements are converted to the buffer's dtype and
+                                   multiplied by scale in a single pass while being appended
 
         Returns:
         Numpy array containing elements that were not appended in the same order as provided.
         '''
-        len_to_copy = min(self.max_size - self.end, len(sequence))
-        self.array[self.end:self.end + len_to_copy] = sequence[:len_to_copy]
+        len_to_copy = min(self.max_size - len(self), len(sequence))
+        if self.end + len_to_copy > len(self.array):
+            self._compact()
+
+        tail = self.array[self.end:self.end + len_to_copy]
+        if scale is None:
+            tail[:] = sequence[:len_to_copy]
+        else:
+            np.multiply(sequence[:len_to_copy], scale, out=tail, dtype=self.array.dtype)
         self.end += len_to_copy
 
         return sequence[len_to_copy:]
@@ -48,7 +84,32 @@ class NPCircularBuffer:
         Returns:
         A numpy view of the current elements in buffer
         '''
-        return self.array[:self.end]
+        return self.array[self.start:self.end]
+
+    def shared_ref(self, view: npt.NDArray) -> SharedArrayRef | None:
+        '''
+        Converts a contiguous view of the buffer into a reference other processes can read it
+        through. The referenced elements change if the buffer is appended to or shifted.
+
+        Parameters:
+        view    (numpy array): View of backing array, e.g. from get_curr_buffer()
+
+        Returns:
+        Reference to view, None if buffer is not shared or view is not a contiguous view of
+        the backing array
+        '''
+        if self.shared_path is None or not view.flags.c_contiguous:
+            return None
+
+        itemsize = self.array.itemsize
+        byte_offset = view.__array_interface__['data'][0] - \
+            self.array.__array_interface__['data'][0]
+        if byte_offset < 0 or byte_offset % itemsize or view.dtype != self.array.dtype:
+            return None
+        offset = byte_offset // itemsize
+        if offset + len(view) > len(self.array):
+            return None
+        return SharedArrayRef(self.shared_path, self.array.dtype.str, offset, len(view))
 
     def shift_buffer(self, shift: int) -> None:
         '''
@@ -61,13 +122,28 @@ class NPCircularBuffer:
         assert isinstance(shift, int), "Shift must be an integer"
         assert shift >= 0, "Shift must be nonnegative"
 
-        shift = min(self.end, shift)
-        self.array = np.roll(self.array, -shift)
-        self.end -= shift
+        shift = min(len(self), shift)
+        if self.ring:
+            self.start += shift
+            if self.start == self.end:
+                self.start = 0
+                self.end = 0
+        else:
+            self.array = np.roll(self.array, -shift)
+            self.end -= shift
+
+    def _compact(self) -> None:
+        '''
+        Moves current elements to the front of the backing array to make room for appending.
+        '''
+        length = len(self)
+        self.array[:length] = self.array[self.start:self.end]
+        self.start = 0
+        self.end = length
 
     def __len__(self) -> int:
         '''
         Returns:
         Length of current buffer
         '''
-        return self.end
+        return self.end - self.start
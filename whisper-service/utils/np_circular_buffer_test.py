@@ -2,14 +2,17 @@
 Unit tests for NPCircularBuffer class
 '''
 import numpy as np
+import pytest
 from utils.np_circular_buffer import NPCircularBuffer
+from utils.shared_array import read_shared_array
 
 
-def test_single_element_append():
+@pytest.mark.parametrize('ring', [False, True])
+def test_single_element_append(ring):
     '''
     Tests appending one elements at a time to buffer
     '''
-    buffer = NPCircularBuffer(2)
+    buffer = NPCircularBuffer(2, ring=ring)
 
     assert np.array_equal(
         buffer.append_sequence(np.array([1])),
@@ -39,11 +42,12 @@ def test_single_element_append():
     ), "Correct sequence in buffer"
 
 
-def test_multi_element_append():
+@pytest.mark.parametrize('ring', [False, True])
+def test_multi_element_append(ring):
     '''
     Tests appending multiple elements at a time to buffer
     '''
-    buffer = NPCircularBuffer(7)
+    buffer = NPCircularBuffer(7, ring=ring)
 
     assert np.array_equal(
         buffer.append_sequence(np.array([1, 2, 3])),
@@ -73,11 +77,12 @@ def test_multi_element_append():
     ), "Correct sequence in buffer"
 
 
-def test_shift_buffer():
+@pytest.mark.parametrize('ring', [False, True])
+def test_shift_buffer(ring):
     '''
     Tests shifting out elements from the buffer
     '''
-    buffer = NPCircularBuffer(10)
+    buffer = NPCircularBuffer(10, ring=ring)
 
     buffer.append_sequence(np.array([1, 2, 3, 4, 5, 6, 7, 8, 9]))
     buffer.shift_buffer(1)
@@ -99,11 +104,12 @@ def test_shift_buffer():
     ), "Correct sequence in buffer"
 
 
-def test_len():
+@pytest.mark.parametrize('ring', [False, True])
+def test_len(ring):
     '''
     Tests that buffer returns correct length
     '''
-    buffer = NPCircularBuffer(5)
+    buffer = NPCircularBuffer(5, ring=ring)
 
     assert len(buffer) == 0, "Reports correct length"
 
@@ -120,11 +126,12 @@ def test_len():
     assert len(buffer) == 2, "Reports correct length"
 
 
-def test_shift_and_append():
+@pytest.mark.parametrize('ring', [False, True])
+def test_shift_and_append(ring):
     '''
     Test combinations of shifts and appends to buffer
     '''
-    buffer = NPCircularBuffer(10)
+    buffer = NPCircularBuffer(10, ring=ring)
 
     buffer.append_sequence(np.array([1, 2, 3, 4, 5]))
     assert np.array_equal(
@@ -174,3 +181,76 @@ def test_shift_and_append():
         buffer.get_curr_buffer(),
         np.array([])
     ), "Correct sequence in buffer"
+
+
+def test_ring_wraps_backing_array():
+    '''
+    Tests that ring mode keeps a contiguous view while repeatedly shifting and appending
+    '''
+    buffer = NPCircularBuffer(4, ring=True)
+    expected = []
+
+    for i in range(0, 40, 3):
+        buffer.append_sequence(np.arange(i, i + 3))
+        expected = (expected + list(range(i, i + 3)))[:4]
+        assert np.array_equal(
+            buffer.get_curr_buffer(),
+            np.array(expected)
+        ), "Correct sequence in buffer"
+
+        buffer.shift_buffer(2)
+        expected = expected[2:]
+        assert np.array_equal(
+            buffer.get_curr_buffer(),
+            np.array(expected)
+        ), "Correct sequence in buffer"
+
+
+def test_ring_buffer_returns_view():
+    '''
+    Tests that ring mode does not copy the buffer when shifting or reading
+    '''
+    buffer = NPCircularBuffer(4, ring=True)
+    backing_array = buffer.array
+
+    buffer.append_sequence(np.array([1, 2, 3, 4]))
+    buffer.shift_buffer(3)
+    buffer.append_sequence(np.array([5, 6]))
+
+    assert buffer.array is backing_array, "Backing array is reused"
+    assert np.shares_memory(buffer.get_curr_buffer(), backing_array), "Buffer is a view"
+
+
+@pytest.mark.parametrize('ring', [False, True])
+def test_scaled_append(ring):
+    '''
+    Tests converting and scaling elements while appending to buffer
+    '''
+    buffer = NPCircularBuffer(3, dtype=np.float32, ring=ring)
+
+    assert np.array_equal(
+        buffer.append_sequence(np.array([2, -4, 8, 16], dtype=np.int16), scale=0.5),
+        np.array([16])
+    ), "Unscaled remaining elements returned"
+    assert np.array_equal(
+        buffer.get_curr_buffer(),
+        np.array([1, -2, 4], dtype=np.float32)
+    ), "Correct sequence in buffer"
+
+
+def test_shared_ref():
+    '''
+    Tests that views of shared buffer are converted to references to the same elements
+    '''
+    buffer = NPCircularBuffer(4, dtype=np.float32, ring=True, shared=True)
+    buffer.append_sequence(np.array([1, 2, 3, 4], dtype=np.float32))
+    buffer.shift_buffer(1)
+
+    ref = buffer.shared_ref(buffer.get_curr_buffer())
+
+    assert ref is not None, "View of shared buffer has reference"
+    assert np.array_equal(read_shared_array(ref), [2, 3, 4]), "Reference reads view"
+    assert buffer.shared_ref(np.array([2, 3, 4], dtype=np.float32)) is None, \
+        "Arrays outside buffer have no reference"
+    assert NPCircularBuffer(4, ring=True).shared_ref(buffer.get_curr_buffer()) is None, \
+        "Unshared buffers have no references"
@@ -0,0 +1,166 @@
+'''
+Numpy arrays backed by memory mapped files, so processes running inference can read session
+audio without it being pickled and copied through a pipe.
+
+Classes:
+    SharedArrayRef
+
+Functions:
+    create_shared_array
+    read_shared_array
+    resolve_shared_array
+    process_exists
+    remove_orphaned_shared_arrays
+
+Variables:
+    SHARED_ARRAY_DIR
+    SHARED_ARRAY_PREFIX
+'''
+import os
+import tempfile
+import weakref
+import numpy as np
+import numpy.typing as npt
+
+# Files are placed in shared memory on Linux so mapping them never touches disk
+SHARED_ARRAY_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+# Names of files backing shared arrays start with this followed by the id of the creating process
+SHARED_ARRAY_PREFIX = 'whisper-audio-'
+
+
+class SharedArrayRef:  # pylint: disable=too-few-public-methods
+    '''
+    Small picklable reference to a contiguous slice of a shared array. Sending it to another
+    process only sends the file path and indices, the process maps the slice without copying.
+    '''
+    __slots__ = ['path', 'dtype', 'offset', 'length']
+
+    def __init__(self, path: str, dtype: str, offset: int, length: int):
+        '''
+        Parameters:
+        path    (str): Path of file backing shared array
+        dtype   (str): Data type of elements
+        offset  (int): Index of first element of slice
+        length  (int): Number of elements in slice
+        '''
+        self.path = path
+        self.dtype = dtype
+        self.offset = offset
+        self.length = length
+
+    def __len__(self) -> int:
+        '''
+        Returns:
+        Number of elements in slice
+        '''
+        return self.length
+
+
+def create_shared_array(size: int, dtype: npt.DTypeLike) -> tuple[npt.NDArray, str]:
+    '''
+    Allocates a 1D array backed by a new memory mapped file. The file is deleted once the
+    array and all views of it are garbage collected.
+
+    Space for the file is allocated up front, so running out of shared memory raises OSError
+    here instead of SIGBUS, killing the process, when the array is first written to.
+
+    Parameters:
+    size    (int)        : Number of elements in array
+    dtype   (numpy dtype): Data type of elements
+
+    Returns:
+    Array and path of file backing it
+    '''
+    file_descriptor, path = tempfile.mkstemp(
+        prefix=f'{SHARED_ARRAY_PREFIX}{os.getpid()}-', dir=SHARED_ARRAY_DIR)
+    try:
+        num_bytes = size * np.dtype(dtype).itemsize
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(file_descriptor, 0, num_bytes)
+        else:
+            os.ftruncate(file_descriptor, num_bytes)
+    except OSError:
+        os.unlink(path)
+        raise
+    finally:
+        os.close(file_descriptor)
+    # File already has its size, w+ would truncate it and lose the allocated space
+    mapped = np.memmap(path, dtype=dtype, mode='r+', shape=(size,))
+    weakref.finalize(mapped, os.unlink, path)
+    # Plain ndarray view, so slices and results of operations are not memmaps
+    return mapped.view(np.ndarray), path
+
+
+def read_shared_array(ref: SharedArrayRef) -> npt.NDArray:
+    '''
+    Maps slice referenced by ref as a read only array without copying.
+
+    Parameters:
+    ref (SharedArrayRef): Reference to slice of shared array
+
+    Returns:
+    Read only 1D numpy array viewing slice
+    '''
+    if ref.length == 0:
+        return np.empty(0, dtype=ref.dtype)
+    return np.memmap(
+        ref.path,
+        dtype=ref.dtype,
+        mode='r',
+        offset=ref.offset * np.dtype(ref.dtype).itemsize,
+        shape=(ref.length,)
+    ).view(np.ndarray)
+
+
+def resolve_shared_array(array: npt.NDArray | SharedArrayRef) -> npt.NDArray:
+    '''
+    Parameters:
+    array   (numpy array | SharedArrayRef): Array or reference to shared array
+
+    Returns:
+    array if it is a numpy array, otherwise the referenced slice
+    '''
+    if isinstance(array, SharedArrayRef):
+        return read_shared_array(array)
+    return array
+
+
+def process_exists(pid: int) -> bool:
+    '''
+    Parameters:
+    pid (int): Process id
+
+    Returns:
+    True if a process with pid is running
+    '''
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def remove_orphaned_shared_arrays() -> int:
+    '''
+    Deletes files backing shared arrays of processes that are no longer running. Files are
+    normally deleted when arrays are garbage collected, but are left behind by processes
+    that were killed, e.g. by SIGKILL or the OOM killer.
+
+    Returns:
+    Number of files deleted
+    '''
+    num_removed = 0
+    for name in os.listdir(SHARED_ARRAY_DIR):
+        if not name.startswith(SHARED_ARRAY_PREFIX):
+            continue
+        pid = name[len(SHARED_ARRAY_PREFIX):].split('-', 1)[0]
+        if not pid.isdigit() or process_exists(int(pid)):
+            continue
+        try:
+            os.unlink(os.path.join(SHARED_ARRAY_DIR, name))
+            num_removed += 1
+        except FileNotFoundError:
+            pass
+    return num_removed
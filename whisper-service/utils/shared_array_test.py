@@ -0,0 +1,120 @@
+'''
+Unit tests for shared array helpers
+'''
+import gc
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import numpy.typing as npt
+from utils import shared_array
+from utils.shared_array import \
+    SharedArrayRef, create_shared_array, read_shared_array, remove_orphaned_shared_arrays, \
+    resolve_shared_array
+
+
+def sum_shared_audio(audio: npt.NDArray | SharedArrayRef) -> float:
+    '''
+    Sums audio in a worker process
+    '''
+    return float(resolve_shared_array(audio).sum())
+
+
+def test_read_slice():
+    '''
+    Test that references read the slice of the shared array they refer to
+    '''
+    array, path = create_shared_array(10, np.float32)
+    array[:] = np.arange(10)
+
+    ref = SharedArrayRef(path, array.dtype.str, 3, 4)
+
+    assert np.array_equal(read_shared_array(ref), [3, 4, 5, 6]), 'Read referenced slice'
+    assert len(read_shared_array(SharedArrayRef(path, array.dtype.str, 3, 0))) == 0, \
+        'Read empty slice'
+
+
+def test_resolve_passes_arrays_through():
+    '''
+    Test that resolving a numpy array returns it unchanged
+    '''
+    array = np.arange(3)
+
+    assert resolve_shared_array(array) is array
+
+
+def test_ref_pickles_small():
+    '''
+    Test that pickled references do not contain the referenced audio
+    '''
+    array, path = create_shared_array(480_000, np.float32)
+
+    ref = SharedArrayRef(path, array.dtype.str, 0, len(array))
+
+    assert len(pickle.dumps(ref)) < 200, 'Only path and indices are pickled'
+
+
+def test_read_from_other_process():
+    '''
+    Test that another process reads writes made to shared array
+    '''
+    array, path = create_shared_array(1_000, np.float32)
+    array[:] = 0.5
+
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        total = executor.submit(
+            sum_shared_audio, SharedArrayRef(path, array.dtype.str, 0, 100)).result()
+
+    assert total == 50.0, 'Worker read shared audio'
+
+
+def test_file_deleted_when_collected():
+    '''
+    Test that file backing shared array is deleted once array and its views are collected
+    '''
+    array, path = create_shared_array(10, np.float32)
+    view = array[2:5]
+    del array
+    gc.collect()
+
+    assert os.path.exists(path), 'File kept while view exists'
+
+    del view
+    gc.collect()
+
+    assert not os.path.exists(path), 'File deleted'
+
+
+def test_space_allocated_up_front():
+    '''
+    Test that the file backing a shared array is not sparse, so writes cannot fail later
+    '''
+    array, path = create_shared_array(100_000, np.float32)
+
+    assert os.stat(path).st_blocks * 512 >= array.nbytes, 'All blocks allocated'
+    assert not array.any(), 'Array zeroed'
+
+
+def test_remove_orphaned(tmp_path, monkeypatch):
+    '''
+    Test that only files of processes that are no longer running are deleted
+    '''
+    monkeypatch.setattr(shared_array, 'SHARED_ARRAY_DIR', str(tmp_path))
+    with subprocess.Popen([sys.executable, '-c', '']) as exited:
+        exited.wait()
+
+    _, live_path = create_shared_array(10, np.float32)
+    orphaned_path = tmp_path / f'whisper-audio-{exited.pid}-abc'
+    orphaned_path.touch()
+    other_path = tmp_path / 'other-file'
+    other_path.touch()
+
+    assert remove_orphaned_shared_arrays() == 1
+    assert not orphaned_path.exists(), 'File of exited process deleted'
+    assert os.path.exists(live_path), 'File of this process kept'
+    assert other_path.exists(), 'Unrelated file kept'
@@ -0,0 +1,258 @@
+'''
+Streaming voice activity detection for buffered audio
+
+Classes:
+    StreamingVad
+
+Functions:
+    pad_speech_timestamps
+    speech_timestamps_from_probs
+'''
+import numpy as np
+import numpy.typing as npt
+from faster_whisper.vad import VadOptions, get_vad_model
+from utils.np_circular_buffer import NPCircularBuffer
+
+# Samples classified by each Silero VAD speech probability
+VAD_WINDOW_SAMPLES = 512
+# Samples of previous window passed to Silero VAD with each window
+VAD_CONTEXT_SAMPLES = 64
+
+
+def pad_speech_timestamps(
+    speeches: list[dict],
+    num_samples: int,
+    speech_pad_samples: float
+) -> None:
+    '''
+    Pads speech chunks the same way as faster whisper's get_speech_timestamps(), splitting
+    short silences between chunks.
+
+    Parameters:
+    speeches            (list[dict]): Speech chunks to pad in place
+    num_samples         (int)       : Number of samples of audio
+    speech_pad_samples  (float)     : Samples to pad each side of chunks with
+    '''
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech['start'] = int(max(0, speech['start'] - speech_pad_samples))
+        if i != len(speeches) - 1:
+            silence_duration = speeches[i + 1]['start'] - speech['end']
+            if silence_duration < 2 * speech_pad_samples:
+                speech['end'] += int(silence_duration // 2)
+                speeches[i + 1]['start'] = int(
+                    max(0, speeches[i + 1]['start'] - silence_duration // 2))
+            else:
+                speech['end'] = int(min(num_samples, speech['end'] + speech_pad_samples))
+                speeches[i + 1]['start'] = int(
+                    max(0, speeches[i + 1]['start'] - speech_pad_samples))
+        else:
+            speech['end'] = int(min(num_samples, speech['end'] + speech_pad_samples))
+
+
+def speech_timestamps_from_probs(
+    speech_probs: npt.NDArray[np.float32],
+    num_samples: int,
+    options: VadOptions,
+    offset: int = 0
+) -> list[dict]:
+    '''
+    Finds speech chunks from Silero VAD speech probabilities the same way as faster whisper's
+    get_speech_timestamps(). Chunks are not split by max_speech_duration_s.
+
+    Parameters:
+    speech_probs    (1D numpy array): Speech probability of each window of audio
+    num_samples     (int)           : Number of samples of audio
+    options         (VadOptions)    : VAD options
+    offset          (int)           : Sample of audio the first window starts at, at most 0
+
+    Returns:
+    List of dicts containing start and end samples of each speech chunk
+    '''
+    neg_threshold = options.neg_threshold
+    if neg_threshold is None:
+        neg_threshold = max(options.threshold - 0.15, 0.01)
+    min_speech_samples = 16_000 * options.min_speech_duration_ms / 1000
+    min_silence_samples = 16_000 * options.min_silence_duration_ms / 1000
+
+    speeches = []
+    start = None
+    # Start of silence that may end current speech chunk
+    temp_end = 0
+    for i, speech_prob in enumerate(speech_probs.tolist()):
+        sample = offset + i * VAD_WINDOW_SAMPLES
+        if speech_prob >= options.threshold:
+            temp_end = 0
+            if start is None:
+                start = sample
+        elif speech_prob < neg_threshold and start is not None:
+            if not temp_end:
+                temp_end = sample
+            if sample - temp_end >= min_silence_samples:
+                if temp_end - start > min_speech_samples:
+                    speeches.append({'start': start, 'end': temp_end})
+                start = None
+                temp_end = 0
+    if start is not None and num_samples - start > min_speech_samples:
+        speeches.append({'start': start, 'end': num_samples})
+
+    pad_speech_timestamps(speeches, num_samples, 16_000 * options.speech_pad_ms / 1000)
+    return speeches
+
+
+class StreamingVad:  # pylint: disable=too-many-instance-attributes
+    '''
+    Runs Silero VAD on a session's audio, keeping the speech probability of each window.
+    Each window is only classified once, instead of every time a decode window containing it
+    is filtered with vad_filter.
+
+    Appending audio only stores it, so it is cheap enough to run on the event loop. Windows
+    received since the previous call are classified by speech_timestamps(), which should be run
+    off the event loop.
+
+    Window w covers samples [w * 512, (w + 1) * 512) counted from the first appended sample.
+    The VAD's recurrent state is carried across windows, and reset if unclassified windows are
+    dropped. The window at the end of the received audio is classified with zero padding when
+    requested, without being stored. Window w is kept until samples after its end are dropped.
+    '''
+    __slots__ = ['options', 'model', 'speech_probs', 'first_window', 'pending_samples',
+                 'context', 'state', 'num_samples']
+
+    def __init__(self, max_samples: int, options: VadOptions | None = None):
+        '''
+        Parameters:
+        max_samples (int)       : Maximum number of samples kept at once, e.g. size of the
+                                  audio buffer
+        options     (VadOptions): VAD options used to find speech chunks
+        '''
+        self.options = options or VadOptions()
+        self.model = get_vad_model()
+        self.speech_probs = NPCircularBuffer(
+            max_samples // VAD_WINDOW_SAMPLES + 2, dtype=np.float32, ring=True)
+        # Absolute index of first window in speech_probs
+        self.first_window = 0
+        # Copies of appended samples that are not classified yet, starting at the end of the
+        # last classified window
+        self.pending_samples: list[npt.NDArray[np.float32]] = []
+        self.context = np.zeros(VAD_CONTEXT_SAMPLES, dtype=np.float32)
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.num_samples = 0
+
+    def classify(
+        self,
+        windows: npt.NDArray[np.float32],
+        state: npt.NDArray[np.float32]
+    ) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
+        '''
+        Parameters:
+        windows (2D numpy array): Consecutive windows of shape (n_windows, 512) following
+                                  previously classified windows
+        state   (3D numpy array): Recurrent state after previous window
+
+        Returns:
+        Speech probability of each window and recurrent state after last window
+        '''
+        contexts = np.concatenate(
+            (self.context[np.newaxis], windows[:-1, -VAD_CONTEXT_SAMPLES:]))
+        encoded = self.model.encoder_session.run(
+            None, {'input': np.concatenate((contexts, windows), axis=1)}
+        )[0].reshape(len(windows), 1, -1)
+
+        speech_probs = np.empty(len(windows), dtype=np.float32)
+        for i, window in enumerate(encoded):
+            out, state = self.model.decoder_session.run(
+                None, {'input': window, 'state': state})
+            speech_probs[i] = out.item()
+        return speech_probs, state
+
+    def append(self, samples: npt.NDArray[np.float32]) -> None:
+        '''
+        Stores a copy of samples to be classified by speech_timestamps().
+
+        Parameters:
+        samples (1D numpy array): Newly received audio normalized to [-1, 1]
+        '''
+        self.num_samples += len(samples)
+        self.pending_samples.append(np.array(samples, dtype=np.float32))
+
+    def classify_pending(self) -> npt.NDArray[np.float32]:
+        '''
+        Classifies complete windows of pending samples and stores their speech probabilities.
+
+        Returns:
+        Samples of the incomplete window at the end of the received audio
+        '''
+        samples = np.concatenate(self.pending_samples or [np.zeros(0, dtype=np.float32)])
+        num_windows = len(samples) // VAD_WINDOW_SAMPLES
+        if num_windows > 0:
+            windows = samples[:num_windows * VAD_WINDOW_SAMPLES].reshape(
+                num_windows, VAD_WINDOW_SAMPLES)
+            speech_probs, self.state = self.classify(windows, self.state)
+            extra_probs = self.speech_probs.append_sequence(speech_probs)
+            assert len(extra_probs) == 0, 'Samples must be dropped before VAD is full'
+            self.context = windows[-1, -VAD_CONTEXT_SAMPLES:].copy()
+
+        samples = samples[num_windows * VAD_WINDOW_SAMPLES:]
+        self.pending_samples = [samples]
+        return samples
+
+    def drop(self, num_samples: int) -> None:
+        '''
+        Drops windows ending before a sample, e.g. once it is purged from the audio buffer.
+        Pending samples of dropped windows are dropped without being classified.
+
+        Parameters:
+        num_samples (int): Number of samples since first appended sample to drop windows before
+        '''
+        first_window = num_samples // VAD_WINDOW_SAMPLES
+        classified_end = self.first_window + len(self.speech_probs)
+        if first_window > classified_end:
+            samples = np.concatenate(self.pending_samples)
+            self.pending_samples = [
+                samples[(first_window - classified_end) * VAD_WINDOW_SAMPLES:]]
+            # Audio before remaining samples is not known to VAD, like at start of session
+            self.context = np.zeros(VAD_CONTEXT_SAMPLES, dtype=np.float32)
+            self.state = np.zeros((2, 1, 128), dtype=np.float32)
+
+        self.speech_probs.shift_buffer(min(first_window, classified_end) - self.first_window)
+        self.first_window = first_window
+
+    def speech_timestamps(self, start_sample: int, end_sample: int) -> list[dict]:
+        '''
+        Classifies pending windows, then finds speech chunks of audio. Blocks until VAD is done,
+        so it should be run off the event loop.
+
+        Parameters:
+        start_sample    (int): Number of samples since first appended sample at start of audio
+        end_sample      (int): Number of samples since first appended sample at end of audio,
+                               equal to the number of appended samples
+
+        Returns:
+        List of dicts containing start and end samples of each speech chunk,
+        relative to start_sample
+        '''
+        start_window = start_sample // VAD_WINDOW_SAMPLES
+        assert start_window >= self.first_window, 'Windows were dropped'
+        assert end_sample == self.num_samples, 'Audio must end at last appended sample'
+
+        pending_samples = self.classify_pending()
+        speech_probs = self.speech_probs.get_curr_buffer()[start_window - self.first_window:]
+        if len(pending_samples) > 0:
+            # Window at end of received audio is padded with silence
+            window = np.zeros((1, VAD_WINDOW_SAMPLES), dtype=np.float32)
+            window[0, :len(pending_samples)] = pending_samples
+            speech_probs = np.concatenate((speech_probs, self.classify(window, self.state)[0]))
+
+        return speech_timestamps_from_probs(
+            speech_probs,
+            end_sample - start_sample,
+            self.options,
+            start_window * VAD_WINDOW_SAMPLES - start_sample
+        )
+
+    def __len__(self) -> int:
+        '''
+        Returns:
+        Number of classified windows kept
+        '''
+        return len(self.speech_probs)
@@ -0,0 +1,81 @@
+'''
+Unit tests for StreamingVad class
+'''
+import os
+import wave
+import numpy as np
+from pytest_mock import MockerFixture
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+from utils.streaming_vad import StreamingVad, speech_timestamps_from_probs
+
+
+def read_test_audio() -> np.ndarray:
+    '''
+    Read 5 seconds of speech, followed by 3 seconds of silence and 5 more seconds of speech
+    '''
+    chunks = []
+    for i in range(10):
+        file_path = os.path.join(
+            os.path.dirname(__file__),
+            f'../../test-audio-files/wikipedia-.fun/chunked/chunk_{i:03d}.wav'
+        )
+        with wave.open(file_path) as wav_file:
+            chunks.append(np.frombuffer(wav_file.readframes(wav_file.getnframes()), np.int16))
+    speech = np.concatenate(chunks).astype(np.float32) / 32768
+    return np.concatenate((speech[:80_000], np.zeros(48_000, np.float32), speech[80_000:]))
+
+
+def test_speech_timestamps_from_probs(mocker: MockerFixture):
+    '''
+    Test that speech chunks found from probabilities match get_speech_timestamps()
+    '''
+    rng = np.random.default_rng(0)
+    # Runs of speech and silence with random lengths
+    speech_probs = np.repeat(rng.uniform(0, 1, 40), rng.integers(1, 60, 40)).astype(np.float32)
+    num_samples = len(speech_probs) * 512 - 100
+    mocker.patch(
+        'faster_whisper.vad.get_vad_model',
+        return_value=lambda audio: speech_probs[np.newaxis]
+    )
+
+    for options in (VadOptions(), VadOptions(min_silence_duration_ms=500, speech_pad_ms=100)):
+        assert speech_timestamps_from_probs(speech_probs, num_samples, options) == \
+            get_speech_timestamps(np.zeros(num_samples, np.float32), options), \
+            'Same speech chunks as faster whisper'
+
+
+def test_streaming_matches_vad_filter():
+    '''
+    Test that classifying audio as it is appended finds the same speech chunks as running VAD
+    on the whole buffer, including after audio is dropped
+    '''
+    audio = read_test_audio()
+    vad = StreamingVad(len(audio))
+    for start in range(0, len(audio), 1_000):
+        vad.append(audio[start:start + 1_000])
+
+    speech_chunks = vad.speech_timestamps(0, len(audio))
+    assert len(speech_chunks) == 2, 'Silence splits speech'
+    assert speech_chunks == get_speech_timestamps(audio, VadOptions())
+
+    vad.drop(1_024)
+    assert len(vad) == len(audio) // 512 - 2, 'Windows before dropped samples dropped'
+    assert vad.speech_timestamps(1_024, len(audio)) == \
+        get_speech_timestamps(audio[1_024:], VadOptions()), \
+        'Speech chunks relative to start of remaining audio'
+
+
+def test_drop_unclassified():
+    '''
+    Test that samples dropped before being classified are skipped, and the remaining audio
+    is classified like the start of a session
+    '''
+    audio = read_test_audio()
+    vad = StreamingVad(len(audio))
+    vad.append(audio[:48_000])
+    vad.drop(40_960)
+    vad.append(audio[48_000:])
+
+    assert vad.speech_timestamps(40_960, len(audio)) == \
+        get_speech_timestamps(audio[40_960:], VadOptions())
+    assert len(vad) == (len(audio) - 40_960) // 512
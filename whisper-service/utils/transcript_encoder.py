@@ -0,0 +1,165 @@
+'''
+Encoders for transcript blocks sent over websockets
+
+Classes:
+    TranscriptEncoder
+    JsonTranscriptEncoder
+    BinaryTranscriptEncoder
+
+Functions:
+    common_prefix_length
+    create_transcript_encoder
+'''
+# pylint: disable=too-few-public-methods,too-many-arguments,too-many-positional-arguments
+import struct
+from abc import ABC, abstractmethod
+from custom_types.model_selection_types import TranscriptFormat
+from custom_types.transcription_types import BackendTranscriptBlock, BackendTranscriptionBlockType
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    '''
+    Parameters:
+    a   (str): First string
+    b   (str): Second string
+
+    Returns:
+    Number of leading characters a and b have in common
+    '''
+    # Binary search with slice comparisons, which run in C
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class TranscriptEncoder(ABC):
+    '''
+    Converts transcript blocks into websocket messages.
+    Encoders are created per websocket and keep the previous in progress text.
+
+    If in_progress_deltas is enabled, in progress blocks only contain the text following the
+    first keep characters (Unicode code points) of the previous in progress text sent on the
+    websocket. The receiver rebuilds the full text as previous_text[:keep] + text.
+    '''
+    __slots__ = ['in_progress_deltas', 'prev_in_progress_text']
+
+    def __init__(self, in_progress_deltas: bool = False):
+        '''
+        Parameters:
+        in_progress_deltas  (bool): Send in progress text as deltas against previous text
+        '''
+        self.in_progress_deltas = in_progress_deltas
+        self.prev_in_progress_text = ''
+
+    def encode(
+        self,
+        block_type: BackendTranscriptionBlockType,
+        text: str,
+        start: float,
+        end: float
+    ) -> BackendTranscriptBlock | bytes:
+        '''
+        Parameters:
+        block_type  (BackendTranscriptionBlockType): Whether block is final or in progress
+        text        (str)                          : Transcribed text
+        start       (float)                        : Start time of block
+        end         (float)                        : End time of block
+
+        Returns:
+        JSON serializable message or binary message to send
+        '''
+        keep = 0
+        if self.in_progress_deltas and block_type == BackendTranscriptionBlockType.IN_PROGRESS:
+            keep = common_prefix_length(self.prev_in_progress_text, text)
+            self.prev_in_progress_text = text
+        return self.encode_block(block_type, text[keep:], keep, start, end)
+
+    @abstractmethod
+    def encode_block(
+        self,
+        block_type: BackendTranscriptionBlockType,
+        text: str,
+        keep: int,
+        start: float,
+        end: float
+    ) -> BackendTranscriptBlock | bytes:
+        '''
+        Parameters:
+        block_type  (BackendTranscriptionBlockType): Whether block is final or in progress
+        text        (str)                          : Text, or text following kept characters
+        keep        (int)                          : Characters of previous in progress text kept
+        start       (float)                        : Start time of block
+        end         (float)                        : End time of block
+
+        Returns:
+        JSON serializable message or binary message to send
+        '''
+        raise NotImplementedError('Must implement per format')
+
+
+class JsonTranscriptEncoder(TranscriptEncoder):
+    '''
+    Encodes blocks as JSON objects. Objects only contain a keep property if in_progress_deltas
+    is enabled, so messages are unchanged for receivers that did not request deltas.
+    '''
+    __slots__ = []
+
+    def encode_block(self, block_type, text, keep, start, end):
+        '''
+        Returns:
+        BackendTranscriptBlock, with keep property if block is an in progress delta
+        '''
+        transcript_block: BackendTranscriptBlock = {
+            'type': block_type,
+            'text': text,
+            'start': start,
+            'end': end
+        }
+        if self.in_progress_deltas and block_type == BackendTranscriptionBlockType.IN_PROGRESS:
+            transcript_block['keep'] = keep
+        return transcript_block
+
+
+class BinaryTranscriptEncoder(TranscriptEncoder):
+    '''
+    Encodes blocks as a fixed size little endian header followed by UTF-8 text:
+        uint8 type, uint32 keep, float64 start, float64 end
+    keep is always 0 if in_progress_deltas is disabled.
+    '''
+    __slots__ = []
+    HEADER = struct.Struct('<BIdd')
+
+    def encode_block(self, block_type, text, keep, start, end):
+        '''
+        Returns:
+        Header followed by UTF-8 encoded text
+        '''
+        return self.HEADER.pack(block_type, keep, start, end) + text.encode('utf-8')
+
+
+def create_transcript_encoder(
+    transcript_format: TranscriptFormat,
+    in_progress_deltas: bool = False
+) -> TranscriptEncoder:
+    '''
+    Creates encoder for a websocket's negotiated transcript format.
+
+    Parameters:
+    transcript_format   (TranscriptFormat): Format of transcript messages sent to websocket
+    in_progress_deltas  (bool)            : Send in progress text as deltas
+
+    Returns:
+    A new TranscriptEncoder
+    '''
+    match(transcript_format):
+        case TranscriptFormat.JSON:
+            return JsonTranscriptEncoder(in_progress_deltas)
+        case TranscriptFormat.BINARY:
+            return BinaryTranscriptEncoder(in_progress_deltas)
+        case _:
+            raise KeyError(f'No transcript encoder matching {transcript_format}')
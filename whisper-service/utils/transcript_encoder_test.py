@@ -0,0 +1,81 @@
+'''
+Unit tests for transcript encoders
+'''
+import json
+import pytest
+from custom_types.model_selection_types import TranscriptFormat
+from custom_types.transcription_types import BackendTranscriptionBlockType
+from utils.transcript_encoder import \
+    BinaryTranscriptEncoder, JsonTranscriptEncoder, common_prefix_length, \
+    create_transcript_encoder
+
+FINAL = BackendTranscriptionBlockType.FINAL
+IN_PROGRESS = BackendTranscriptionBlockType.IN_PROGRESS
+
+
+def test_create_transcript_encoder():
+    '''
+    Test that the encoder matching each transcript format is created
+    '''
+    assert isinstance(create_transcript_encoder(TranscriptFormat.JSON), JsonTranscriptEncoder)
+    assert isinstance(create_transcript_encoder(TranscriptFormat.BINARY), BinaryTranscriptEncoder)
+    with pytest.raises(KeyError):
+        create_transcript_encoder('xml')
+
+
+@pytest.mark.parametrize('a,b,expected', [
+    ('', 'abc', 0),
+    ('abc', 'abc', 3),
+    ('abc', 'abd', 2),
+    ('hello world', 'hello', 5),
+    ('héllo wörld', 'héllo wörd', 9),
+])
+def test_common_prefix_length(a, b, expected):
+    '''
+    Test that common prefix length counts leading characters in common
+    '''
+    assert common_prefix_length(a, b) == expected
+
+
+def test_json_unchanged_without_deltas():
+    '''
+    Test that JSON messages match BackendTranscriptBlock if deltas are not enabled
+    '''
+    encoder = JsonTranscriptEncoder()
+
+    assert encoder.encode(IN_PROGRESS, 'Hello', 0.0, 1.0) == \
+        {'type': IN_PROGRESS, 'text': 'Hello', 'start': 0.0, 'end': 1.0}
+    assert encoder.encode(IN_PROGRESS, 'Hello world', 0.0, 2.0) == \
+        {'type': IN_PROGRESS, 'text': 'Hello world', 'start': 0.0, 'end': 2.0}
+
+
+def test_in_progress_deltas():
+    '''
+    Test that in progress text is rebuilt from deltas, and final blocks are sent in full
+    '''
+    encoder = JsonTranscriptEncoder(in_progress_deltas=True)
+    texts = ['Hello', 'Hello world', 'Hello word', 'Goodbye']
+    received = ''
+    for text in texts:
+        message = json.loads(json.dumps(encoder.encode(IN_PROGRESS, text, 0.0, 1.0)))
+        received = received[:message['keep']] + message['text']
+        assert received == text, 'Receiver rebuilds in progress text'
+
+    final = encoder.encode(FINAL, 'Goodbye.', 0.0, 1.0)
+    assert final['text'] == 'Goodbye.' and 'keep' not in final, 'Final blocks sent in full'
+
+
+def test_binary_encoding():
+    '''
+    Test that binary messages contain header followed by UTF-8 text
+    '''
+    encoder = BinaryTranscriptEncoder(in_progress_deltas=True)
+    encoder.encode(IN_PROGRESS, 'Café', 0.0, 1.0)
+
+    message = encoder.encode(IN_PROGRESS, 'Café au lait', 0.5, 2.25)
+    header_size = BinaryTranscriptEncoder.HEADER.size
+
+    assert header_size == 21, 'Header is not padded'
+    assert BinaryTranscriptEncoder.HEADER.unpack(message[:header_size]) == \
+        (IN_PROGRESS, 4, 0.5, 2.25)
+    assert message[header_size:].decode('utf-8') == ' au lait'